@@ -0,0 +1,101 @@
+"""Trade tagging cost as the CPV mapping table grows.
+
+    python -m benchmarks.bench_cpv_tagging --sizes 65 1000 5000 --codes 20000
+
+`linear scan` is the original get_trade_tags: every prefix is tested against
+every code, so cost grows with the table. `compiled` is CpvTagger with the
+LRU disabled (one dict lookup per prefix length), and `memoized` is CpvTagger
+as shipped, where codes repeat the way they do across a month of notices.
+Every size first checks the three give identical tags.
+"""
+
+import argparse
+import random
+import time
+
+from hanke_radar.db.seed import TRADE_CPV_SEEDS
+from hanke_radar.scraper.cpv_filter import TRADE_RELEVANT_DIVISIONS, CpvTagger
+
+
+def _linear_scan(mappings: list[dict]):
+    by_prefix: dict[str, list[str]] = {}
+    for mapping in mappings:
+        by_prefix.setdefault(mapping["cpv_prefix"], []).append(mapping["trade_key"])
+    sorted_prefixes = sorted(by_prefix, key=len, reverse=True)
+
+    def get_trade_tags(cpv_codes: list[str]) -> list[str]:
+        tags: set[str] = set()
+        for cpv in cpv_codes:
+            if not cpv:
+                continue
+            cpv_clean = cpv.strip().split("-")[0].strip()
+            matched = False
+            for prefix in sorted_prefixes:
+                if cpv_clean.startswith(prefix):
+                    tags.update(by_prefix[prefix])
+                    matched = True
+            if not matched and cpv_clean[:2] in TRADE_RELEVANT_DIVISIONS:
+                tags.add("general")
+        return sorted(tags)
+
+    return get_trade_tags
+
+
+def _mappings(size: int, rng: random.Random) -> list[dict]:
+    """The seed table padded with random 3-8 digit prefixes in divisions 45/50/71."""
+    extra = [
+        {"cpv_prefix": rng.choice(["45", "50", "71"]) + "".join(
+            rng.choices("0123456789", k=rng.randint(1, 6))),
+         "trade_key": f"trade{i % 50}"}
+        for i in range(max(0, size - len(TRADE_CPV_SEEDS)))
+    ]
+    return TRADE_CPV_SEEDS + extra
+
+
+def _procurements(n: int, rng: random.Random) -> list[list[str]]:
+    """n CPV lists drawn from ~1500 distinct codes, with check digits as in the dumps."""
+    pool = [rng.choice(["45", "50", "71", "72", "33"]) + "".join(rng.choices("0123456789", k=6))
+            for _ in range(1500)]
+    return [[f"{code}-{rng.randint(0, 9)}" for code in rng.sample(pool, rng.randint(1, 4))]
+            for _ in range(n)]
+
+
+def _best_of(func, procurements: list[list[str]], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for codes in procurements:
+            func(codes)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[65, 1000, 5000])
+    parser.add_argument("--codes", type=int, default=20_000, help="Procurements tagged")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    procurements = _procurements(args.codes, rng)
+    print(f"{args.codes} procurements, {sum(map(len, procurements))} CPV codes\n")
+    print(f"{'mappings':>8}  {'linear scan':>12}  {'compiled':>12}  {'memoized':>12}")
+    for size in args.sizes:
+        mappings = _mappings(size, rng)
+        linear = _linear_scan(mappings)
+        compiled = CpvTagger(mappings, cache_size=0)
+        memoized = CpvTagger(mappings)
+        for codes in procurements[:2000]:
+            assert linear(codes) == compiled.tags(codes) == memoized.tags(codes)
+
+        timings = [
+            _best_of(linear, procurements, args.repeat),
+            _best_of(compiled.tags, procurements, args.repeat),
+            _best_of(memoized.tags, procurements, args.repeat),
+        ]
+        print(f"{len(mappings):>8}  " + "  ".join(f"{t * 1000:9.1f} ms" for t in timings))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""Enrichment throughput and per-record latency against a fake RHR API.
+
+    python -m benchmarks.bench_enrich --procurements 60 --rps 20 --latency 0.15
+
+Runs the enricher against an in-process fake RHR API (see fake_rhr.py).
+
+Throughput: the `sequential` row is the old loop — one procurement at a time,
+three calls back to back, then a 1 s sleep. The other rows use
+_enrich_concurrently() with a shared TokenBucket; the reported peak rate
+shows the cap is never exceeded, so the speed-up comes from filling the
+allowed rate rather than breaking it.
+
+Latency: one procurement at a time with no rate cap, comparing the three
+calls back to back against enrich_procurement(), which fetches general-info
+and additional-data together once the version is known.
+
+Throttling: against a fake portal that answers 429 above --server-limit
+requests in flight, a fixed concurrency of 16 against the adaptive limit
+(AdaptiveConcurrency), which backs off on the 429s and settles near the
+limit the server accepts.
+"""
+
+import argparse
+import asyncio
+import time
+
+from benchmarks.fake_rhr import FakeRhrApi
+from hanke_radar.db.models import Procurement
+from hanke_radar.scraper.html_enricher import _enrich_concurrently, enrich_procurement
+from hanke_radar.scraper.rate_limit import AdaptiveConcurrency, TokenBucket
+from hanke_radar.scraper.rhr_api import RhrApi
+
+_BASE = "http://rhr.test"
+
+
+async def _enrich_sequentially(api: RhrApi, proc: Procurement) -> None:
+    """The pre-fan-out call shape: each request waits for the previous one."""
+    version = await api.latest_version(proc.rhr_id)
+    await api.general_info(version["value"])
+    await api.additional_data(version["value"])
+
+
+async def _old_loop(fake: FakeRhrApi, procurements: list[Procurement]) -> float:
+    start = time.perf_counter()
+    async with fake.client() as client:
+        api = RhrApi(client, base_url=_BASE)
+        for proc in procurements:
+            await _enrich_sequentially(api, proc)
+            await asyncio.sleep(1.0)
+    return time.perf_counter() - start
+
+
+async def _concurrent(
+    fake: FakeRhrApi, procurements: list[Procurement], rps: float, concurrency: int
+) -> float:
+    start = time.perf_counter()
+    async with fake.client() as client:
+        api = RhrApi(client, TokenBucket(rps), base_url=_BASE)
+        await _enrich_concurrently(api, procurements, concurrency, verbose=False)
+    return time.perf_counter() - start
+
+
+async def _per_record(latency: float, procurements: list[Procurement], fan_out: bool) -> float:
+    fake = FakeRhrApi(latency)
+    async with fake.client() as client:
+        api = RhrApi(client, base_url=_BASE)
+        start = time.perf_counter()
+        for proc in procurements:
+            if fan_out:
+                await enrich_procurement(api, proc, verbose=False)
+            else:
+                await _enrich_sequentially(api, proc)
+        return (time.perf_counter() - start) / len(procurements)
+
+
+async def _throttling(
+    procurements: list[Procurement], latency: float, server_limit: int, adaptive: bool
+) -> None:
+    fake = FakeRhrApi(latency, max_in_flight=server_limit, retry_after=0.2)
+    limit = AdaptiveConcurrency(initial=4, maximum=32) if adaptive else None
+    async with fake.client() as client:
+        api = RhrApi(client, base_url=_BASE, concurrency=limit, retries=10)
+        start = time.perf_counter()
+        results = await _enrich_concurrently(api, procurements, 16, verbose=False)
+        elapsed = time.perf_counter() - start
+    failed = sum(isinstance(r, BaseException) for r in results)
+    label = "adaptive" if adaptive else "fixed 16"
+    settled = f"  limit settled at {limit.limit:4.1f}" if limit else ""
+    print(f"{label:>14}: {elapsed:6.2f} s  {len(procurements) / elapsed:6.2f} proc/s  "
+          f"{fake.throttled:4d} x 429  {failed} failed  "
+          f"max in flight {fake.peak_in_flight}{settled}")
+
+
+def _report(label: str, fake: FakeRhrApi, n: int, elapsed: float) -> None:
+    print(f"{label:>14}: {elapsed:6.2f} s  {n / elapsed:6.2f} proc/s  "
+          f"{fake.requests / elapsed:6.1f} req/s  peak {fake.peak_rate():5.1f} req/s  "
+          f"max in flight {fake.peak_in_flight}")
+
+
+async def _main(
+    n: int, rps: float, latency: float, levels: list[int], baseline: bool, server_limit: int
+) -> None:
+    procurements = [Procurement(rhr_id=str(i)) for i in range(n)]
+    print(f"{n} procurements, {latency * 1000:.0f} ms latency, cap {rps:g} req/s\n")
+    if baseline:
+        fake = FakeRhrApi(latency)
+        _report("sequential", fake, n, await _old_loop(fake, procurements))
+    for concurrency in levels:
+        fake = FakeRhrApi(latency)
+        elapsed = await _concurrent(fake, procurements, rps, concurrency)
+        _report(f"concurrency {concurrency}", fake, n, elapsed)
+
+    sample = procurements[:10]
+    serial = await _per_record(latency, sample, fan_out=False)
+    fanned = await _per_record(latency, sample, fan_out=True)
+    print("\nPer-record latency (no rate cap)")
+    print(f"  calls back to back: {serial * 1000:7.1f} ms")
+    print(f"  details fanned out: {fanned * 1000:7.1f} ms  "
+          f"({(1 - fanned / serial) * 100:.0f}% less)")
+
+    print(f"\nServer throttles above {server_limit} in flight (no rate cap)")
+    for adaptive in (False, True):
+        await _throttling(procurements, latency, server_limit, adaptive)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--procurements", type=int, default=60)
+    parser.add_argument("--rps", type=float, default=20.0)
+    parser.add_argument("--latency", type=float, default=0.15)
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--no-baseline", dest="baseline", action="store_false")
+    parser.add_argument("--server-limit", type=int, default=6)
+    args = parser.parse_args()
+    asyncio.run(_main(args.procurements, args.rps, args.latency, args.levels, args.baseline,
+                      args.server_limit))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""GET /procurements page latency: OFFSET vs keyset cursor, page 1 vs a deep page.
+
+    DATABASE_URL=postgresql://... python -m benchmarks.bench_pagination --rows 200000
+
+Fills a session-local TEMP copy of `procurements` (it shadows the real table,
+as in bench_upsert) with synthetic active rows, then times the list query the
+route runs, for page 1 and page `--deep-page`, with OFFSET and with a cursor,
+plus the exact count(*) against the planner estimate. The transaction is
+rolled back, so nothing is written to the real data.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from sqlalchemy import func, select, text
+
+from hanke_radar.api.routes import (
+    _LIST_ORDER,
+    encode_cursor,
+    estimate_count,
+    filter_procurements,
+    keyset_ranges,
+)
+from hanke_radar.db.engine import async_session
+from hanke_radar.db.models import Procurement
+from hanke_radar.db.schema import ensure_schema
+
+_FILL = text("""
+    INSERT INTO procurements (notice_id, title, contracting_auth, status, cpv_primary,
+                              trade_tags, publication_date)
+    SELECT 'bench-' || g, 'Benchmark hange ' || g, 'Benchmark Asutus', 'active',
+           (ARRAY['45330000', '45310000', '50700000', '71300000'])[1 + g % 4],
+           ARRAY[(ARRAY['plumbing', 'electrical', 'maintenance', 'general'])[1 + g % 4]],
+           now() - make_interval(mins => g)
+    FROM generate_series(1, :rows) AS g
+""")
+
+
+async def _median_ms(session, make_query, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await make_query(session)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+async def _main(rows: int, per_page: int, deep_page: int, repeat: int) -> None:
+    if async_session is None:
+        raise SystemExit("DATABASE_URL not configured")
+    async with async_session() as session:
+        await ensure_schema(session)  # the copy below takes the list index from here
+    async with async_session() as session:
+        await session.execute(text(
+            "CREATE TEMP TABLE procurements "
+            "(LIKE public.procurements INCLUDING DEFAULTS INCLUDING INDEXES)"
+        ))
+        await session.execute(_FILL, {"rows": rows})
+        await session.execute(text("ANALYZE procurements"))
+
+        base = filter_procurements(select(Procurement), status="active")
+        ordered = base.order_by(*_LIST_ORDER)
+        # The row just before the deep page, to build its cursor
+        before = (await session.execute(
+            ordered.offset((deep_page - 1) * per_page - 1).limit(1)
+        )).scalar_one()
+        cursors = {1: None, deep_page: encode_cursor(before)}
+
+        def offset_page(page):
+            return lambda s: s.execute(ordered.offset((page - 1) * per_page).limit(per_page + 1))
+
+        def cursor_page(page):
+            async def run(s):
+                if cursors[page] is None:
+                    return await s.execute(ordered.limit(per_page + 1))
+                for part in keyset_ranges(base, cursors[page]):
+                    await s.execute(part.order_by(*_LIST_ORDER).limit(per_page + 1))
+            return run
+
+        print(f"{rows} active rows, {per_page} per page, median of {repeat}\n")
+        for label, make in (("OFFSET", offset_page), ("cursor", cursor_page)):
+            first = await _median_ms(session, make(1), repeat)
+            deep = await _median_ms(session, make(deep_page), repeat)
+            print(f"{label:>7}: page 1 {first:7.2f} ms   page {deep_page} {deep:7.2f} ms")
+
+        exact = await _median_ms(
+            session, lambda s: s.execute(select(func.count()).select_from(base.subquery())),
+            repeat,
+        )
+        estimate = await _median_ms(session, lambda s: estimate_count(s, base), repeat)
+        print(f"\n  count(*): {exact:7.2f} ms   planner estimate: {estimate:7.2f} ms "
+              f"(~{await estimate_count(session, base)} rows)")
+        await session.rollback()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--per-page", type=int, default=20)
+    parser.add_argument("--deep-page", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(_main(args.rows, args.per_page, args.deep_page, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
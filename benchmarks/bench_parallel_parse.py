@@ -0,0 +1,60 @@
+"""Wall-clock time to parse a multi-month backfill with 1..N worker processes.
+
+    python -m benchmarks.bench_parallel_parse --months 24 --notices 950
+
+Writes one synthetic dump per month, then parses all of them with
+parse_dump_file() in a ProcessPoolExecutor (the `hanke scrape --workers`
+path), collecting the records in the parent as they complete. No database
+involved, so this isolates the CPU-bound stage.
+"""
+
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from benchmarks.synthetic import write_dump
+from hanke_radar.scraper.xml_parser import parse_dump_file
+
+
+def _run(paths: list[str], workers: int) -> tuple[float, int]:
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+        # Warm the pool so process start-up isn't timed
+        list(pool.map(abs, range(workers)))
+        start = time.perf_counter()
+        futures = [pool.submit(parse_dump_file, path) for path in paths]
+        kept = sum(len(f.result()[1]) for f in as_completed(futures))
+        return time.perf_counter() - start, kept
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--months", type=int, default=24)
+    parser.add_argument("--notices", type=int, default=950)
+    parser.add_argument("--workers", type=int, nargs="*")
+    args = parser.parse_args()
+
+    cpus = os.cpu_count() or 1
+    levels = args.workers or sorted({1, 2, 4, cpus} - {n for n in (2, 4) if n > cpus})
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i in range(args.months):
+            path = os.path.join(tmp, f"month-{i:02d}.xml")
+            write_dump(path, args.notices, seed=i)
+            paths.append(path)
+        print(f"{args.months} months x {args.notices} notices, {cpus} CPUs")
+
+        baseline = None
+        for workers in levels:
+            elapsed, kept = _run(paths, workers)
+            baseline = baseline or elapsed
+            print(f"workers={workers:<3} {elapsed:7.2f}s  speed-up {baseline / elapsed:5.2f}x  "
+                  f"({kept} records)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Peak RSS of in-memory vs streaming bulk XML parsing.
+
+Writes a large synthetic dump, then parses it in a fresh subprocess per mode so
+each peak RSS reading is isolated:
+
+    python -m benchmarks.bench_parse_memory --notices 10000
+
+- `inmemory`: read the whole file + parse_bulk_xml() (the old scrape path)
+- `streaming`: iter_bulk_xml() over the file path (the current scrape path)
+"""
+
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic import write_dump
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _run_mode(mode: str, path: str) -> None:
+    from hanke_radar.scraper.xml_parser import is_active_tender, iter_bulk_xml, parse_bulk_xml
+
+    start = time.perf_counter()
+    if mode == "inmemory":
+        with open(path, "rb") as f:
+            notices = parse_bulk_xml(f.read())
+        kept = sum(1 for n in notices if is_active_tender(n))
+    else:
+        kept = sum(1 for n in iter_bulk_xml(path) if is_active_tender(n))
+    elapsed = time.perf_counter() - start
+    print(f"{mode:<10} kept={kept:<6} time={elapsed:6.2f}s peak_rss={_peak_rss_mb():8.1f} MB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--notices", type=int, default=10000)
+    parser.add_argument("--mode", choices=["inmemory", "streaming"])
+    parser.add_argument("--path")
+    args = parser.parse_args()
+
+    if args.mode:
+        _run_mode(args.mode, args.path)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "dump.xml")
+        size = write_dump(path, args.notices)
+        print(f"Synthetic dump: {args.notices} notices, {size / 1024 / 1024:.1f} MB")
+        for mode in ("inmemory", "streaming"):
+            subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_parse_memory",
+                 "--mode", mode, "--path", path],
+                check=True,
+            )
+
+
+if __name__ == "__main__":
+    main()
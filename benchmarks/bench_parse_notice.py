@@ -0,0 +1,166 @@
+"""Notices per second: single-pass parse_notice() vs per-field descendant searches.
+
+    python -m benchmarks.bench_parse_notice --notices 2000
+
+Both parsers run over the same pre-parsed synthetic dump, so only field
+extraction is timed (not XML tokenizing). Results are checked for equality.
+"""
+
+import argparse
+import re
+import time
+
+from lxml import etree
+
+from benchmarks.synthetic import iter_dump
+from hanke_radar.scraper.xml_parser import (
+    NS,
+    ParsedProcurement,
+    _parse_date,
+    _text,
+    parse_notice,
+)
+
+
+def parse_notice_findall(notice_el: etree._Element) -> ParsedProcurement:
+    """The original parse_notice(): one `.find(".//...")` descendant search per field.
+
+    It re-walks the notice subtree for every field; kept here as the baseline
+    (and the expected output) for the single-pass parser.
+    """
+    p = ParsedProcurement()
+
+    # Notice ID (UUID)
+    notice_id_el = notice_el.find('.//cbc:ID[@schemeName="notice-id"]', NS)
+    p.notice_id = _text(notice_id_el)
+
+    # Procurement folder ID
+    folder_id_el = notice_el.find(".//cbc:ContractFolderID", NS)
+    p.procurement_id = _text(folder_id_el)
+
+    # Notice subtype
+    subtype_el = notice_el.find(".//efac:NoticeSubType/cbc:SubTypeCode", NS)
+    p.notice_subtype = _text(subtype_el)
+
+    # Title — from first ProcurementProject
+    title_el = notice_el.find(".//cac:ProcurementProject/cbc:Name", NS)
+    p.title = _text(title_el)
+
+    # Description
+    desc_el = notice_el.find(".//cac:ProcurementProject/cbc:Description", NS)
+    p.description = _text(desc_el)
+
+    # CPV codes — collect all unique ItemClassificationCode values
+    cpv_elements = notice_el.findall(".//cbc:ItemClassificationCode", NS)
+    seen_cpvs: list[str] = []
+    for cpv_el in cpv_elements:
+        code = _text(cpv_el)
+        if code and code not in seen_cpvs:
+            seen_cpvs.append(code)
+    if seen_cpvs:
+        p.cpv_primary = seen_cpvs[0]
+        p.cpv_additional = seen_cpvs[1:]
+
+    # Procedure type
+    proc_code_el = notice_el.find(".//cbc:ProcedureCode", NS)
+    p.procedure_type = _text(proc_code_el)
+
+    # Contracting authority — first organization (buyer)
+    first_org = notice_el.find(".//efac:Organization/efac:Company", NS)
+    if first_org is not None:
+        org_name_el = first_org.find(".//cac:PartyName/cbc:Name", NS)
+        p.contracting_auth = _text(org_name_el)
+        reg_el = first_org.find(".//cac:PartyLegalEntity/cbc:CompanyID", NS)
+        p.contracting_auth_reg = _text(reg_el)
+
+    # NUTS code — from ProcurementProject address
+    nuts_el = notice_el.find(
+        ".//cac:ProcurementProject//cbc:CountrySubentityCode[@listName='nuts']", NS
+    )
+    if nuts_el is None:
+        # Fallback: any NUTS code in the document
+        nuts_el = notice_el.find(".//cbc:CountrySubentityCode", NS)
+    p.nuts_code = _text(nuts_el)
+
+    # Estimated value
+    amount_el = notice_el.find(".//cbc:EstimatedOverallContractAmount", NS)
+    if amount_el is not None and amount_el.text:
+        try:
+            p.estimated_value = float(amount_el.text)
+            p.currency = amount_el.get("currencyID", "EUR")
+        except ValueError:
+            pass
+
+    # Submission deadline
+    deadline_period = notice_el.find(".//cac:TenderSubmissionDeadlinePeriod", NS)
+    if deadline_period is not None:
+        end_date = _text(deadline_period.find("cbc:EndDate", NS))
+        end_time = _text(deadline_period.find("cbc:EndTime", NS))
+        p.submission_deadline = _parse_date(end_date, end_time)
+
+    # Publication date
+    issue_date_el = notice_el.find(".//cbc:IssueDate", NS)
+    p.publication_date = _parse_date(_text(issue_date_el))
+
+    # Duration — from PlannedPeriod
+    duration_el = notice_el.find(".//cac:PlannedPeriod/cbc:DurationMeasure", NS)
+    if duration_el is not None and duration_el.text:
+        try:
+            p.duration_months = int(float(duration_el.text))
+        except ValueError:
+            pass
+
+    # RHR internal ID — extracted from CallForTendersDocumentReference URI
+    # URI format: https://riigihanked.riik.ee/rhr-web/#/procurement/{rhr_id}/documents?group=B
+    doc_uri_el = notice_el.find(
+        ".//cac:CallForTendersDocumentReference//cbc:URI", NS
+    )
+    if doc_uri_el is not None:
+        uri_text = _text(doc_uri_el)
+        rhr_match = re.search(r"/procurement/(\d+)/", uri_text)
+        if rhr_match:
+            p.rhr_id = rhr_match.group(1)
+
+    # Source URL — prefer RHR integer ID for a working link
+    if p.rhr_id:
+        p.source_url = (
+            f"https://riigihanked.riik.ee/rhr-web/#/procurement/{p.rhr_id}/general-info"
+        )
+    elif p.procurement_id:
+        p.source_url = (
+            f"https://riigihanked.riik.ee/rhr-web/#/procurement/{p.procurement_id}/general-info"
+        )
+
+    return p
+
+
+def _best_of(func, notices: list, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for el in notices:
+            func(el)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--notices", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    root = etree.fromstring(b"".join(iter_dump(args.notices, active_ratio=1.0)))
+    notices = list(root)
+    assert all(parse_notice(el) == parse_notice_findall(el) for el in notices)
+
+    before = _best_of(parse_notice_findall, notices, args.repeat)
+    after = _best_of(parse_notice, notices, args.repeat)
+    print(f"{len(notices)} notices, best of {args.repeat}")
+    print(f"descendant searches: {len(notices) / before:10.0f} notices/s")
+    print(f"single pass:         {len(notices) / after:10.0f} notices/s")
+    print(f"speed-up:            {before / after:10.2f}x")
+
+
+if __name__ == "__main__":
+    main()
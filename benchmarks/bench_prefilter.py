@@ -0,0 +1,84 @@
+"""Parse time with and without the subtype/CPV prefilter on a month-shaped dump.
+
+    python -m benchmarks.bench_prefilter --notices 950
+
+`full` parses every notice and filters afterwards (the old scrape path);
+`prefilter` peeks at subtype + CPV codes and only fully parses candidates.
+Reported twice: field extraction alone (notices already tokenized), and end to
+end including libxml2 tokenizing, which both paths pay in full.
+"""
+
+import argparse
+import time
+
+from lxml import etree
+
+from benchmarks.synthetic import iter_dump
+from hanke_radar.scraper.cpv_filter import is_trade_relevant
+from hanke_radar.scraper.xml_parser import (
+    PARSEABLE_TAGS,
+    ParseStats,
+    is_active_tender,
+    iter_bulk_xml,
+    parse_notice,
+    passes_prefilter,
+    peek_notice,
+)
+
+
+def _is_kept(notice) -> bool:
+    cpvs = [notice.cpv_primary] + notice.cpv_additional
+    return is_active_tender(notice) and any(is_trade_relevant(c) for c in cpvs if c)
+
+
+def _best_of(func, repeat: int) -> tuple[float, int]:
+    best, kept = float("inf"), 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        kept = func()
+        best = min(best, time.perf_counter() - start)
+    return best, kept
+
+
+def _report(label: str, full: tuple[float, int], pre: tuple[float, int]) -> None:
+    assert full[1] == pre[1]
+    print(f"{label}")
+    print(f"  full parse + filter: {full[0] * 1000:8.1f} ms  ({full[1]} kept)")
+    print(f"  prefilter:           {pre[0] * 1000:8.1f} ms  ({pre[1]} kept)")
+    print(f"  reduction:           {(1 - pre[0] / full[0]) * 100:8.1f} %")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--notices", type=int, default=950)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    chunks = list(iter_dump(args.notices))
+    stats = ParseStats()
+    for _ in iter_bulk_xml(chunks, prefilter=True, stats=stats):
+        pass
+    print(f"{args.notices} notices ({sum(map(len, chunks)) / 1024 / 1024:.1f} MB): "
+          f"{stats.found} parseable, {stats.skipped_inactive} inactive, "
+          f"{stats.skipped_irrelevant} irrelevant\n")
+
+    root = etree.fromstring(b"".join(chunks))
+    notices = [el for el in root if etree.QName(el).localname in PARSEABLE_TAGS]
+    _report(
+        "Field extraction",
+        _best_of(lambda: sum(_is_kept(parse_notice(el)) for el in notices), args.repeat),
+        _best_of(
+            lambda: sum(1 for el in notices if passes_prefilter(peek_notice(el))
+                        and parse_notice(el)),
+            args.repeat,
+        ),
+    )
+    _report(
+        "End to end (tokenize + extract)",
+        _best_of(lambda: sum(_is_kept(n) for n in iter_bulk_xml(chunks)), args.repeat),
+        _best_of(lambda: sum(1 for _ in iter_bulk_xml(chunks, prefilter=True)), args.repeat),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""GET /procurements page encoding: ORM + jsonable_encoder vs Core rows + orjson.
+
+    python -m benchmarks.bench_serialization --per-page 100 --html-kb 40
+
+`ORM` is the old read path: full `Procurement` instances (raw_html included),
+the old per-field `_serialize`, `jsonable_encoder` and `json.dumps`. `Core` is
+the route as shipped: ITEM_COLUMNS rows, `_serialize` and orjson. Both encode
+the same page. `compact` is the same route with `view=compact`. `text read`
+is what the query pulls out of the text columns, `response` the body size.
+No DB needed.
+"""
+
+import argparse
+import json
+import random
+import time
+from collections import namedtuple
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+
+from fastapi.encoders import jsonable_encoder
+
+from hanke_radar.api.responses import dumps
+from hanke_radar.api.routes import _CURSOR_FIELDS, COMPACT_FIELDS, ITEM_COLUMNS, _serialize
+from hanke_radar.db.models import Procurement
+from hanke_radar.scraper.bulk_scraper import _description_snippet
+
+_Item = namedtuple("_Item", [c.key for c in ITEM_COLUMNS])
+_CompactItem = namedtuple("_CompactItem", list(dict.fromkeys(COMPACT_FIELDS + _CURSOR_FIELDS)))
+
+
+def _legacy_serialize(p: Procurement) -> dict:
+    item = {c.key: getattr(p, c.key) for c in ITEM_COLUMNS}
+    item["estimated_value"] = float(p.estimated_value) if p.estimated_value else None
+    for key in ("submission_deadline", "publication_date"):
+        item[key] = item[key].isoformat() if item[key] else None
+    return item
+
+
+def _procurements(n: int, html_kb: int, rng: random.Random) -> list[Procurement]:
+    start = datetime(2026, 3, 1, tzinfo=UTC)
+    words = ["hange", "ehitustööd", "torustik", "elektripaigaldis", "remont", "hooldus"]
+    procurements = [
+        Procurement(
+            id=i, notice_id=f"bench-{i}", procurement_id=f"30{i:04d}",
+            title=f"Benchmark hange {i}",
+            description=" ".join(rng.choices(words, k=rng.randint(50, 400))),
+            contracting_auth="Benchmark Asutus", contracting_auth_reg="70000000",
+            contract_type="ehitustööd", procedure_type="avatud",
+            cpv_primary="45330000-9", cpv_additional=["45310000-3", "50700000-2"],
+            estimated_value=Decimal(rng.randint(1_000, 500_000)),
+            nuts_code="EE001", nuts_name="Põhja-Eesti",
+            submission_deadline=start + timedelta(days=i % 30),
+            publication_date=start - timedelta(hours=i), duration_months=12,
+            status="active", source_url=f"https://riigihanked.riik.ee/{i}",
+            raw_html="<div>" + "x" * (html_kb * 1024) + "</div>",
+            trade_tags=["plumbing"], contact_person="Mari Maasikas",
+            contact_email="mari@example.ee", contact_phone="+372 5555 5555",
+            performance_address="Tallinn, Narva mnt 1",
+        )
+        for i in range(n)
+    ]
+    for p in procurements:
+        p.description_snippet = _description_snippet(p.description)
+    return procurements
+
+
+def _text_bytes(values) -> int:
+    return sum(len(v.encode()) for v in values if isinstance(v, str))
+
+
+def _best_ms(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--per-page", type=int, default=100)
+    parser.add_argument("--html-kb", type=int, default=40, help="raw_html size per row")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    procurements = _procurements(args.per_page, args.html_kb, random.Random(0))
+    rows = [_Item(*(getattr(p, c.key) for c in ITEM_COLUMNS)) for p in procurements]
+    compact_rows = [_CompactItem(*(getattr(p, f) for f in _CompactItem._fields))
+                    for p in procurements]
+
+    def orm_page() -> bytes:
+        items = [_legacy_serialize(p) for p in procurements]
+        return json.dumps(
+            jsonable_encoder({"items": items}), ensure_ascii=False, separators=(",", ":")
+        ).encode()
+
+    def core_page() -> bytes:
+        return dumps({"items": [_serialize(r) for r in rows]})
+
+    def compact_page() -> bytes:
+        return dumps({"items": [_serialize(r, COMPACT_FIELDS) for r in compact_rows]})
+
+    assert json.loads(orm_page()) == json.loads(core_page())
+    orm_read = sum(_text_bytes(vars(p).values()) for p in procurements)
+    core_read = sum(_text_bytes(r) for r in rows)
+    compact_read = sum(_text_bytes(r) for r in compact_rows)
+
+    print(f"per_page={args.per_page}, raw_html {args.html_kb} KB/row, best of {args.repeat}\n")
+    print(f"{'path':>7}  {'encode':>10}  {'text read':>10}  {'response':>10}")
+    for label, page, read in (
+        ("ORM", orm_page, orm_read),
+        ("Core", core_page, core_read),
+        ("compact", compact_page, compact_read),
+    ):
+        ms = _best_ms(page, args.repeat)
+        print(f"{label:>7}  {ms:7.2f} ms  {read / 1024:7.0f} KB  {len(page()) / 1024:7.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Stats latency as `procurements` grows: separate GROUP BYs vs the summary table.
+
+    DATABASE_URL=postgresql://... python -m benchmarks.bench_stats --rows 10000 100000 400000
+
+For each size, fills session-local TEMP copies of `procurements` and
+`procurement_summary` (they shadow the real tables, as in bench_pagination)
+and times what /procurements/stats used to run (three GROUP BYs over the
+procurements), the single GROUPING SETS scan used as the fallback, the summary
+refresh, and `load_stats` reading the refreshed summary. Rolled back at the
+end, so nothing is written to the real data.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from sqlalchemy import text
+
+from hanke_radar.db.engine import async_session
+from hanke_radar.db.schema import ensure_schema
+from hanke_radar.db.summary import _SUMMARY_SELECT, load_stats, refresh_summary
+
+_FILL = text("""
+    INSERT INTO procurements (notice_id, title, contracting_auth, status, cpv_primary,
+                              nuts_code, nuts_name, contract_type, trade_tags)
+    SELECT 'bench-' || g, 'Benchmark hange ' || g, 'Benchmark Asutus',
+           CASE WHEN g % 5 = 0 THEN 'active' ELSE 'expired' END,
+           (ARRAY['45330000', '45310000', '50700000', '71300000'])[1 + g % 4],
+           'EE00' || (g % 9), 'Maakond ' || (g % 9),
+           (ARRAY['works', 'services', 'supplies'])[1 + g % 3],
+           ARRAY[(ARRAY['plumbing', 'electrical', 'maintenance', 'general'])[1 + g % 4]]
+    FROM generate_series(1, :rows) AS g
+""")
+
+_SEPARATE = [
+    """SELECT unnest(trade_tags) AS trade, count(*) FROM procurements
+       WHERE status = 'active' GROUP BY trade""",
+    """SELECT nuts_code, nuts_name, count(id) FROM procurements
+       WHERE status = 'active' GROUP BY nuts_code, nuts_name""",
+    "SELECT status, count(id) FROM procurements GROUP BY status",
+]
+
+
+async def _median_ms(session, run, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await run(session)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+async def _separate(session) -> None:
+    for sql in _SEPARATE:
+        (await session.execute(text(sql))).all()
+
+
+async def _grouping_sets(session) -> None:
+    (await session.execute(text(_SUMMARY_SELECT))).all()
+
+
+async def _main(sizes: list[int], repeat: int) -> None:
+    if async_session is None:
+        raise SystemExit("DATABASE_URL not configured")
+    async with async_session() as session:
+        await ensure_schema(session)
+
+    print(f"median of {repeat}\n")
+    print(f"{'rows':>8}  {'3 GROUP BYs':>12}  {'GROUPING SETS':>13}  "
+          f"{'refresh':>10}  {'summary read':>12}")
+    for rows in sizes:
+        async with async_session() as session:
+            for table in ("procurements", "procurement_summary"):
+                await session.execute(text(
+                    f"CREATE TEMP TABLE {table} "
+                    f"(LIKE public.{table} INCLUDING DEFAULTS INCLUDING INDEXES)"
+                ))
+            await session.execute(_FILL, {"rows": rows})
+            await session.execute(text("ANALYZE procurements"))
+
+            separate = await _median_ms(session, _separate, repeat)
+            single = await _median_ms(session, _grouping_sets, repeat)
+            refresh = await _median_ms(session, refresh_summary, max(1, repeat // 5))
+            read = await _median_ms(session, load_stats, repeat)
+            print(f"{rows:>8}  {separate:9.2f} ms  {single:10.2f} ms  "
+                  f"{refresh:7.2f} ms  {read:9.2f} ms")
+            await session.rollback()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 400_000])
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(_main(args.rows, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
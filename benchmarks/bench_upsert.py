@@ -0,0 +1,89 @@
+"""Store throughput of row-at-a-time vs batched upserts against a real database.
+
+    DATABASE_URL=postgresql://... python -m benchmarks.bench_upsert --notices 10000
+
+Runs the scrape writer (`_write_notices`) with batch size 1 (one INSERT ... ON
+CONFLICT round trip per notice, the old path) and with the configured batch
+size. Everything happens in a session-local TEMP copy of `procurements`
+(which shadows the real table via search_path) inside a transaction that is
+rolled back, so nothing is written to the real data. The gap grows with
+round-trip latency: a remote Neon database shows it far more than localhost.
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import text
+
+from hanke_radar.config import settings
+from hanke_radar.db.engine import async_session
+from hanke_radar.scraper.bulk_scraper import StageTimings, _write_notices
+from hanke_radar.scraper.xml_parser import ParsedProcurement
+
+_CPVS = ["45330000", "45310000", "45442100", "45331000", "50700000", "45000000"]
+
+
+def _notices(n: int, run: str) -> list[ParsedProcurement]:
+    now = datetime.now(UTC)
+    return [
+        ParsedProcurement(
+            notice_id=f"bench-{run}-{i:06d}",
+            procurement_id=f"proc-{i:06d}",
+            rhr_id=str(9_000_000 + i),
+            title=f"Benchmark hange {i}",
+            description="Torustiku ja elektrisüsteemide renoveerimine. " * 4,
+            contracting_auth="Benchmark Asutus",
+            procedure_type="open",
+            cpv_primary=_CPVS[i % len(_CPVS)],
+            cpv_additional=[_CPVS[(i + 1) % len(_CPVS)]],
+            estimated_value=10_000.0 + i,
+            nuts_code="EE001",
+            submission_deadline=now + timedelta(days=30),
+            publication_date=now,
+            source_url=f"https://riigihanked.riik.ee/rhr-web/#/procurement/{i}/general-info",
+        )
+        for i in range(n)
+    ]
+
+
+async def _run(notices: list[ParsedProcurement], batch_size: int) -> tuple[float, int, int]:
+    async with async_session() as session:
+        await session.execute(text(
+            "CREATE TEMP TABLE procurements "
+            "(LIKE public.procurements INCLUDING DEFAULTS INCLUDING INDEXES)"
+        ))
+        queue: asyncio.Queue = asyncio.Queue()
+        for notice in notices:
+            queue.put_nowait(notice)
+        queue.put_nowait(None)
+        timings = StageTimings()
+        start = time.perf_counter()
+        written = await _write_notices(
+            session, queue, timings, verbose=False, batch_size=batch_size
+        )
+        elapsed = time.perf_counter() - start
+        await session.rollback()  # DDL is transactional: the temp table goes too
+        return elapsed, written.stored, written.errors
+
+
+async def _main(n: int, batch_size: int) -> None:
+    if async_session is None:
+        raise SystemExit("DATABASE_URL not configured")
+    for label, size in (("row at a time", 1), (f"batched ({batch_size})", batch_size)):
+        elapsed, stored, errors = await _run(_notices(n, label[:3]), size)
+        print(f"{label:>16}: {elapsed:7.2f} s  {stored / elapsed:9.0f} rows/s  "
+              f"({stored} stored, {errors} errors)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--notices", type=int, default=10_000)
+    parser.add_argument("--batch-size", type=int, default=settings.upsert_batch_size)
+    args = parser.parse_args()
+    asyncio.run(_main(args.notices, args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""In-process stand-in for the RHR JSON API, served through httpx.MockTransport.
+
+Each endpoint sleeps for a fixed latency before answering, and the server
+tracks request counts and peak concurrency so benchmarks can check they stay
+inside the configured limits. With `max_in_flight` set it behaves like a
+portal that throttles: requests over that many in flight get a 429 with
+Retry-After.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+
+import httpx
+
+
+@dataclass
+class FakeRhrApi:
+    latency: float = 0.15  # seconds per request, roughly what riigihanked.riik.ee answers in
+    requests: int = 0
+    in_flight: int = 0
+    peak_in_flight: int = 0
+    started: list[float] = field(default_factory=list)  # monotonic request start times
+    max_in_flight: int | None = None  # throttle above this many concurrent requests
+    retry_after: float = 0.5
+    throttled: int = 0
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        if self.max_in_flight is not None and self.in_flight >= self.max_in_flight:
+            self.throttled += 1
+            return httpx.Response(429, headers={"Retry-After": str(self.retry_after)})
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        self.started.append(time.monotonic())
+        try:
+            await asyncio.sleep(self.latency)
+        finally:
+            self.in_flight -= 1
+
+        parts = request.url.path.rstrip("/").split("/")
+        if parts[-1] == "latest-version":
+            return httpx.Response(200, json={"value": int(parts[-2]) + 100_000})
+        if parts[-1] == "general-info":
+            return httpx.Response(200, json={"liablePersonName": "Mari Maasikas"})
+        if parts[-1] == "additional-data":
+            info = f"tel 5564 0996, e-mail: hange{parts[-2]}@example.ee"
+            return httpx.Response(200, json={
+                "procPart": {"place": "Tartu linn, Riia 15"},
+                "procObject": {"additionalInfo": info},
+            })
+        return httpx.Response(404)
+
+    def client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=httpx.MockTransport(self.handler))
+
+    def peak_rate(self, window: float = 1.0) -> float:
+        """Most requests started within any `window` seconds, per second."""
+        times = sorted(self.started)
+        best, lo = 0, 0
+        for hi, t in enumerate(times):
+            while t - times[lo] >= window:
+                lo += 1
+            best = max(best, hi - lo + 1)
+        return best / window
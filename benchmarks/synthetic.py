@@ -0,0 +1,220 @@
+"""Synthetic eForms bulk dumps shaped like the monthly riigihanked export.
+
+A real month is ~36MB / ~950 notices: a mix of contract notices, prior
+information notices and (mostly) award notices, each with a handful of lots and
+organizations. Notices here follow the same structure so parser benchmarks see
+realistic element counts, not just a realistic byte count.
+"""
+
+import random
+from collections.abc import Iterator
+
+_NS_DECL = (
+    'xmlns:cbc="urn:oasis:names:specification:ubl:schema:xsd:CommonBasicComponents-2" '
+    'xmlns:cac="urn:oasis:names:specification:ubl:schema:xsd:CommonAggregateComponents-2" '
+    'xmlns:efac="http://data.europa.eu/p27/eforms-ubl-extension-aggregate-components/1" '
+    'xmlns:efbc="http://data.europa.eu/p27/eforms-ubl-extension-basic-components/1" '
+    'xmlns:efext="http://data.europa.eu/p27/eforms-ubl-extensions/1" '
+    'xmlns:ext="urn:oasis:names:specification:ubl:schema:xsd:CommonExtensionComponents-2"'
+)
+
+_ROOT_NS = {
+    "ContractNotice": "urn:oasis:names:specification:ubl:schema:xsd:ContractNotice-2",
+    "PriorInformationNotice":
+        "urn:oasis:names:specification:ubl:schema:xsd:PriorInformationNotice-2",
+    "ContractAwardNotice": "urn:oasis:names:specification:ubl:schema:xsd:ContractAwardNotice-2",
+}
+
+_RELEVANT_CPVS = ["45330000", "45310000", "45440000", "45331000", "45210000", "50700000",
+                  "71300000", "45262000", "50720000", "45232000"]
+_OTHER_CPVS = ["72000000", "33000000", "15000000", "30200000", "79000000", "34100000",
+               "60100000", "09100000"]
+_NUTS = ["EE001", "EE004", "EE008", "EE009", "EEZZZ"]
+_WORDS = ("hange ehitustööd hoone renoveerimine tööde teostamine vastavalt "
+          "tehnilisele kirjeldusele lepingu täitmine pakkuja kohustub").split()
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(words))
+
+
+def _organization(rng: random.Random, idx: int) -> str:
+    nuts = rng.choice(_NUTS)
+    return f"""
+          <efac:Organization>
+            <efac:Company>
+              <cac:PartyIdentification>
+                <cbc:ID schemeName="organization">ORG-{idx:04d}</cbc:ID>
+              </cac:PartyIdentification>
+              <cac:PartyName><cbc:Name>Asutus {rng.randint(1, 9999)}</cbc:Name></cac:PartyName>
+              <cac:PostalAddress>
+                <cbc:StreetName>Tänav {rng.randint(1, 200)}</cbc:StreetName>
+                <cbc:CityName>Tallinn</cbc:CityName>
+                <cbc:PostalZone>1{rng.randint(1000, 9999)}</cbc:PostalZone>
+                <cbc:CountrySubentityCode listName="nuts">{nuts}</cbc:CountrySubentityCode>
+                <cac:Country>
+                  <cbc:IdentificationCode listName="country">EST</cbc:IdentificationCode>
+                </cac:Country>
+              </cac:PostalAddress>
+              <cac:PartyLegalEntity>
+                <cbc:CompanyID>{rng.randint(10000000, 99999999)}</cbc:CompanyID>
+              </cac:PartyLegalEntity>
+              <cac:Contact>
+                <cbc:Telephone>+372 {rng.randint(5000000, 5999999)}</cbc:Telephone>
+                <cbc:ElectronicMail>info{idx}@example.ee</cbc:ElectronicMail>
+              </cac:Contact>
+            </efac:Company>
+          </efac:Organization>"""
+
+
+def _lot(rng: random.Random, lot: int, cpv: str, rhr_id: int) -> str:
+    nuts = rng.choice(_NUTS)
+    extra_cpv = rng.choice(_RELEVANT_CPVS if cpv in _RELEVANT_CPVS else _OTHER_CPVS)
+    return f"""
+  <cac:ProcurementProjectLot>
+    <cbc:ID schemeName="Lot">LOT-{lot:04d}</cbc:ID>
+    <cac:TenderingTerms>
+      <cac:CallForTendersDocumentReference>
+        <cbc:ID>{rng.randint(1000000, 9999999)}</cbc:ID>
+        <cac:Attachment>
+          <cac:ExternalReference>
+            <cbc:URI>https://riigihanked.riik.ee/rhr-web/#/procurement/{rhr_id}/documents?group=B</cbc:URI>
+          </cac:ExternalReference>
+        </cac:Attachment>
+      </cac:CallForTendersDocumentReference>
+    </cac:TenderingTerms>
+    <cac:TenderingProcess>
+      <cac:TenderSubmissionDeadlinePeriod>
+        <cbc:EndDate>2026-03-{rng.randint(10, 28)}+02:00</cbc:EndDate>
+        <cbc:EndTime>12:00:00.000+02:00</cbc:EndTime>
+      </cac:TenderSubmissionDeadlinePeriod>
+    </cac:TenderingProcess>
+    <cac:ProcurementProject>
+      <cbc:ID schemeName="InternalID">{lot}</cbc:ID>
+      <cbc:Name>Osa {lot}: {_sentence(rng, 5)}</cbc:Name>
+      <cbc:Description>{_sentence(rng, rng.randint(40, 160))}</cbc:Description>
+      <cbc:ProcurementTypeCode listName="contract-nature">works</cbc:ProcurementTypeCode>
+      <cac:MainCommodityClassification>
+        <cbc:ItemClassificationCode listName="cpv">{cpv}</cbc:ItemClassificationCode>
+      </cac:MainCommodityClassification>
+      <cac:AdditionalCommodityClassification>
+        <cbc:ItemClassificationCode listName="cpv">{extra_cpv}</cbc:ItemClassificationCode>
+      </cac:AdditionalCommodityClassification>
+      <cac:RealizedLocation>
+        <cac:Address>
+          <cbc:CountrySubentityCode listName="nuts">{nuts}</cbc:CountrySubentityCode>
+          <cac:Country>
+            <cbc:IdentificationCode listName="country">EST</cbc:IdentificationCode>
+          </cac:Country>
+        </cac:Address>
+      </cac:RealizedLocation>
+      <cac:PlannedPeriod>
+        <cbc:DurationMeasure unitCode="MONTH">{rng.randint(1, 36)}</cbc:DurationMeasure>
+      </cac:PlannedPeriod>
+    </cac:ProcurementProject>
+  </cac:ProcurementProjectLot>"""
+
+
+def make_notice(
+    rng: random.Random,
+    index: int,
+    kind: str = "ContractNotice",
+    subtype: str = "16",
+    relevant: bool = True,
+) -> str:
+    """Render one notice element as an XML string."""
+    cpv = rng.choice(_RELEVANT_CPVS if relevant else _OTHER_CPVS)
+    rhr_id = 9000000 + index
+    organizations = "".join(_organization(rng, i) for i in range(rng.randint(2, 5)))
+    lots = "".join(_lot(rng, lot, cpv, rhr_id) for lot in range(1, rng.randint(2, 6)))
+    procedure = rng.choice(["open", "oth-single", "restricted"])
+    return f"""<{kind} xmlns="{_ROOT_NS[kind]}" {_NS_DECL}>
+  <ext:UBLExtensions>
+    <ext:UBLExtension>
+      <ext:ExtensionContent>
+        <efext:EformsExtension>
+          <efac:NoticeSubType>
+            <cbc:SubTypeCode listName="notice-subtype">{subtype}</cbc:SubTypeCode>
+          </efac:NoticeSubType>
+          <efac:Organizations>{organizations}
+          </efac:Organizations>
+          <efac:Publication>
+            <efbc:NoticePublicationID schemeName="ojs-notice-id">
+              {index:08d}-2026
+            </efbc:NoticePublicationID>
+          </efac:Publication>
+        </efext:EformsExtension>
+      </ext:ExtensionContent>
+    </ext:UBLExtension>
+  </ext:UBLExtensions>
+  <cbc:UBLVersionID>2.3</cbc:UBLVersionID>
+  <cbc:ID schemeName="notice-id">notice-{index:08d}</cbc:ID>
+  <cbc:ContractFolderID>folder-{index:08d}</cbc:ContractFolderID>
+  <cbc:IssueDate>2026-02-{rng.randint(1, 28):02d}+02:00</cbc:IssueDate>
+  <cbc:IssueTime>10:00:00+02:00</cbc:IssueTime>
+  <cbc:NoticeTypeCode listName="competition">cn-standard</cbc:NoticeTypeCode>
+  <cac:ContractingParty>
+    <cac:Party>
+      <cac:PartyIdentification>
+        <cbc:ID schemeName="organization">ORG-0000</cbc:ID>
+      </cac:PartyIdentification>
+    </cac:Party>
+  </cac:ContractingParty>
+  <cac:TenderingProcess>
+    <cbc:ProcedureCode listName="procurement-procedure-type">{procedure}</cbc:ProcedureCode>
+  </cac:TenderingProcess>
+  <cac:ProcurementProject>
+    <cbc:ID schemeName="InternalID">{index}</cbc:ID>
+    <cbc:Name>{_sentence(rng, 6)}</cbc:Name>
+    <cbc:Description>{_sentence(rng, rng.randint(60, 240))}</cbc:Description>
+    <cbc:ProcurementTypeCode listName="contract-nature">works</cbc:ProcurementTypeCode>
+    <cac:RequestedTenderTotal>
+      <cbc:EstimatedOverallContractAmount currencyID="EUR">
+        {rng.randint(30000, 2000000)}
+      </cbc:EstimatedOverallContractAmount>
+    </cac:RequestedTenderTotal>
+    <cac:MainCommodityClassification>
+      <cbc:ItemClassificationCode listName="cpv">{cpv}</cbc:ItemClassificationCode>
+    </cac:MainCommodityClassification>
+  </cac:ProcurementProject>{lots}
+</{kind}>
+"""
+
+
+def iter_dump(
+    notices: int,
+    seed: int = 0,
+    active_ratio: float = 0.35,
+    relevant_ratio: float = 0.3,
+) -> Iterator[bytes]:
+    """Yield a synthetic bulk dump as byte chunks, one notice per chunk.
+
+    `active_ratio` of notices are biddable contract notices (the rest are award
+    notices and planning-only PINs), and `relevant_ratio` of all notices carry a
+    trade-relevant CPV code.
+    """
+    rng = random.Random(seed)
+    yield b'<?xml version="1.0" encoding="UTF-8"?>\n<OPEN-DATA>\n'
+    for i in range(notices):
+        if rng.random() < active_ratio:
+            kind, subtype = "ContractNotice", rng.choice(["7", "16", "17", "19"])
+        else:
+            kind, subtype = rng.choice([
+                ("ContractAwardNotice", "29"),
+                ("ContractAwardNotice", "30"),
+                ("PriorInformationNotice", "1"),
+                ("ContractNotice", "38"),  # contract modification
+            ])
+        relevant = rng.random() < relevant_ratio
+        yield make_notice(rng, i, kind, subtype, relevant).encode()
+    yield b"</OPEN-DATA>\n"
+
+
+def write_dump(path: str, notices: int, seed: int = 0) -> int:
+    """Write a synthetic dump to `path` and return its size in bytes."""
+    size = 0
+    with open(path, "wb") as f:
+        for chunk in iter_dump(notices, seed):
+            f.write(chunk)
+            size += len(chunk)
+    return size
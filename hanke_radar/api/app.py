@@ -1,15 +1,54 @@
 """FastAPI application for HankeRadar REST API."""
 
+import asyncio
+from contextlib import asynccontextmanager, suppress
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from hanke_radar.api.cache import fetch_generation, response_cache
+from hanke_radar.api.responses import FastJSONResponse
 from hanke_radar.api.routes import router
 from hanke_radar.config import settings
+from hanke_radar.db.engine import async_session
+from hanke_radar.db.schema import ensure_schema
+
+
+async def _poll_generation() -> None:
+    """Keep the response cache's data generation current."""
+    while True:
+        await asyncio.sleep(settings.api_generation_poll_seconds)
+        try:
+            async with async_session() as session:
+                response_cache.set_generation(*await fetch_generation(session))
+        except Exception as e:
+            # Keep serving what is cached for the last known generation
+            print(f"Generation poll failed: {e}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if async_session is None:
+        yield
+        return
+    async with async_session() as session:
+        await ensure_schema(session)
+        response_cache.set_generation(*await fetch_generation(session))
+    poller = asyncio.create_task(_poll_generation())
+    try:
+        yield
+    finally:
+        poller.cancel()
+        with suppress(asyncio.CancelledError):
+            await poller
+
 
 app = FastAPI(
     title="HankeRadar API",
     description="Estonian public procurement data for tradespeople",
     version="0.1.0",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
 app.add_middleware(
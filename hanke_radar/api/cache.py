@@ -0,0 +1,174 @@
+"""In-process cache of encoded API responses, invalidated by data generation.
+
+Data only changes when a scrape / expire / enrich run finishes, and every such
+run finishes a `scrape_runs` row, flagged `data_changed` when it wrote any
+rows. Finishing one that changed data bumps the single-row `data_generation`
+counter, so no-op runs keep the cache warm: the app polls the counter in the
+background, and when it moves the whole cache is dropped. Entries are JSON
+bytes, so a hit is a dict lookup plus a Response; no session, pool or encoder
+is involved.
+
+The generation also drives HTTP validators. A response's ETag is the
+generation plus a digest of its cache key, and Last-Modified is when the
+generation last moved. A request that revalidates with a matching
+If-None-Match (or a recent enough If-Modified-Since) gets a 304 before any
+lookup or query. Routes whose key may name a missing row (a procurement id)
+pass `require_entry`, so validators are only honoured once the row is known
+to exist.
+"""
+
+import hashlib
+from collections import OrderedDict
+from collections.abc import Hashable, Mapping
+from datetime import datetime
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi.responses import Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from hanke_radar.api.responses import dumps
+from hanke_radar.config import settings
+from hanke_radar.db.models import DataGeneration
+
+
+async def fetch_generation(session: AsyncSession) -> tuple[int, datetime | None]:
+    """The data generation and when it last moved: one primary-key read."""
+    result = await session.execute(
+        select(DataGeneration.generation, DataGeneration.changed_at).where(DataGeneration.id == 1)
+    )
+    generation, last_modified = result.one()
+    return generation, last_modified
+
+
+def _etag_matches(etag: str, if_none_match: str) -> bool:
+    """Weak comparison against an If-None-Match list (RFC 9110 13.1.2)."""
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+class ApiResponseCache:
+    """LRU map of (route, normalized params) -> encoded JSON response.
+
+    Nothing is cached until a generation is known (no DB, or before the first
+    poll), so responses are never served from an unknown data state. The same
+    goes for validators: without a generation, responses carry no ETag.
+    """
+
+    def __init__(self, max_entries: int = 512, max_age: int = 60) -> None:
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.generation: int | None = None
+        self.last_modified: datetime | None = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.not_modified = 0
+        self._entries: OrderedDict[Hashable, bytes] = OrderedDict()
+
+    def set_generation(self, generation: int, last_modified: datetime | None = None) -> None:
+        if generation != self.generation:
+            self._entries.clear()
+            self.generation = generation
+            self.last_modified = last_modified
+
+    def etag(self, key: Hashable) -> str | None:
+        if self.generation is None:
+            return None
+        digest = hashlib.blake2b(repr(key).encode(), digest_size=8).hexdigest()
+        return f'W/"{self.generation}-{digest}"'
+
+    def _validators(self, key: Hashable) -> dict[str, str]:
+        headers = {"Cache-Control": f"public, max-age={self.max_age}"}
+        if (etag := self.etag(key)) is not None:
+            headers["ETag"] = etag
+            if self.last_modified is not None:
+                headers["Last-Modified"] = format_datetime(self.last_modified, usegmt=True)
+        return headers
+
+    def _is_fresh(self, key: Hashable, request_headers: Mapping[str, str]) -> bool:
+        etag = self.etag(key)
+        if etag is None:
+            return False
+        # If-None-Match wins over If-Modified-Since when both are sent
+        if (if_none_match := request_headers.get("if-none-match")) is not None:
+            return _etag_matches(etag, if_none_match)
+        if_modified_since = request_headers.get("if-modified-since")
+        if if_modified_since is None or self.last_modified is None:
+            return False
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        # HTTP dates have whole seconds
+        return since.tzinfo is not None and self.last_modified.replace(microsecond=0) <= since
+
+    def revalidate(self, key: Hashable, request_headers: Mapping[str, str]) -> Response | None:
+        """A 304 if the request's validators match `key` in this generation, else None."""
+        if not self._is_fresh(key, request_headers):
+            return None
+        self.not_modified += 1
+        return Response(status_code=304, headers=self._validators(key))
+
+    def get(
+        self,
+        key: Hashable,
+        request_headers: Mapping[str, str] | None = None,
+        require_entry: bool = False,
+    ) -> Response | None:
+        """304 if the request's validators match, the cached 200 on a hit, else None.
+
+        With `require_entry`, validators are only checked for keys cached in
+        this generation; the caller revalidates once it has found the data.
+        """
+        if request_headers is not None and (not require_entry or key in self._entries):
+            if (not_modified := self.revalidate(key, request_headers)) is not None:
+                return not_modified
+        body = self._entries.get(key)
+        if body is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return Response(
+            content=body, media_type="application/json", headers=self._validators(key)
+        )
+
+    def store(self, key: Hashable, data, generation: int | None) -> Response:
+        """Encode `data`, cache it if `generation` (read before the queries ran)
+        is still current, and return the response."""
+        body = dumps(data)
+        if generation is None or generation != self.generation:
+            # Computed under an older (or unknown) generation: no cache, no validators
+            return Response(content=body, media_type="application/json")
+        if self.max_entries:
+            self._entries[key] = body
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return Response(
+            content=body, media_type="application/json", headers=self._validators(key)
+        )
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "generation": self.generation,
+            "last_modified": self.last_modified,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "not_modified": self.not_modified,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+response_cache = ApiResponseCache(settings.api_cache_max_entries, settings.api_http_max_age)
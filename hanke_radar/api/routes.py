@@ -1,126 +1,308 @@
 """API routes for procurement data."""
 
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy import func, select, text
+import base64
+import json
+from datetime import datetime
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy import Row, Select, Text, bindparam, func, select, tuple_
+from sqlalchemy.dialects.postgresql import ARRAY, asyncpg
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from hanke_radar.api.cache import response_cache
 from hanke_radar.db.engine import get_session
 from hanke_radar.db.models import Procurement, ScrapeRun
+from hanke_radar.db.summary import load_stats
 
 router = APIRouter()
 
+# Columns the API returns, read as plain rows. raw_html and the bookkeeping
+# columns are never loaded.
+ITEM_COLUMNS = (
+    Procurement.id,
+    Procurement.notice_id,
+    Procurement.procurement_id,
+    Procurement.title,
+    Procurement.description,
+    Procurement.contracting_auth,
+    Procurement.contracting_auth_reg,
+    Procurement.contract_type,
+    Procurement.procedure_type,
+    Procurement.cpv_primary,
+    Procurement.cpv_additional,
+    Procurement.estimated_value,
+    Procurement.nuts_code,
+    Procurement.nuts_name,
+    Procurement.submission_deadline,
+    Procurement.publication_date,
+    Procurement.duration_months,
+    Procurement.status,
+    Procurement.source_url,
+    Procurement.trade_tags,
+    Procurement.contact_person,
+    Procurement.contact_email,
+    Procurement.contact_phone,
+    Procurement.performance_address,
+)
 
-@router.get("/procurements")
-async def list_procurements(
-    trade: str | None = Query(None, description="Filter by trade tag (plumbing, electrical, etc.)"),
-    cpv: str | None = Query(None, description="Filter by CPV code prefix"),
-    region: str | None = Query(None, description="Filter by NUTS region code"),
-    status: str = Query("active", description="Filter by status (active, expired, awarded)"),
-    min_value: float | None = Query(None, description="Minimum estimated value EUR"),
-    max_value: float | None = Query(None, description="Maximum estimated value EUR"),
-    page: int = Query(1, ge=1),
-    per_page: int = Query(20, ge=1, le=100),
-    session: AsyncSession = Depends(get_session),
-):
-    """List procurements with filtering and pagination."""
-    query = select(Procurement)
+# Anything a caller can name in `fields=`
+ITEM_FIELDS = {c.key: c for c in ITEM_COLUMNS} | {
+    "description_snippet": Procurement.description_snippet,
+}
+
+# view=compact: a list row, with the stored snippet instead of the full description
+COMPACT_FIELDS = (
+    "id",
+    "title",
+    "contracting_auth",
+    "estimated_value",
+    "nuts_name",
+    "submission_deadline",
+    "trade_tags",
+    "description_snippet",
+)
 
+# Always read, since next_cursor is built from them
+_CURSOR_FIELDS = ("publication_date", "id")
+
+# Newest first; id breaks ties so every row has exactly one position
+_LIST_ORDER = (Procurement.publication_date.desc().nulls_last(), Procurement.id.desc())
+
+
+def encode_cursor(p: Row | Procurement) -> str:
+    """Opaque token for the position just after `p` in list order."""
+    key = [p.publication_date.isoformat() if p.publication_date else None, p.id]
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime | None, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        published, last_id = json.loads(raw)
+        return (datetime.fromisoformat(published) if published else None), int(last_id)
+    except (ValueError, TypeError) as e:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from e
+
+
+def keyset_ranges(query: Select, cursor: str) -> list[Select]:
+    """The rows after `cursor`, in list order, as index ranges instead of an OFFSET.
+
+    Dated rows come first and rows without a publication_date last (NULLS
+    LAST), so the page may continue from the first range into the second.
+    """
+    published, last_id = decode_cursor(cursor)
+    undated = query.where(Procurement.publication_date.is_(None))
+    if published is None:
+        return [undated.where(Procurement.id < last_id)]
+    dated = query.where(tuple_(Procurement.publication_date, Procurement.id) < (published, last_id))
+    return [dated, undated]
+
+
+def filter_procurements(
+    query: Select,
+    trade: str | None = None,
+    cpv: str | None = None,
+    region: str | None = None,
+    status: str | None = "active",
+    min_value: float | None = None,
+    max_value: float | None = None,
+) -> Select:
+    """Apply the /procurements list filters to `query`."""
     if status:
         query = query.where(Procurement.status == status)
     if trade:
-        query = query.where(Procurement.trade_tags.any(trade))
+        # @> rather than = ANY(): only the former can use the GIN index. Bound as
+        # text[] so asyncpg doesn't send varchar[], which has no @> with text[]
+        query = query.where(Procurement.trade_tags.op("@>")(
+            bindparam("trade", [trade], type_=ARRAY(Text))
+        ))
     if cpv:
-        query = query.where(Procurement.cpv_primary.startswith(cpv))
+        # Inlined so even a generic plan sees a constant prefix it can match
+        # against idx_procurements_cpv_pattern
+        pattern = cpv.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        query = query.where(Procurement.cpv_primary.like(
+            bindparam("cpv_pattern", pattern, literal_execute=True), escape="\\"
+        ))
     if region:
         query = query.where(Procurement.nuts_code == region)
     if min_value is not None:
         query = query.where(Procurement.estimated_value >= min_value)
     if max_value is not None:
         query = query.where(Procurement.estimated_value <= max_value)
+    return query
+
+
+def parse_fields(fields: str | None, view: str = "full") -> tuple[str, ...]:
+    """Item keys for a request: the comma-separated `fields`, else the view preset."""
+    if fields is None:
+        return COMPACT_FIELDS if view == "compact" else tuple(c.key for c in ITEM_COLUMNS)
+    names = tuple(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+    unknown = [name for name in names if name not in ITEM_FIELDS]
+    if unknown or not names:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)}" if unknown else "No fields given",
+        )
+    return names
 
-    # Count total
-    count_query = select(func.count()).select_from(query.subquery())
-    total = (await session.execute(count_query)).scalar()
 
-    # Paginate, newest first
-    query = (
-        query.order_by(Procurement.publication_date.desc())
-        .offset((page - 1) * per_page)
-        .limit(per_page)
+async def estimate_count(session: AsyncSession, query: Select) -> int:
+    """Planner row estimate for `query` (EXPLAIN, nothing is executed)."""
+    sql = query.compile(dialect=asyncpg.dialect(), compile_kwargs={"literal_binds": True})
+    conn = await session.connection()
+    plan = (await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+@router.get("/procurements")
+async def list_procurements(
+    request: Request,
+    trade: str | None = Query(None, description="Filter by trade tag (plumbing, electrical, etc.)"),
+    cpv: str | None = Query(None, description="Filter by CPV code prefix"),
+    region: str | None = Query(None, description="Filter by NUTS region code"),
+    status: str = Query("active", description="Filter by status (active, expired, awarded)"),
+    min_value: float | None = Query(None, description="Minimum estimated value EUR"),
+    max_value: float | None = Query(None, description="Maximum estimated value EUR"),
+    cursor: str | None = Query(None, description="next_cursor from the previous page"),
+    page: int = Query(1, ge=1, description="Offset paging; ignored when cursor is set"),
+    per_page: int = Query(20, ge=1, le=100),
+    include_total: bool | None = Query(
+        None, description="Count all matches (default: only on the first page)"
+    ),
+    estimate_total: bool = Query(
+        False, description="Return the planner's row estimate instead of an exact count"
+    ),
+    fields: str | None = Query(
+        None, description="Comma-separated item fields to return (overrides view)"
+    ),
+    view: Literal["full", "compact"] = Query(
+        "full", description="compact: list-row fields with a description snippet"
+    ),
+    session: AsyncSession = Depends(get_session),
+):
+    """List procurements, newest first, with filtering and pagination.
+
+    Pass `next_cursor` back as `cursor` to get the next page: the position is
+    an index range on (publication_date, id), so deep pages cost the same as
+    the first. `page` (OFFSET) still works without a cursor. Only the columns
+    behind `fields` (or the `view` preset) are read from the DB.
+    """
+    names = parse_fields(fields, view)
+    key = ("procurements", trade, cpv, region, status, min_value, max_value, cursor, page,
+           per_page, include_total, estimate_total, names)
+    if (cached := response_cache.get(key, request.headers)) is not None:
+        return cached
+    generation = response_cache.generation
+
+    columns = [ITEM_FIELDS[name] for name in dict.fromkeys(names + _CURSOR_FIELDS)]
+    query = filter_procurements(
+        select(*columns), trade, cpv, region, status, min_value, max_value
     )
-    result = await session.execute(query)
-    rows = result.scalars().all()
 
-    return {
+    total = None
+    if include_total is None:
+        include_total = cursor is None and page == 1
+    if include_total:
+        if estimate_total:
+            total = await estimate_count(session, query)
+        else:
+            count_query = select(func.count()).select_from(query.order_by(None).subquery())
+            total = (await session.execute(count_query)).scalar()
+
+    # One extra row tells us whether there is a next page
+    if cursor:
+        rows = []
+        for part in keyset_ranges(query, cursor):
+            result = await session.execute(
+                part.order_by(*_LIST_ORDER).limit(per_page + 1 - len(rows))
+            )
+            rows.extend(result.all())
+            if len(rows) > per_page:
+                break
+    else:
+        result = await session.execute(
+            query.order_by(*_LIST_ORDER).offset((page - 1) * per_page).limit(per_page + 1)
+        )
+        rows = result.all()
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+
+    return response_cache.store(key, {
         "total": total,
-        "page": page,
+        "total_estimated": bool(include_total and estimate_total),
+        "page": None if cursor else page,
         "per_page": per_page,
-        "items": [_serialize(r) for r in rows],
-    }
+        "next_cursor": encode_cursor(rows[-1]) if has_more else None,
+        "items": [_serialize(r, names) for r in rows],
+    }, generation)
 
 
 @router.get("/procurements/stats")
 async def procurement_stats(
+    request: Request,
     session: AsyncSession = Depends(get_session),
 ):
     """Get procurement counts by trade, region, and status."""
-    # By trade
-    trade_result = await session.execute(
-        text("""
-            SELECT unnest(trade_tags) as trade, COUNT(*) as cnt
-            FROM procurements
-            WHERE status = 'active'
-            GROUP BY trade ORDER BY cnt DESC
-        """)
-    )
-    # By region
-    region_result = await session.execute(
-        select(Procurement.nuts_code, Procurement.nuts_name, func.count(Procurement.id))
-        .where(Procurement.status == "active")
-        .group_by(Procurement.nuts_code, Procurement.nuts_name)
-        .order_by(func.count(Procurement.id).desc())
-    )
-    # By status
-    status_result = await session.execute(
-        select(Procurement.status, func.count(Procurement.id)).group_by(Procurement.status)
-    )
+    if (cached := response_cache.get(("stats",), request.headers)) is not None:
+        return cached
+    generation = response_cache.generation
 
-    return {
-        "by_trade": [{"trade": t, "count": c} for t, c in trade_result.all()],
+    stats = await load_stats(session)
+    return response_cache.store(("stats",), {
+        "by_trade": [{"trade": t, "count": c} for t, c in stats.by_trade("active")],
         "by_region": [
             {"nuts_code": n, "nuts_name": name, "count": c}
-            for n, name, c in region_result.all()
+            for n, name, c in stats.by_region("active")
         ],
-        "by_status": [{"status": s, "count": c} for s, c in status_result.all()],
-    }
+        "by_status": [{"status": s, "count": c} for s, c in stats.by_status()],
+    }, generation)
 
 
 @router.get("/procurements/{procurement_id}")
 async def get_procurement(
     procurement_id: int,
+    request: Request,
     session: AsyncSession = Depends(get_session),
 ):
     """Get a single procurement by database ID."""
-    result = await session.execute(select(Procurement).where(Procurement.id == procurement_id))
-    row = result.scalar()
+    key = ("procurement", procurement_id)
+    # Any id can be asked for: only revalidate ids known to exist
+    if (cached := response_cache.get(key, request.headers, require_entry=True)) is not None:
+        return cached
+    generation = response_cache.generation
+
+    result = await session.execute(select(*ITEM_COLUMNS).where(Procurement.id == procurement_id))
+    row = result.first()
     if row is None:
-        return {"error": "Not found"}, 404
-    return _serialize(row)
+        raise HTTPException(status_code=404, detail="Procurement not found")
+    if (not_modified := response_cache.revalidate(key, request.headers)) is not None:
+        return not_modified
+    return response_cache.store(key, _serialize(row), generation)
 
 
 @router.get("/trades")
 async def list_trades(
+    request: Request,
     session: AsyncSession = Depends(get_session),
 ):
     """List available trade categories with procurement counts."""
-    result = await session.execute(
-        text("""
-            SELECT unnest(trade_tags) as trade, COUNT(*) as cnt
-            FROM procurements
-            GROUP BY trade ORDER BY cnt DESC
-        """)
+    if (cached := response_cache.get(("trades",), request.headers)) is not None:
+        return cached
+    generation = response_cache.generation
+
+    stats = await load_stats(session)
+    return response_cache.store(
+        ("trades",), [{"trade_key": t, "count": c} for t, c in stats.by_trade()], generation
     )
-    return [{"trade_key": t, "count": c} for t, c in result.all()]
+
+
+@router.get("/cache/stats")
+async def cache_stats():
+    """Response cache hits, misses and size for the current data generation."""
+    return response_cache.stats()
 
 
 @router.get("/scrape/status")
@@ -146,31 +328,15 @@ async def scrape_status(
     ]
 
 
-def _serialize(p: Procurement) -> dict:
-    """Serialize a Procurement ORM object to a dict."""
-    return {
-        "id": p.id,
-        "notice_id": p.notice_id,
-        "procurement_id": p.procurement_id,
-        "title": p.title,
-        "description": p.description,
-        "contracting_auth": p.contracting_auth,
-        "contracting_auth_reg": p.contracting_auth_reg,
-        "contract_type": p.contract_type,
-        "procedure_type": p.procedure_type,
-        "cpv_primary": p.cpv_primary,
-        "cpv_additional": p.cpv_additional,
-        "estimated_value": float(p.estimated_value) if p.estimated_value else None,
-        "nuts_code": p.nuts_code,
-        "nuts_name": p.nuts_name,
-        "submission_deadline": p.submission_deadline.isoformat() if p.submission_deadline else None,
-        "publication_date": p.publication_date.isoformat() if p.publication_date else None,
-        "duration_months": p.duration_months,
-        "status": p.status,
-        "source_url": p.source_url,
-        "trade_tags": p.trade_tags,
-        "contact_person": p.contact_person,
-        "contact_email": p.contact_email,
-        "contact_phone": p.contact_phone,
-        "performance_address": p.performance_address,
-    }
+def _serialize(row, fields: tuple[str, ...] | None = None) -> dict:
+    """Serialize a row of ITEM_FIELDS columns to a dict, keeping only `fields`.
+
+    Datetimes are left to the encoder.
+    """
+    item = row._asdict()
+    if fields is not None:
+        item = {name: item[name] for name in fields}
+    if "estimated_value" in item:
+        value = item["estimated_value"]
+        item["estimated_value"] = float(value) if value else None
+    return item
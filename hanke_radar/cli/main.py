@@ -16,9 +16,13 @@ def scrape(
     year: int = typer.Option(datetime.now().year, help="Year to scrape"),
     month: int = typer.Option(datetime.now().month, help="Month to scrape"),
     backfill: int = typer.Option(0, help="Number of previous months to also scrape"),
+    workers: int = typer.Option(1, help="Parse month dumps in this many processes"),
+    full: bool = typer.Option(
+        False, "--full", help="Re-parse notices already in the DB and reconcile them"
+    ),
 ):
     """Scrape procurement data from riigihanked.riik.ee bulk XML."""
-    from hanke_radar.scraper.bulk_scraper import scrape_month
+    from hanke_radar.scraper.bulk_scraper import scrape_month, scrape_months_parallel
 
     months_to_scrape = []
     for i in range(backfill, -1, -1):
@@ -34,10 +38,19 @@ def scrape(
     async def _scrape_all():
         """Run all months in a single event loop to avoid session/engine issues."""
         _results = []
+        if workers > 1 and len(months_to_scrape) > 1:
+            outcomes = await scrape_months_parallel(months_to_scrape, workers, full=full)
+            for (_y, _m), outcome in zip(months_to_scrape, outcomes, strict=True):
+                if isinstance(outcome, BaseException):
+                    console.print(f"[red]{_y}-{_m:02d} failed: {outcome}[/red]")
+                else:
+                    _results.append(outcome)
+            return _results
+
         for _y, _m in months_to_scrape:
             console.print(f"\n[cyan]--- {_y}-{_m:02d} ---[/cyan]")
             try:
-                summary = await scrape_month(_y, _m)
+                summary = await scrape_month(_y, _m, full=full)
                 _results.append(summary)
             except Exception as e:
                 console.print(f"[red]Failed: {e}[/red]")
@@ -51,18 +64,32 @@ def scrape(
         table.add_column("Month")
         table.add_column("Total", justify="right")
         table.add_column("Relevant", justify="right")
-        table.add_column("Stored", justify="right")
+        table.add_column("New", justify="right")
+        table.add_column("Changed", justify="right")
+        table.add_column("Unchanged", justify="right")
+        table.add_column("Known", justify="right")
         table.add_column("Errors", justify="right")
         table.add_column("Time", justify="right")
+        table.add_column("Download", justify="right")
+        table.add_column("Parse", justify="right")
+        table.add_column("Store", justify="right")
+        table.add_column("Cache")
 
         for r in results:
             table.add_row(
                 r["year_month"],
                 str(r["total_notices"]),
                 str(r["trade_relevant"]),
-                str(r["stored"]),
+                str(r["new"]),
+                str(r["changed"]),
+                str(r["unchanged"]),
+                str(r["skipped_known"]),
                 str(r["errors"]),
                 f"{r['duration_ms']}ms",
+                f"{r['download_ms']}ms",
+                f"{r['parse_ms']}ms",
+                f"{r['store_ms']}ms",
+                r["cache"] or "-",
             )
         console.print(table)
 
@@ -86,31 +113,19 @@ def status():
             console.print("[red]DATABASE_URL not configured[/red]")
             return
 
-        from sqlalchemy import func, select, text
+        from sqlalchemy import select
 
-        from hanke_radar.db.models import Procurement, ScrapeRun
+        from hanke_radar.db.models import ScrapeRun
+        from hanke_radar.db.schema import ensure_schema
+        from hanke_radar.db.summary import load_stats
 
         async with async_session() as session:
-            # Total procurements
-            total = await session.execute(select(func.count(Procurement.id)))
-            total_count = total.scalar()
+            await ensure_schema(session)
 
-            # By status
-            by_status = await session.execute(
-                select(Procurement.status, func.count(Procurement.id)).group_by(Procurement.status)
-            )
-            status_counts = dict(by_status.all())
-
-            # By trade tag
-            trade_counts = await session.execute(
-                text("""
-                    SELECT unnest(trade_tags) as trade, COUNT(*) as cnt
-                    FROM procurements
-                    GROUP BY trade
-                    ORDER BY cnt DESC
-                """)
-            )
-            trades = trade_counts.all()
+            stats = await load_stats(session)
+            total_count = stats.total()
+            status_counts = dict(stats.by_status())
+            trades = stats.by_trade()
 
             # Last scrape run
             last_run = await session.execute(
@@ -149,15 +164,29 @@ def status():
     asyncio.run(_status())
 
 
+def _print_concurrency(st: dict) -> None:
+    if st:
+        console.print(
+            f"Adaptive concurrency: ended at {st['limit']:g} in flight "
+            f"(peak {st['peak_limit']:g}), {st['throttles']} throttles, "
+            f"{st['decreases']} backoffs"
+        )
+
+
 @app.command()
 def enrich(
     limit: int = typer.Option(50, help="Max procurements to enrich per run"),
+    concurrency: int = typer.Option(
+        0, help="Procurements enriched at once (0 = ENRICH_CONCURRENCY setting)"
+    ),
 ):
     """Enrich active procurements with contact info from RHR API."""
     from hanke_radar.scraper.html_enricher import enrich_active_procurements
 
     console.print(f"[bold]Enriching up to {limit} procurements...[/bold]")
-    summary = asyncio.run(enrich_active_procurements(limit=limit))
+    summary = asyncio.run(
+        enrich_active_procurements(limit=limit, concurrency=concurrency or None)
+    )
 
     table = Table(title="Enrichment Summary")
     table.add_column("Metric")
@@ -169,6 +198,99 @@ def enrich(
     table.add_row("Duration", f"{summary['duration_ms']}ms")
     console.print(table)
 
+    if summary["latency"]:
+        latency = Table(title="RHR API latency")
+        latency.add_column("Endpoint")
+        for col in ("Calls", "Failed", "Retried", "Mean", "p50", "p95", "Max"):
+            latency.add_column(col, justify="right")
+        for endpoint, st in summary["latency"].items():
+            latency.add_row(
+                endpoint,
+                str(st["calls"]),
+                str(st["failures"]),
+                str(st["retries"]),
+                *(f"{st[k]:.0f}ms" if k in st else "-"
+                  for k in ("mean_ms", "p50_ms", "p95_ms", "max_ms")),
+            )
+        console.print(latency)
+
+    for endpoint, st in summary["cache"].items():
+        console.print(
+            f"Cache {endpoint}: {st['hits']} hits / {st['misses']} misses "
+            f"({st['hit_ratio']:.0%})"
+            + (f", {st['errors']} SQLite errors" if st["errors"] else "")
+        )
+    _print_concurrency(summary["concurrency"])
+
+
+@app.command("enrich-worker")
+def enrich_worker(
+    worker_id: str = typer.Option("", help="Worker name (default host:pid)"),
+    batch_size: int = typer.Option(0, help="Jobs claimed per round (0 = setting)"),
+    max_jobs: int = typer.Option(0, help="Stop after this many jobs (0 = run forever)"),
+    once: bool = typer.Option(False, "--once", help="Exit when the queue is empty"),
+):
+    """Run a queue-backed enrichment worker; start several to scale out."""
+    from hanke_radar.scraper.enrich_queue import run_enrichment_worker
+
+    try:
+        totals = asyncio.run(run_enrichment_worker(
+            worker_id=worker_id or None,
+            batch_size=batch_size or None,
+            max_jobs=max_jobs or None,
+            once=once,
+        ))
+    except KeyboardInterrupt:
+        console.print("[yellow]Stopped; leased jobs are reclaimed when the lease expires[/yellow]")
+        return
+
+    table = Table(title="Worker Summary")
+    table.add_column("Metric")
+    table.add_column("Count", justify="right")
+    for key in ("claimed", "enriched", "skipped", "retried", "dead"):
+        table.add_row(key.capitalize(), str(totals[key]))
+    console.print(table)
+
+
+@app.command()
+def refresh(
+    limit: int = typer.Option(0, help="Max procurements to check (0 = all active)"),
+    concurrency: int = typer.Option(
+        0, help="Version checks in flight (0 = REFRESH_CONCURRENCY setting)"
+    ),
+):
+    """Re-enrich procurements whose RHR version changed since they were enriched."""
+    from hanke_radar.scraper.html_enricher import refresh_enriched_procurements
+
+    console.print("[bold]Checking RHR versions of enriched procurements...[/bold]")
+    summary = asyncio.run(
+        refresh_enriched_procurements(limit=limit or None, concurrency=concurrency or None)
+    )
+
+    table = Table(title="Refresh Summary")
+    table.add_column("Metric")
+    table.add_column("Count", justify="right")
+    table.add_row("Checked", str(summary["checked"]))
+    table.add_row("New versions", str(summary["moved"]))
+    table.add_row("Updated", str(summary["updated"]))
+    table.add_row("Unchanged", str(summary["unchanged"]))
+    table.add_row("Errors", str(summary["errors"]))
+    table.add_row("Duration", f"{summary['duration_ms']}ms")
+    console.print(table)
+    _print_concurrency(summary["concurrency"])
+
+
+@app.command()
+def retag():
+    """Recompute trade tags for all procurements from the trade_cpv_mappings table."""
+    from hanke_radar.scraper.trade_mappings import retag_procurements
+
+    summary = asyncio.run(retag_procurements(verbose=False))
+    console.print(
+        f"[green]Retagged {summary['updated']} procurements[/green] "
+        f"(mappings {summary['version'][:8]}, {summary['duration_ms']}ms)"
+    )
+
 
 @app.command()
 def serve(
@@ -9,13 +9,36 @@ class Settings(BaseSettings):
 
     # Scraper
     riigihanked_base_url: str = "https://riigihanked.riik.ee/rhr/api/public/v1"
-    scrape_delay_seconds: float = 1.0  # polite rate limiting
+    enrich_requests_per_second: float = 3.0  # global cap across enrichment workers
+    enrich_concurrency: int = 8  # procurements enriched at once
+    enrich_write_chunk_size: int = 50  # results per UPDATE ... FROM (VALUES ...) + commit
+    enrich_worker_batch_size: int = 32  # jobs claimed per round by `hanke enrich-worker`
+    enrich_worker_idle_seconds: float = 60.0  # sleep when the queue is empty
+    enrich_job_lease_seconds: int = 600  # a claimed job is reclaimable after this
+    enrich_job_max_attempts: int = 5  # then the job is dead-lettered
+    enrich_job_retry_base_seconds: float = 60.0  # backoff doubles per attempt
+    enrich_job_retry_max_seconds: float = 6 * 3600
+    rhr_adaptive_initial: int = 4  # requests in flight before the portal's signals adjust it
+    rhr_adaptive_max: int = 32
+    rhr_latency_target_ms: float = 2000.0  # p95 above this stops growth and shrinks the limit
+    rhr_max_retries: int = 3  # per request, on 429/5xx/timeouts
+    rhr_retry_base_seconds: float = 1.0  # backoff doubles per retry unless Retry-After says more
+    refresh_concurrency: int = 32  # latest-version checks in flight during `hanke refresh`
+    refresh_batch_size: int = 500  # procurements checked (and committed) per batch
+    rhr_cache_path: str = ".cache/rhr.sqlite"  # RHR API response cache; "" disables
+    rhr_latest_version_ttl_seconds: int = 12 * 3600  # proc-vers payloads never expire
     request_timeout_seconds: int = 120  # bulk XML can be large
+    pipeline_queue_size: int = 256  # parsed notices buffered between parser and DB writer
+    upsert_batch_size: int = 500  # notices per multi-row INSERT ... ON CONFLICT
+    dump_cache_dir: str = ".cache/dumps"  # monthly XML dumps + validators; "" disables
 
     # API
     api_host: str = "0.0.0.0"
     api_port: int = 8000
     port: int = 0  # Render sets PORT env var — overrides api_port if set
+    api_cache_max_entries: int = 512  # cached stats/trades/list responses; 0 disables
+    api_generation_poll_seconds: float = 5.0  # how often the API checks for finished runs
+    api_http_max_age: int = 60  # Cache-Control max-age on data responses (browsers, CDN)
     cors_origins: list[str] = [
         "http://localhost:3003",          # QuoteKit local
         "https://quote-kit.vercel.app",   # QuoteKit production
@@ -4,15 +4,23 @@
 from sqlalchemy import (
     ARRAY,
     DECIMAL,
+    BigInteger,
+    Boolean,
     Column,
     DateTime,
+    Float,
+    ForeignKey,
     Index,
     Integer,
     Text,
     func,
+    text,
 )
 from sqlalchemy.orm import DeclarativeBase
 
+# Characters kept in procurements.description_snippet (whitespace collapsed, "…" appended)
+SNIPPET_LENGTH = 200
+
 
 class Base(DeclarativeBase):
     pass
@@ -27,6 +35,7 @@ class Procurement(Base):
     rhr_id = Column(Text)  # Internal RHR integer ID for API enrichment
     title = Column(Text, nullable=False)
     description = Column(Text)
+    description_snippet = Column(Text)  # set at ingest for the compact list view
     contracting_auth = Column(Text, nullable=False)
     contracting_auth_reg = Column(Text)
     contract_type = Column(Text)  # ehitustööd / teenused / tarned
@@ -47,15 +56,48 @@ class Procurement(Base):
     contact_email = Column(Text)
     contact_phone = Column(Text)
     performance_address = Column(Text)
+    rhr_version_id = Column(Text)  # RHR latest-version id the enrichment came from
     enriched_at = Column(DateTime(timezone=True))
+    content_hash = Column(Text)  # sha256 of the scraped fields; unchanged rows aren't rewritten
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
+    # Shaped after the API and scraper queries; the EXPLAIN suite in
+    # tests/test_query_plans.py checks none of them falls back to a seq scan
     __table_args__ = (
-        Index("idx_procurements_cpv", "cpv_primary"),
-        Index("idx_procurements_status", "status"),
-        Index("idx_procurements_deadline", "submission_deadline"),
+        # GET /procurements filter + order, also serves keyset pagination
+        Index(
+            "idx_procurements_status_published",
+            "status",
+            publication_date.desc().nulls_last(),
+            id.desc(),
+        ),
+        Index(
+            "idx_procurements_active_region",
+            "nuts_code",
+            publication_date.desc().nulls_last(),
+            id.desc(),
+            postgresql_where=text("status = 'active'"),
+        ),
+        # Expiry sweep and enrichment pick (soonest deadline first)
+        Index(
+            "idx_procurements_active_deadline",
+            "submission_deadline",
+            postgresql_where=text("status = 'active'"),
+        ),
+        # LIKE 'prefix%' can't use a plain btree under a non-C collation
+        Index(
+            "idx_procurements_cpv_pattern",
+            "cpv_primary",
+            postgresql_ops={"cpv_primary": "text_pattern_ops"},
+        ),
         Index("idx_procurements_trade", "trade_tags", postgresql_using="gin"),
+        # Stays empty; lets the snippet backfill in db/schema.py skip at once
+        Index(
+            "idx_procurements_snippet_backfill",
+            "id",
+            postgresql_where=text("description_snippet IS NULL AND description IS NOT NULL"),
+        ),
     )
 
 
@@ -63,7 +105,8 @@ class ScrapeRun(Base):
     __tablename__ = "scrape_runs"
 
     id = Column(Integer, primary_key=True)
-    run_type = Column(Text, nullable=False)  # bulk_xml / notice_html / status_update
+    # bulk_xml / notice_html / rhr_refresh / retag / status_update
+    run_type = Column(Text, nullable=False)
     year_month = Column(Text)
     notices_found = Column(Integer, default=0)
     notices_stored = Column(Integer, default=0)
@@ -72,9 +115,46 @@ class ScrapeRun(Base):
     duration_ms = Column(Integer)
     status = Column(Text, default="running")  # running / completed / failed
     error_message = Column(Text)
+    cache_status = Column(Text)  # hit / miss for bulk_xml runs; NULL when the cache is off
+    # False when the run wrote nothing; such runs don't move the API's data generation
+    data_changed = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
 
+class DataGeneration(Base):
+    """Single-row counter of finished runs that changed data (the API's data generation).
+
+    Bumped by a trigger on scrape_runs (see db/schema.py), in the transaction
+    that finishes the run.
+    """
+
+    __tablename__ = "data_generation"
+
+    id = Column(Integer, primary_key=True)  # always 1
+    generation = Column(BigInteger, nullable=False)
+    changed_at = Column(DateTime(timezone=True))
+
+
+class ProcurementSummary(Base):
+    """Procurement counts per (status, trade, region, contract type).
+
+    Rebuilt in one scan after every run that changes those columns. Rows with
+    is_total count procurements (trade is NULL); the others count
+    (procurement, trade) pairs, so a two-trade procurement appears in both.
+    """
+
+    __tablename__ = "procurement_summary"
+
+    id = Column(Integer, primary_key=True)
+    status = Column(Text)
+    trade = Column(Text)
+    nuts_code = Column(Text)
+    nuts_name = Column(Text)
+    contract_type = Column(Text)
+    is_total = Column(Boolean, nullable=False)
+    count = Column(Integer, nullable=False)
+
+
 class TradeCpvMapping(Base):
     __tablename__ = "trade_cpv_mappings"
 
@@ -83,3 +163,45 @@ class TradeCpvMapping(Base):
     trade_key = Column(Text, nullable=False)
     trade_name_et = Column(Text, nullable=False)
     trade_name_en = Column(Text, nullable=False)
+
+    # Lets concurrent seeders insert with ON CONFLICT DO NOTHING
+    __table_args__ = (
+        Index("uq_trade_cpv_mappings_prefix_key", "cpv_prefix", "trade_key", unique=True),
+    )
+
+
+class EnrichmentJob(Base):
+    """One procurement waiting for (or done with) RHR enrichment by a worker."""
+
+    __tablename__ = "enrichment_jobs"
+
+    id = Column(Integer, primary_key=True)
+    procurement_id = Column(
+        Integer, ForeignKey("procurements.id", ondelete="CASCADE"), nullable=False, unique=True
+    )
+    status = Column(Text, nullable=False, default="pending")  # pending / running / done / dead
+    attempts = Column(Integer, nullable=False, default=0)
+    run_after = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    leased_until = Column(DateTime(timezone=True))  # running jobs past this are reclaimed
+    worker_id = Column(Text)
+    last_error = Column(Text)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        Index(
+            "idx_enrichment_jobs_claimable",
+            "run_after",
+            postgresql_where=text("status IN ('pending', 'running')"),
+        ),
+    )
+
+
+class RateBudget(Base):
+    """Token bucket state shared by every process that calls an external API."""
+
+    __tablename__ = "rate_budgets"
+
+    name = Column(Text, primary_key=True)
+    tokens = Column(Float, nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
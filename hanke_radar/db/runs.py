@@ -0,0 +1,33 @@
+"""Bookkeeping for `scrape_runs` rows shared by the scrape and enrich jobs."""
+
+import time
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from hanke_radar.db.models import ScrapeRun
+
+
+async def fail_run(
+    session: AsyncSession,
+    run: ScrapeRun,
+    error: Exception,
+    start_time: float,
+    data_changed: bool,
+) -> None:
+    """Roll back the open transaction and record `run` as failed with `error`.
+
+    `data_changed` says whether anything the run committed before it failed
+    changed data; if so, the failed run moves the data generation like a
+    completed one. If the run can't be recorded either, that is attached to
+    `error` as a note, so the caller can still re-raise the original.
+    """
+    run_id = run.id
+    try:
+        await session.rollback()
+        run.status = "failed"
+        run.error_message = str(error)[:500]
+        run.duration_ms = int((time.monotonic() - start_time) * 1000)
+        run.data_changed = data_changed
+        await session.commit()
+    except Exception as mark_error:
+        error.add_note(f"Could not mark scrape run {run_id} failed: {mark_error!r}")
@@ -0,0 +1,135 @@
+"""Idempotent schema setup for columns and tables added after the initial deploy.
+
+There are no migrations: `ensure_schema` creates any missing tables and applies
+`SCHEMA_UPGRADES` (each statement safe to re-run) once per process. Processes
+starting together (API replicas, workers, cron jobs) take turns behind a
+Postgres advisory lock. Indexes in `INDEX_UPGRADES` are built CONCURRENTLY,
+outside any transaction, so writers are never blocked while they build.
+"""
+
+from collections.abc import Container
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from hanke_radar.db.models import SNIPPET_LENGTH, Base
+
+# Arbitrary app-wide key for pg_advisory_lock ("hanke" in ASCII)
+SCHEMA_LOCK_KEY = 0x68616E6B65
+
+# Rows ingested before description_snippet existed
+SNIPPET_MISSING = "description_snippet IS NULL AND description IS NOT NULL"
+
+SCHEMA_UPGRADES: list[str] = [
+    "ALTER TABLE scrape_runs ADD COLUMN IF NOT EXISTS cache_status TEXT",
+    "ALTER TABLE scrape_runs ADD COLUMN IF NOT EXISTS data_changed BOOLEAN",
+    "ALTER TABLE procurements ADD COLUMN IF NOT EXISTS content_hash TEXT",
+    "ALTER TABLE procurements ADD COLUMN IF NOT EXISTS rhr_version_id TEXT",
+    "ALTER TABLE procurements ADD COLUMN IF NOT EXISTS description_snippet TEXT",
+    # Backfill for rows ingested before the column; same rules as the scraper.
+    # The scraper always sets the snippet, so once this has run the EXISTS is a
+    # probe of the (empty) idx_procurements_snippet_backfill and the UPDATE is
+    # skipped without scanning procurements.
+    "UPDATE procurements AS p SET description_snippet = CASE "
+    f"WHEN length(c.d) > {SNIPPET_LENGTH} THEN rtrim(left(c.d, {SNIPPET_LENGTH})) || '…' "
+    "ELSE c.d END "
+    f"FROM (SELECT id, btrim(regexp_replace(description, '\\s+', ' ', 'g')) AS d "
+    f"FROM procurements WHERE {SNIPPET_MISSING}) AS c "
+    f"WHERE p.id = c.id AND EXISTS (SELECT 1 FROM procurements WHERE {SNIPPET_MISSING})",
+    # Concurrent seeding used to duplicate the seed mappings; the copies would
+    # block uq_trade_cpv_mappings_prefix_key (the table is tiny)
+    "DELETE FROM trade_cpv_mappings AS m USING trade_cpv_mappings AS k "
+    "WHERE m.cpv_prefix = k.cpv_prefix AND m.trade_key = k.trade_key AND m.id > k.id",
+    # The data generation counter starts where counting the runs left off, so
+    # it never goes back to a value an old ETag carries. Only the first start
+    # scans scrape_runs.
+    "INSERT INTO data_generation (id, generation, changed_at) SELECT 1, r.n, r.at FROM ("
+    "SELECT count(*) AS n, "
+    "max(created_at + coalesce(duration_ms, 0) * interval '1 millisecond') AS at "
+    "FROM scrape_runs WHERE status = 'completed' AND data_changed IS NOT FALSE) AS r "
+    "WHERE NOT EXISTS (SELECT 1 FROM data_generation) ON CONFLICT (id) DO NOTHING",
+    # A run that finishes (completed, or failed after committing rows) having
+    # changed data bumps it. Row-locking the counter orders concurrent bumps by
+    # commit, so the value a poller reads never goes back.
+    "CREATE OR REPLACE FUNCTION bump_data_generation() RETURNS trigger AS $$ BEGIN "
+    "IF NEW.status <> 'running' AND NEW.data_changed IS NOT FALSE "
+    "AND (TG_OP = 'INSERT' OR OLD.status = 'running') THEN "
+    "UPDATE data_generation SET generation = generation + 1, changed_at = clock_timestamp(); "
+    "END IF; RETURN NULL; END $$ LANGUAGE plpgsql",
+    "CREATE OR REPLACE TRIGGER scrape_runs_data_generation "
+    "AFTER INSERT OR UPDATE OF status ON scrape_runs "
+    "FOR EACH ROW EXECUTE FUNCTION bump_data_generation()",
+]
+
+# (index name, definition); a None definition drops the index
+INDEX_UPGRADES: list[tuple[str, str | None]] = [
+    ("idx_procurements_status_published",
+     "ON procurements (status, publication_date DESC NULLS LAST, id DESC)"),
+    ("idx_procurements_active_region",
+     "ON procurements (nuts_code, publication_date DESC NULLS LAST, id DESC) "
+     "WHERE status = 'active'"),
+    ("idx_procurements_active_deadline",
+     "ON procurements (submission_deadline) WHERE status = 'active'"),
+    ("idx_procurements_cpv_pattern", "ON procurements (cpv_primary text_pattern_ops)"),
+    ("idx_procurements_snippet_backfill", f"ON procurements (id) WHERE {SNIPPET_MISSING}"),
+    ("uq_trade_cpv_mappings_prefix_key", "ON trade_cpv_mappings (cpv_prefix, trade_key)"),
+    # Superseded by the indexes above
+    ("idx_procurements_status", None),
+    ("idx_procurements_deadline", None),
+    ("idx_procurements_cpv", None),
+]
+
+UNIQUE_INDEXES = frozenset({"uq_trade_cpv_mappings_prefix_key"})
+
+# A CONCURRENTLY build that fails (or is killed) leaves an INVALID index that
+# IF NOT EXISTS would then skip; those are dropped and built again.
+_INVALID_INDEXES = text("""
+    SELECT c.relname FROM pg_index AS i JOIN pg_class AS c ON c.oid = i.indexrelid
+    WHERE NOT i.indisvalid AND pg_table_is_visible(c.oid) AND c.relname IN :names
+""").bindparams(bindparam("names", expanding=True))
+
+_applied = False
+
+
+def index_statements(invalid: Container[str] = ()) -> list[str]:
+    """CONCURRENTLY DDL for `INDEX_UPGRADES`, rebuilding any `invalid` ones."""
+    statements = []
+    for name, definition in INDEX_UPGRADES:
+        if definition is None or name in invalid:
+            statements.append(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+        if definition is not None:
+            kind = "UNIQUE INDEX" if name in UNIQUE_INDEXES else "INDEX"
+            statements.append(f"CREATE {kind} CONCURRENTLY IF NOT EXISTS {name} {definition}")
+    return statements
+
+
+async def apply_schema(session: AsyncSession) -> None:
+    """Create missing tables, apply SCHEMA_UPGRADES, then build INDEX_UPGRADES."""
+    params = {"key": SCHEMA_LOCK_KEY}
+    conn = await session.connection()
+    await conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), params)
+    await conn.run_sync(Base.metadata.create_all)
+    for statement in SCHEMA_UPGRADES:
+        await conn.execute(text(statement))
+    await session.commit()
+
+    # CREATE INDEX CONCURRENTLY refuses to run inside a transaction block
+    conn = await session.connection(execution_options={"isolation_level": "AUTOCOMMIT"})
+    await conn.execute(text("SELECT pg_advisory_lock(:key)"), params)
+    try:
+        names = [name for name, _ in INDEX_UPGRADES]
+        invalid = set((await conn.execute(_INVALID_INDEXES, {"names": names})).scalars())
+        for statement in index_statements(invalid):
+            await conn.execute(text(statement))
+    finally:
+        await conn.execute(text("SELECT pg_advisory_unlock(:key)"), params)
+        await session.commit()
+
+
+async def ensure_schema(session: AsyncSession) -> None:
+    """`apply_schema` on first use in this process; later calls return at once."""
+    global _applied
+    if _applied:
+        return
+    await apply_schema(session)
+    _applied = True
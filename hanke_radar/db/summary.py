@@ -0,0 +1,105 @@
+"""Precomputed procurement counts behind the stats endpoints and `hanke status`.
+
+`refresh_summary` rebuilds `procurement_summary` from a single scan of
+`procurements` using GROUPING SETS: one set counts (procurement, trade) pairs,
+the other counts procurements. Readers load the few hundred summary rows and
+aggregate them in Python, so their cost doesn't grow with the table. Until
+the first refresh the same query runs live instead.
+"""
+
+from dataclasses import dataclass
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from hanke_radar.db.models import ProcurementSummary
+
+_COLUMNS = "status, trade, nuts_code, nuts_name, contract_type, is_total, count"
+
+# Untagged procurements produce a NULL trade in the per-trade set; HAVING drops
+# those and keeps them only in the per-procurement totals.
+_SUMMARY_SELECT = """
+    SELECT p.status, t.trade, p.nuts_code, p.nuts_name, p.contract_type,
+           GROUPING(t.trade) = 1 AS is_total,
+           count(DISTINCT p.id) AS count
+    FROM procurements AS p
+    LEFT JOIN LATERAL unnest(p.trade_tags) AS t(trade) ON true
+    GROUP BY GROUPING SETS (
+        (p.status, t.trade, p.nuts_code, p.nuts_name, p.contract_type),
+        (p.status, p.nuts_code, p.nuts_name, p.contract_type)
+    )
+    HAVING GROUPING(t.trade) = 1 OR t.trade IS NOT NULL
+"""
+
+# EXCLUSIVE blocks a concurrent refresh (no duplicate rows) but not readers,
+# who keep seeing the old rows until this transaction commits.
+_REFRESH = [
+    "LOCK TABLE procurement_summary IN EXCLUSIVE MODE",
+    "DELETE FROM procurement_summary",
+    f"INSERT INTO procurement_summary ({_COLUMNS}) {_SUMMARY_SELECT}",
+]
+
+
+@dataclass(frozen=True)
+class SummaryRow:
+    status: str | None
+    trade: str | None
+    nuts_code: str | None
+    nuts_name: str | None
+    contract_type: str | None
+    is_total: bool
+    count: int
+
+
+def _ranked(counts: dict) -> list[tuple]:
+    """(key..., count) tuples, largest count first."""
+    items = sorted(counts.items(), key=lambda kv: (-kv[1], tuple(str(k) for k in kv[0])))
+    return [(*key, count) for key, count in items]
+
+
+@dataclass
+class ProcurementStats:
+    rows: list[SummaryRow]
+
+    def total(self) -> int:
+        return sum(r.count for r in self.rows if r.is_total)
+
+    def by_status(self) -> list[tuple[str, int]]:
+        counts: dict = {}
+        for r in self.rows:
+            if r.is_total:
+                counts[(r.status,)] = counts.get((r.status,), 0) + r.count
+        return _ranked(counts)
+
+    def by_trade(self, status: str | None = None) -> list[tuple[str, int]]:
+        """Procurements per trade, optionally for one status only."""
+        counts: dict = {}
+        for r in self.rows:
+            if not r.is_total and (status is None or r.status == status):
+                counts[(r.trade,)] = counts.get((r.trade,), 0) + r.count
+        return _ranked(counts)
+
+    def by_region(self, status: str | None = None) -> list[tuple[str, str, int]]:
+        counts: dict = {}
+        for r in self.rows:
+            if r.is_total and (status is None or r.status == status):
+                key = (r.nuts_code, r.nuts_name)
+                counts[key] = counts.get(key, 0) + r.count
+        return _ranked(counts)
+
+
+async def refresh_summary(session: AsyncSession) -> None:
+    """Rebuild procurement_summary; takes effect when the caller commits."""
+    for statement in _REFRESH:
+        await session.execute(text(statement))
+
+
+async def load_stats(session: AsyncSession) -> ProcurementStats:
+    """Counts from procurement_summary, or computed live if it was never filled."""
+    result = await session.execute(select(*(
+        getattr(ProcurementSummary, c) for c in _COLUMNS.split(", ")
+    )))
+    rows = result.all()
+    if not rows:
+        rows = (await session.execute(text(_SUMMARY_SELECT))).all()
+    return ProcurementStats([SummaryRow(*row) for row in rows])
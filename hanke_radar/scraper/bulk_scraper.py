@@ -1,19 +1,40 @@
 """Bulk XML scraper for riigihanked.riik.ee monthly dumps."""
 
+import asyncio
+import hashlib
+import json
+import multiprocessing
+import os
+import tempfile
 import time
-from datetime import UTC, datetime
+from collections.abc import AsyncIterator, Awaitable, Callable, Container
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import nullcontext
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
 
 import httpx
-from sqlalchemy import select, text
+from sqlalchemy import literal_column, select, text
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from hanke_radar.config import settings
 from hanke_radar.db.engine import async_session
-from hanke_radar.db.models import Procurement, ScrapeRun, TradeCpvMapping
-from hanke_radar.db.seed import TRADE_CPV_SEEDS
-from hanke_radar.scraper.cpv_filter import get_trade_tags, is_trade_relevant
-from hanke_radar.scraper.xml_parser import ParsedProcurement, is_active_tender, parse_bulk_xml
+from hanke_radar.db.models import SNIPPET_LENGTH, Procurement, ScrapeRun
+from hanke_radar.db.runs import fail_run
+from hanke_radar.db.schema import ensure_schema
+from hanke_radar.db.summary import refresh_summary
+from hanke_radar.scraper.cpv_filter import CpvTagger, get_trade_tags
+from hanke_radar.scraper.dump_cache import CacheEntry, DumpCache, conditional_headers
+from hanke_radar.scraper.trade_mappings import load_tagger, seed_trade_mappings
+from hanke_radar.scraper.xml_parser import (
+    STREAM_CHUNK_SIZE,
+    NoticeFeedParser,
+    ParsedProcurement,
+    ParseStats,
+    from_record,
+    parse_dump_file,
+)
 
 # NUTS code to human-readable Estonian region names
 NUTS_NAMES = {
@@ -54,27 +75,31 @@ def _derive_contract_type(cpv_primary: str) -> str:
         return "tarned"  # Supplies
 
 
-async def _ensure_trade_mappings(session: AsyncSession) -> None:
-    """Sync trade_cpv_mappings table with seed data (adds new prefixes on each run)."""
-    existing = await session.execute(select(TradeCpvMapping.cpv_prefix))
-    existing_prefixes = {row[0] for row in existing.all()}
+def _description_snippet(description: str | None) -> str | None:
+    """Whitespace-collapsed description, cut to SNIPPET_LENGTH characters."""
+    if description is None:
+        return None
+    collapsed = " ".join(description.split())
+    if len(collapsed) <= SNIPPET_LENGTH:
+        return collapsed
+    return collapsed[:SNIPPET_LENGTH].rstrip() + "…"
 
-    added = 0
-    for seed in TRADE_CPV_SEEDS:
-        if seed["cpv_prefix"] not in existing_prefixes:
-            session.add(TradeCpvMapping(**seed))
-            added += 1
 
-    if added:
-        await session.commit()
+def _content_hash(db_dict: dict) -> str:
+    """Stable fingerprint of a notice's DB fields, used to skip no-op updates."""
+    payload = json.dumps(db_dict, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
 
+def _to_db_dict(p: ParsedProcurement, tagger: CpvTagger | None = None) -> dict:
+    """Convert a ParsedProcurement to a dict for DB insertion.
 
-def _to_db_dict(p: ParsedProcurement) -> dict:
-    """Convert a ParsedProcurement to a dict for DB insertion."""
+    Trade tags come from `tagger` (the DB mappings), or the seed mappings.
+    """
     all_cpvs = [p.cpv_primary] + p.cpv_additional if p.cpv_primary else p.cpv_additional
-    trade_tags = get_trade_tags(all_cpvs)
+    trade_tags = tagger.tags(all_cpvs) if tagger is not None else get_trade_tags(all_cpvs)
 
-    return {
+    db_dict = {
         "notice_id": p.notice_id,
         "procurement_id": p.procurement_id,
         "rhr_id": p.rhr_id,
@@ -96,12 +121,410 @@ def _to_db_dict(p: ParsedProcurement) -> dict:
         "source_url": p.source_url,
         "trade_tags": trade_tags,
     }
+    db_dict["content_hash"] = _content_hash(db_dict)
+    # Derived from description, so it stays out of the hash
+    db_dict["description_snippet"] = _description_snippet(p.description)
+    return db_dict
+
+
+@dataclass
+class WriteStats:
+    """Outcome counts from the DB writer stage."""
+
+    relevant: int = 0  # notices received from the parser
+    new: int = 0  # inserted
+    changed: int = 0  # existing row whose content_hash differed, updated
+    unchanged: int = 0  # existing row with the same content_hash, left alone
+    errors: int = 0
+
+    @property
+    def stored(self) -> int:
+        return self.new + self.changed
+
+
+@dataclass
+class StageTimings:
+    """Busy time per ingest stage, in seconds.
+
+    Stages overlap, so their sum exceeds the wall-clock duration by however
+    much the pipeline saved.
+    """
+
+    download: float = 0.0  # waiting on the network
+    parse: float = 0.0  # lxml feed + notice extraction
+    store: float = 0.0  # DB upserts
+
+    def as_ms(self) -> dict:
+        return {
+            "download_ms": int(self.download * 1000),
+            "parse_ms": int(self.parse * 1000),
+            "store_ms": int(self.store * 1000),
+        }
+
+
+async def _iter_response_chunks(
+    response: httpx.Response, timings: StageTimings
+) -> AsyncIterator[bytes]:
+    """Yield response body chunks, charging the wait to the download stage."""
+    chunks = response.aiter_bytes()
+    while True:
+        started = time.perf_counter()
+        try:
+            chunk = await anext(chunks)
+        except StopAsyncIteration:
+            return
+        finally:
+            timings.download += time.perf_counter() - started
+        yield chunk
+
+
+@dataclass
+class DumpFetch:
+    """Outcome of downloading (or revalidating) one month's dump."""
+
+    cache_status: str | None = None  # hit / miss; None when the dump cache is off
+    size: int = 0
+    path: str | None = None  # on-disk copy of the body, if one was written
+    streamed: bool = False  # body was passed to on_chunk while downloading
+    # Validators of a new dump, still at the partial path; saved to the cache
+    # only once its notices are committed (promote_dump), so a failed ingest
+    # is retried instead of turning into a cache hit
+    pending: CacheEntry | None = None
+
+
+async def _fetch_dump(
+    client: httpx.AsyncClient,
+    url: str,
+    timings: StageTimings,
+    cache: DumpCache | None = None,
+    year_month: str = "",
+    dest: str | None = None,
+    on_chunk: Callable[[bytes], Awaitable[None]] | None = None,
+    full: bool = False,
+) -> DumpFetch:
+    """Download a month's dump, revalidating against the dump cache.
+
+    The body is written to the cache's partial path (or to `dest` when the
+    cache is off); a changed dump is left there, with its validators in
+    `pending`, until the caller has stored it. With `full` the cached copy is
+    ignored: no conditional request and no hash-equality hit, so the dump is
+    always parsed.
+
+    `on_chunk` receives body chunks as they arrive whenever the response
+    already shows the dump changed: no cached copy, or a 200 whose ETag /
+    Last-Modified differ from the cached ones. Only a server that sends no
+    new validators needs the whole body hashed before anything is parsed.
+    """
+    entry = cache.load(year_month) if cache is not None and not full else None
+    async with client.stream("GET", url, headers=conditional_headers(entry)) as response:
+        if entry is not None and response.status_code == 304:
+            return DumpFetch("hit", entry.size, str(cache.xml_path(year_month)))
+        response.raise_for_status()
+
+        if cache is not None:
+            cache.directory.mkdir(parents=True, exist_ok=True)
+            out_path = str(cache.partial_path(year_month))
+        else:
+            out_path = dest
+        validators = (response.headers.get("ETag", ""), response.headers.get("Last-Modified", ""))
+        changed = entry is None or (
+            any(validators) and validators != (entry.etag, entry.last_modified)
+        )
+        stream_to = on_chunk if changed else None
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            with open(out_path, "wb") if out_path else nullcontext() as f:
+                async for chunk in _iter_response_chunks(response, timings):
+                    size += len(chunk)
+                    digest.update(chunk)
+                    if f is not None:
+                        f.write(chunk)
+                    if stream_to is not None:
+                        await stream_to(chunk)
+        except BaseException:
+            if cache is not None:
+                cache.discard(year_month)
+            raise
+
+    if cache is None:
+        return DumpFetch(None, size, dest, streamed=stream_to is not None)
+
+    fresh = CacheEntry(
+        etag=validators[0], last_modified=validators[1], sha256=digest.hexdigest(), size=size
+    )
+    xml_path = str(cache.xml_path(year_month))
+    if not changed and entry.sha256 == fresh.sha256:
+        # Server doesn't revalidate, but the content is identical
+        cache.discard(year_month)
+        cache.save(year_month, fresh)
+        return DumpFetch("hit", size, xml_path)
+    return DumpFetch(
+        "miss", size, str(cache.partial_path(year_month)),
+        streamed=stream_to is not None, pending=fresh,
+    )
+
+
+def promote_dump(cache: DumpCache | None, year_month: str, fetch: DumpFetch | None) -> None:
+    """Make a stored dump the cached copy; call after its notices are committed."""
+    if cache is not None and fetch is not None and fetch.pending is not None:
+        cache.commit(year_month, fetch.pending)
+
+
+async def _produce_streamed(
+    client: httpx.AsyncClient,
+    url: str,
+    queue: asyncio.Queue,
+    stats: ParseStats,
+    timings: StageTimings,
+    cache: DumpCache | None = None,
+    year_month: str = "",
+    known_ids: Container[str] = frozenset(),
+    full: bool = False,
+) -> DumpFetch:
+    """Download the dump and feed it straight into the XML parser.
+
+    Finished notices go onto `queue` as soon as their closing tag arrives, so
+    the writer starts upserting while the download is still in flight. Only
+    when the server sends no new validators against a cached copy is the body
+    hashed first and parsed back from disk once it is known to differ; on a
+    cache hit nothing is parsed.
+    """
+    parser = NoticeFeedParser(prefilter=True, stats=stats, known_ids=known_ids)
+
+    async def _feed(chunk: bytes) -> None:
+        started = time.perf_counter()
+        notices = parser.feed(chunk)
+        timings.parse += time.perf_counter() - started
+        for notice in notices:
+            await queue.put(notice)
+
+    fetch = await _fetch_dump(
+        client, url, timings, cache, year_month, on_chunk=_feed, full=full
+    )
+    if fetch.cache_status == "hit":
+        return fetch
+    if not fetch.streamed:
+        with open(fetch.path, "rb") as f:
+            while chunk := f.read(STREAM_CHUNK_SIZE):
+                await _feed(chunk)
+
+    started = time.perf_counter()
+    notices = parser.close()
+    timings.parse += time.perf_counter() - started
+    for notice in notices:
+        await queue.put(notice)
+    return fetch
+
+
+async def _produce_from_executor(
+    client: httpx.AsyncClient,
+    url: str,
+    queue: asyncio.Queue,
+    executor: Executor,
+    timings: StageTimings,
+    cache: DumpCache | None = None,
+    year_month: str = "",
+    known_ids: Container[str] = frozenset(),
+    full: bool = False,
+) -> tuple[ParseStats, DumpFetch]:
+    """Download the dump to disk and parse it in `executor`.
+
+    The cached copy is parsed in place; without a cache a temp file is used.
+    """
+    tmp_path = None
+    if cache is None:
+        fd, tmp_path = tempfile.mkstemp(prefix="hanke-", suffix=".xml")
+        os.close(fd)
+    try:
+        fetch = await _fetch_dump(
+            client, url, timings, cache, year_month, dest=tmp_path, full=full
+        )
+        if fetch.cache_status == "hit":
+            return ParseStats(), fetch
+        started = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        stats, records = await loop.run_in_executor(
+            executor, parse_dump_file, fetch.path, True, known_ids
+        )
+        timings.parse += time.perf_counter() - started
+    finally:
+        if tmp_path is not None:
+            os.unlink(tmp_path)
+
+    for record in records:
+        await queue.put(from_record(record))
+    return stats, fetch
+
+
+# Columns rewritten when a notice's content_hash changes: every hashed column
+# (bar the notice_id conflict key), so a new hash never sits on stale values
+_UPSERT_UPDATE_COLUMNS = (
+    "procurement_id",
+    "rhr_id",
+    "title",
+    "description",
+    "description_snippet",
+    "contracting_auth",
+    "contracting_auth_reg",
+    "contract_type",
+    "procedure_type",
+    "cpv_primary",
+    "cpv_additional",
+    "estimated_value",
+    "nuts_code",
+    "nuts_name",
+    "submission_deadline",
+    "publication_date",
+    "duration_months",
+    "status",
+    "source_url",
+    "trade_tags",
+    "content_hash",
+)
+
+# asyncpg caps a statement at 32767 bind parameters
+_MAX_BIND_PARAMS = 32767
+
+
+def _max_batch_rows(columns: int) -> int:
+    return max(1, _MAX_BIND_PARAMS // columns)
+
+
+async def _upsert_batch(
+    session: AsyncSession,
+    notices: list[ParsedProcurement],
+    tagger: CpvTagger | None = None,
+) -> WriteStats:
+    """Upsert notices in one multi-row INSERT ... ON CONFLICT statement.
+
+    Existing rows are only touched (and `updated_at` bumped) when their
+    content_hash differs. Duplicate notice_ids are collapsed to the last
+    occurrence, since Postgres refuses to update a row twice in one statement.
+    """
+    rows = list({n.notice_id: _to_db_dict(n, tagger) for n in notices}.values())
+    stmt = pg_insert(Procurement).values(rows)
+    set_ = {col: stmt.excluded[col] for col in _UPSERT_UPDATE_COLUMNS}
+    set_["updated_at"] = datetime.now(UTC)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["notice_id"],
+        set_=set_,
+        where=Procurement.content_hash.is_distinct_from(stmt.excluded.content_hash),
+    ).returning(literal_column("xmax = 0"))  # true for freshly inserted rows
+
+    # Rows skipped by the WHERE clause return nothing
+    inserted = (await session.execute(stmt)).scalars().all()
+    new = sum(1 for i in inserted if i)
+    return WriteStats(
+        new=new, changed=len(inserted) - new, unchanged=len(rows) - len(inserted)
+    )
+
+
+async def _flush_batch(
+    session: AsyncSession,
+    batch: list[ParsedProcurement],
+    stats: WriteStats,
+    verbose: bool,
+    tagger: CpvTagger | None = None,
+) -> None:
+    """Write a batch inside a savepoint; on failure retry row by row.
+
+    A bad row only rolls back its own savepoint, so it is counted as an error
+    without losing the rest of the batch.
+    """
+    try:
+        async with session.begin_nested():
+            results = [await _upsert_batch(session, batch, tagger)]
+    except Exception:
+        results = []
+        for notice in batch:
+            try:
+                async with session.begin_nested():
+                    results.append(await _upsert_batch(session, [notice], tagger))
+            except Exception as e:
+                stats.errors += 1
+                if verbose:
+                    print(f"  Error storing {notice.notice_id}: {e}")
+
+    for result in results:
+        stats.new += result.new
+        stats.changed += result.changed
+        stats.unchanged += result.unchanged
+
+
+async def _write_notices(
+    session: AsyncSession,
+    queue: asyncio.Queue,
+    timings: StageTimings,
+    verbose: bool = True,
+    batch_size: int | None = None,
+    tagger: CpvTagger | None = None,
+) -> WriteStats:
+    """DB writer stage: upsert notices from `queue` until the None sentinel.
+
+    Notices are buffered and written `batch_size` at a time (default
+    `settings.upsert_batch_size`, clamped to the bind-parameter limit).
+    """
+    batch_size = min(
+        batch_size or settings.upsert_batch_size,
+        _max_batch_rows(len(Procurement.__table__.columns)),
+    )
+    stats = WriteStats()
+    batch: list[ParsedProcurement] = []
+
+    async def _flush() -> None:
+        started = time.perf_counter()
+        await _flush_batch(session, batch, stats, verbose, tagger)
+        timings.store += time.perf_counter() - started
+        batch.clear()
+
+    while (notice := await queue.get()) is not None:
+        stats.relevant += 1
+        batch.append(notice)
+        if len(batch) >= batch_size:
+            await _flush()
+    if batch:
+        await _flush()
+    return stats
+
+
+async def _load_known_notice_ids(session: AsyncSession, year: int, month: int) -> frozenset[str]:
+    """notice_ids already stored for notices published in the given month.
+
+    The window is padded by a day on each side so timezone offsets in the
+    publication dates can't push a notice out of its month.
+    """
+    start = datetime(year, month, 1, tzinfo=UTC)
+    end = datetime(year + month // 12, month % 12 + 1, 1, tzinfo=UTC)
+    result = await session.execute(
+        select(Procurement.notice_id).where(
+            Procurement.publication_date >= start - timedelta(days=1),
+            Procurement.publication_date < end + timedelta(days=1),
+        )
+    )
+    return frozenset(result.scalars().all())
 
 
-async def scrape_month(year: int, month: int, verbose: bool = True) -> dict:
+async def scrape_month(
+    year: int,
+    month: int,
+    verbose: bool = True,
+    executor: Executor | None = None,
+    full: bool = False,
+) -> dict:
     """Scrape a single month's bulk XML from riigihanked and store trade-relevant notices.
 
-    Returns a summary dict with counts.
+    Runs as a pipeline: a producer streams the dump through the XML parser
+    (which prefilters to active, trade-relevant notices) and hands finished
+    notices to a DB writer over a bounded queue, so download, parsing and
+    upserts overlap. With an `executor` (a ProcessPoolExecutor for backfills)
+    the dump is downloaded to a temp file and parsed in a worker instead.
+
+    Unless `full` is set, notices already stored for the month are recognised
+    by notice_id and skipped before parsing; a full run bypasses the dump
+    cache and re-parses and reconciles everything.
+
+    Returns a summary dict with counts and per-stage timings.
     """
     if async_session is None:
         raise RuntimeError("DATABASE_URL not configured")
@@ -112,114 +535,171 @@ async def scrape_month(year: int, month: int, verbose: bool = True) -> dict:
     start_time = time.monotonic()
 
     async with async_session() as session:
+        await ensure_schema(session)
+
         # Record the scrape run
         run = ScrapeRun(run_type="bulk_xml", year_month=year_month)
         session.add(run)
         await session.commit()
 
-        await _ensure_trade_mappings(session)
+        await seed_trade_mappings(session)
+        tagger = await load_tagger(session)
+        cache = DumpCache(settings.dump_cache_dir) if settings.dump_cache_dir else None
 
         try:
-            # Download the bulk XML
             if verbose:
                 print(f"Downloading {url}...")
-            async with httpx.AsyncClient(timeout=settings.request_timeout_seconds) as client:
-                response = await client.get(url)
-                response.raise_for_status()
-
-            xml_bytes = response.content
-            if verbose:
-                print(f"Downloaded {len(xml_bytes) / 1024 / 1024:.1f} MB")
-
-            # Parse all notices from XML
-            all_notices = parse_bulk_xml(xml_bytes)
-            run.notices_found = len(all_notices)
-            if verbose:
-                print(f"Parsed {len(all_notices)} total notices")
 
-            # Filter: active tenders with trade-relevant CPV codes
-            relevant = []
-            for notice in all_notices:
-                if not is_active_tender(notice):
-                    continue
-                all_cpvs = [notice.cpv_primary] + notice.cpv_additional
-                if any(is_trade_relevant(cpv) for cpv in all_cpvs if cpv):
-                    relevant.append(notice)
+            known_ids = (
+                frozenset() if full else await _load_known_notice_ids(session, year, month)
+            )
+            stats = ParseStats()
+            timings = StageTimings()
+            queue: asyncio.Queue = asyncio.Queue(maxsize=settings.pipeline_queue_size)
+
+            async def _produce(client: httpx.AsyncClient) -> DumpFetch:
+                nonlocal stats
+                # On failure the TaskGroup cancels the writer; whatever it had
+                # upserted is rolled back below
+                if executor is None:
+                    fetch = await _produce_streamed(
+                        client, url, queue, stats, timings, cache, year_month, known_ids, full,
+                    )
+                else:
+                    stats, fetch = await _produce_from_executor(
+                        client, url, queue, executor, timings, cache, year_month,
+                        known_ids, full,
+                    )
+                await queue.put(None)
+                return fetch
+
+            try:
+                async with (
+                    httpx.AsyncClient(timeout=settings.request_timeout_seconds) as client,
+                    asyncio.TaskGroup() as tg,
+                ):
+                    producer = tg.create_task(_produce(client))
+                    writer = tg.create_task(_write_notices(
+                        session, queue, timings, verbose, tagger=tagger
+                    ))
+            except* Exception as eg:
+                # Surface the first real failure rather than the group wrapper
+                raise eg.exceptions[0] from None
+
+            fetch = producer.result()
+            written = writer.result()
 
             if verbose:
-                print(f"Filtered to {len(relevant)} trade-relevant active tenders")
-
-            # Upsert into database
-            stored = 0
-            errors = 0
-            for notice in relevant:
-                try:
-                    db_dict = _to_db_dict(notice)
-                    stmt = (
-                        pg_insert(Procurement)
-                        .values(**db_dict)
-                        .on_conflict_do_update(
-                            index_elements=["notice_id"],
-                            set_={
-                                "rhr_id": db_dict["rhr_id"],
-                                "title": db_dict["title"],
-                                "description": db_dict["description"],
-                                "estimated_value": db_dict["estimated_value"],
-                                "submission_deadline": db_dict["submission_deadline"],
-                                "status": db_dict["status"],
-                                "source_url": db_dict["source_url"],
-                                "trade_tags": db_dict["trade_tags"],
-                                "updated_at": datetime.now(UTC),
-                            },
-                        )
-                    )
-                    await session.execute(stmt)
-                    stored += 1
-                except Exception as e:
-                    errors += 1
-                    if verbose:
-                        print(f"  Error storing {notice.notice_id}: {e}")
+                if fetch.cache_status == "hit":
+                    print("Dump unchanged since last run (cache hit), nothing to ingest")
+                else:
+                    print(f"Downloaded {fetch.size / 1024 / 1024:.1f} MB")
+                    print(f"Found {stats.found} total notices")
+                    print(f"Filtered to {written.relevant} trade-relevant active tenders")
+                    if stats.skipped_known:
+                        print(f"Skipped {stats.skipped_known} already-ingested notices")
 
             await session.commit()
+            if written.new or written.changed:
+                # Commits together with the completed run below
+                await refresh_summary(session)
 
             # Update run record
             duration_ms = int((time.monotonic() - start_time) * 1000)
-            run.notices_stored = stored
-            run.notices_skipped = run.notices_found - len(relevant)
-            run.errors = errors
+            run.notices_found = stats.found
+            run.notices_stored = written.stored
+            run.notices_skipped = stats.skipped
+            run.errors = written.errors
             run.duration_ms = duration_ms
+            run.cache_status = fetch.cache_status
+            run.data_changed = bool(written.new or written.changed)
             run.status = "completed"
             await session.commit()
+            promote_dump(cache, year_month, fetch)
 
             summary = {
                 "year_month": year_month,
                 "total_notices": run.notices_found,
-                "trade_relevant": len(relevant),
-                "stored": stored,
+                "trade_relevant": written.relevant,
+                "stored": written.stored,
+                "new": written.new,
+                "changed": written.changed,
+                "unchanged": written.unchanged,
                 "skipped": run.notices_skipped,
-                "errors": errors,
+                "skipped_inactive": stats.skipped_inactive,
+                "skipped_irrelevant": stats.skipped_irrelevant,
+                "skipped_known": stats.skipped_known,
+                "errors": written.errors,
+                "cache": fetch.cache_status,
                 "duration_ms": duration_ms,
+                **timings.as_ms(),
             }
 
             if verbose:
-                print(f"Done: {stored} stored, {run.notices_skipped} skipped, {errors} errors")
-                print(f"Duration: {duration_ms}ms")
+                print(
+                    f"Done: {written.new} new, {written.changed} changed, "
+                    f"{written.unchanged} unchanged, {run.notices_skipped} skipped, "
+                    f"{written.errors} errors"
+                )
+                print(
+                    f"Duration: {duration_ms}ms (download {summary['download_ms']}ms, "
+                    f"parse {summary['parse_ms']}ms, store {summary['store_ms']}ms)"
+                )
 
             return summary
 
         except Exception as e:
-            run.status = "failed"
-            run.error_message = str(e)[:500]
-            run.duration_ms = int((time.monotonic() - start_time) * 1000)
-            await session.commit()
+            if cache is not None:
+                cache.discard(year_month)  # re-download next run rather than skip it
+            # Drops the partial upserts: they'd skip refresh_summary, and the
+            # next run re-ingests them anyway
+            await fail_run(session, run, e, start_time, data_changed=False)
             raise
 
 
+async def scrape_months_parallel(
+    months: list[tuple[int, int]],
+    workers: int,
+    verbose: bool = True,
+    full: bool = False,
+) -> list[dict | BaseException]:
+    """Scrape several months, parsing their dumps in parallel processes.
+
+    Up to `workers` months are in flight at once: their downloads and upserts
+    interleave on the event loop while the dumps are parsed in a
+    ProcessPoolExecutor. Results (a summary dict, or the exception that month
+    failed with) are returned in the order of `months`.
+    """
+    if async_session is None:
+        raise RuntimeError("DATABASE_URL not configured")
+
+    # Once up front, so the months don't all race to set up an empty database
+    async with async_session() as session:
+        await ensure_schema(session)
+        await seed_trade_mappings(session)
+
+    # spawn, not fork: the parent already has an event loop, sockets and
+    # (via DNS resolution) threads that a forked child must not inherit
+    ctx = multiprocessing.get_context("spawn")
+    semaphore = asyncio.Semaphore(workers)
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as executor:
+
+        async def _one(year: int, month: int) -> dict:
+            async with semaphore:
+                return await scrape_month(year, month, verbose, executor=executor, full=full)
+
+        return await asyncio.gather(
+            *(_one(y, m) for y, m in months), return_exceptions=True
+        )
+
+
 async def update_expired_procurements(verbose: bool = True) -> int:
     """Mark procurements past their submission deadline as expired."""
     if async_session is None:
         raise RuntimeError("DATABASE_URL not configured")
 
+    start_time = time.monotonic()
     async with async_session() as session:
         result = await session.execute(
             text("""
@@ -230,8 +710,18 @@ async def update_expired_procurements(verbose: bool = True) -> int:
                   AND submission_deadline < NOW()
             """)
         )
-        await session.commit()
         count = result.rowcount
+        if count:
+            await refresh_summary(session)
+        # A completed run that changed rows moves the data generation the API caches on
+        session.add(ScrapeRun(
+            run_type="status_update",
+            notices_stored=count,
+            duration_ms=int((time.monotonic() - start_time) * 1000),
+            data_changed=count > 0,
+            status="completed",
+        ))
+        await session.commit()
         if verbose:
             print(f"Marked {count} procurements as expired")
         return count
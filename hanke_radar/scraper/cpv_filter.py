@@ -1,20 +1,78 @@
 """CPV code filtering and trade tagging."""
 
-from hanke_radar.db.seed import TRADE_CPV_SEEDS
-
-# Build a lookup: cpv_prefix -> list of trade_keys
-_PREFIX_TO_TRADES: dict[str, list[str]] = {}
-for mapping in TRADE_CPV_SEEDS:
-    prefix = mapping["cpv_prefix"]
-    trade = mapping["trade_key"]
-    _PREFIX_TO_TRADES.setdefault(prefix, []).append(trade)
+from collections.abc import Iterable
+from functools import lru_cache
 
-# All known prefixes we care about (sorted longest first for greedy matching)
-_SORTED_PREFIXES = sorted(_PREFIX_TO_TRADES.keys(), key=len, reverse=True)
+from hanke_radar.db.seed import TRADE_CPV_SEEDS
 
 # Broad CPV divisions that are always trade-relevant (construction, maintenance, engineering)
 TRADE_RELEVANT_DIVISIONS = {"45", "50", "71"}
 
+# Distinct CPV codes remembered per tagger; a month of notices uses a few thousand
+TAG_CACHE_SIZE = 8192
+
+# Trimmed around CPV codes; passed to btrim() by the SQL retag so both agree
+CPV_WHITESPACE = " \t\n\r\f\v\xa0"
+
+
+@lru_cache(maxsize=TAG_CACHE_SIZE)
+def normalize_cpv(cpv_code: str) -> str:
+    """Bare CPV code: surrounding whitespace and the "-N" check digit removed."""
+    return cpv_code.strip(CPV_WHITESPACE).split("-")[0].strip(CPV_WHITESPACE)
+
+
+class CpvTagger:
+    """Compiled CPV prefix -> trade lookup.
+
+    Prefixes are grouped by length, so tagging a code costs one dict lookup
+    per distinct prefix length (at most the code's length), however many
+    mappings there are. Every matching prefix contributes its trades, not
+    just the longest. Tags per normalized code are memoized in a bounded LRU.
+    """
+
+    def __init__(
+        self,
+        mappings: Iterable[dict],
+        relevant_divisions: Iterable[str] = TRADE_RELEVANT_DIVISIONS,
+        cache_size: int = TAG_CACHE_SIZE,
+    ) -> None:
+        by_length: dict[int, dict[str, set[str]]] = {}
+        for mapping in mappings:
+            prefix = mapping["cpv_prefix"]
+            by_length.setdefault(len(prefix), {}).setdefault(prefix, set()).add(
+                mapping["trade_key"]
+            )
+        self._by_length = [
+            (length, {prefix: frozenset(trades) for prefix, trades in table.items()})
+            for length, table in sorted(by_length.items())
+        ]
+        self.relevant_divisions = frozenset(relevant_divisions)
+        self.code_tags = lru_cache(maxsize=cache_size)(self._code_tags)
+
+    def _code_tags(self, cpv_clean: str) -> frozenset[str]:
+        tags: set[str] = set()
+        for length, table in self._by_length:
+            if length > len(cpv_clean):
+                break
+            trades = table.get(cpv_clean[:length])
+            if trades:
+                tags |= trades
+        # Fallback: if CPV is in a relevant division but has no specific trade mapping
+        if not tags and cpv_clean[:2] in self.relevant_divisions:
+            return frozenset({"general"})
+        return frozenset(tags)
+
+    def tags(self, cpv_codes: Iterable[str]) -> list[str]:
+        """Sorted trade tags for a procurement's CPV codes."""
+        tags: set[str] = set()
+        for cpv in cpv_codes:
+            if cpv:
+                tags |= self.code_tags(normalize_cpv(cpv))
+        return sorted(tags)
+
+
+_default_tagger = CpvTagger(TRADE_CPV_SEEDS)
+
 
 def is_trade_relevant(cpv_code: str) -> bool:
     """Check if a CPV code is relevant to any construction/maintenance/engineering trade.
@@ -25,8 +83,7 @@ def is_trade_relevant(cpv_code: str) -> bool:
     """
     if not cpv_code:
         return False
-    cpv_clean = cpv_code.strip().split("-")[0].strip()
-    return cpv_clean[:2] in TRADE_RELEVANT_DIVISIONS
+    return normalize_cpv(cpv_code)[:2] in TRADE_RELEVANT_DIVISIONS
 
 
 def get_trade_tags(cpv_codes: list[str]) -> list[str]:
@@ -36,17 +93,4 @@ def get_trade_tags(cpv_codes: list[str]) -> list[str]:
     Any trade-relevant CPV that doesn't match a specific prefix
     gets the 'general' tag as fallback.
     """
-    tags: set[str] = set()
-    for cpv in cpv_codes:
-        if not cpv:
-            continue
-        cpv_clean = cpv.strip().split("-")[0].strip()
-        matched_specific = False
-        for prefix in _SORTED_PREFIXES:
-            if cpv_clean.startswith(prefix):
-                tags.update(_PREFIX_TO_TRADES[prefix])
-                matched_specific = True
-        # Fallback: if CPV is in a relevant division but has no specific trade mapping
-        if not matched_specific and cpv_clean[:2] in TRADE_RELEVANT_DIVISIONS:
-            tags.add("general")
-    return sorted(tags)
+    return _default_tagger.tags(cpv_codes)
@@ -0,0 +1,75 @@
+"""On-disk cache of monthly bulk XML dumps.
+
+Each month is stored as `{year_month}.xml` next to a `{year_month}.json` sidecar
+holding the HTTP validators (ETag / Last-Modified) and a SHA-256 of the body.
+The scraper sends the validators as If-None-Match / If-Modified-Since, and
+treats a 304 — or a 200 whose body hashes the same — as "nothing changed".
+"""
+
+import json
+import os
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+
+@dataclass
+class CacheEntry:
+    """Validators and content hash of a cached dump."""
+
+    etag: str = ""
+    last_modified: str = ""
+    sha256: str = ""
+    size: int = 0
+
+
+class DumpCache:
+    """Dump files and their metadata under a directory, keyed by year-month."""
+
+    def __init__(self, directory: str | os.PathLike) -> None:
+        self.directory = Path(directory)
+
+    def xml_path(self, year_month: str) -> Path:
+        return self.directory / f"{year_month}.xml"
+
+    def _meta_path(self, year_month: str) -> Path:
+        return self.directory / f"{year_month}.json"
+
+    def partial_path(self, year_month: str) -> Path:
+        """Where an in-progress download is written before it replaces the dump."""
+        return self.directory / f"{year_month}.xml.part"
+
+    def load(self, year_month: str) -> CacheEntry | None:
+        """Return the cached entry, or None if the dump or its metadata is missing."""
+        if not self.xml_path(year_month).exists():
+            return None
+        try:
+            data = json.loads(self._meta_path(year_month).read_text())
+            return CacheEntry(**data)
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def save(self, year_month: str, entry: CacheEntry) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        meta_path = self._meta_path(year_month)
+        tmp = meta_path.with_suffix(".json.part")
+        tmp.write_text(json.dumps(asdict(entry)))
+        os.replace(tmp, meta_path)
+
+    def commit(self, year_month: str, entry: CacheEntry) -> None:
+        """Promote a finished partial download to the cached dump."""
+        os.replace(self.partial_path(year_month), self.xml_path(year_month))
+        self.save(year_month, entry)
+
+    def discard(self, year_month: str) -> None:
+        self.partial_path(year_month).unlink(missing_ok=True)
+
+
+def conditional_headers(entry: CacheEntry | None) -> dict[str, str]:
+    """Revalidation headers for a request against a cached entry."""
+    headers = {}
+    if entry is not None:
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+    return headers
@@ -0,0 +1,301 @@
+"""Database-backed enrichment job queue and the long-running worker.
+
+Jobs live in `enrichment_jobs`, one per procurement. Workers claim a batch
+with `FOR UPDATE SKIP LOCKED`, so any number of them (on any number of
+machines) can run without handing out the same job twice. A claim is a
+lease: a worker that dies leaves its jobs `running` until `leased_until`
+passes, after which another worker reclaims them. Each claim bumps
+`attempts`, which doubles as the lease token: a worker only records an
+outcome for the attempt it claimed, so one whose lease was taken over can't
+overwrite the new holder's result. Failed jobs go back to `pending` with
+exponential backoff, and both failed jobs and expired leases are
+dead-lettered (`dead`) after `settings.enrich_job_max_attempts` attempts, so
+a job that keeps crashing its worker stops being handed out.
+"""
+
+import asyncio
+import os
+import random
+import socket
+from dataclasses import dataclass
+
+import httpx
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from hanke_radar.config import settings
+from hanke_radar.db.engine import async_session
+from hanke_radar.db.models import Procurement, ScrapeRun
+from hanke_radar.db.schema import ensure_schema
+from hanke_radar.scraper.html_enricher import (
+    ENRICHMENT_FIELDS,
+    iter_enriched,
+    write_enrichments,
+)
+from hanke_radar.scraper.rhr_api import (
+    RhrApi,
+    adaptive_concurrency,
+    open_response_cache,
+    shared_rate_limiter,
+)
+
+_ENQUEUE = text("""
+    INSERT INTO enrichment_jobs (procurement_id, status, attempts, run_after)
+    SELECT id, 'pending', 0, now()
+    FROM procurements
+    WHERE status = 'active' AND enriched_at IS NULL AND rhr_id IS NOT NULL
+    ORDER BY submission_deadline ASC NULLS LAST
+    ON CONFLICT (procurement_id) DO NOTHING
+""")
+
+_CLAIM = text("""
+    UPDATE enrichment_jobs AS j
+    SET status = 'running',
+        attempts = j.attempts + 1,
+        worker_id = :worker_id,
+        leased_until = now() + make_interval(secs => :lease_seconds),
+        updated_at = now()
+    FROM (
+        SELECT id FROM enrichment_jobs
+        WHERE (status = 'pending' AND run_after <= now())
+           OR (status = 'running' AND leased_until < now() AND attempts < :max_attempts)
+        ORDER BY run_after
+        LIMIT :limit
+        FOR UPDATE SKIP LOCKED
+    ) AS claimable
+    WHERE j.id = claimable.id
+    RETURNING j.id, j.procurement_id, j.attempts
+""")
+
+# Expired leases that used up their attempts: the worker died on the last one
+_BURY_EXPIRED = text("""
+    UPDATE enrichment_jobs AS j
+    SET status = 'dead',
+        leased_until = NULL,
+        last_error = 'Lease expired on attempt ' || j.attempts || ' (worker '
+                     || coalesce(j.worker_id, '?') || ')',
+        updated_at = now()
+    FROM (
+        SELECT id FROM enrichment_jobs
+        WHERE status = 'running' AND leased_until < now() AND attempts >= :max_attempts
+        FOR UPDATE SKIP LOCKED
+    ) AS expired
+    WHERE j.id = expired.id
+""")
+
+# Only touch jobs whose lease (worker and attempt) this worker still holds
+_COMPLETE = text("""
+    UPDATE enrichment_jobs AS j
+    SET status = 'done', leased_until = NULL, last_error = NULL, updated_at = now()
+    FROM unnest(CAST(:ids AS integer[]), CAST(:attempts AS integer[])) AS lease(id, attempts)
+    WHERE j.id = lease.id AND j.attempts = lease.attempts
+      AND j.worker_id = :worker_id AND j.status = 'running'
+""")
+
+_RETRY = text("""
+    UPDATE enrichment_jobs
+    SET status = :status,
+        run_after = now() + make_interval(secs => :delay),
+        leased_until = NULL,
+        last_error = :error,
+        updated_at = now()
+    WHERE id = :id AND attempts = :attempts AND worker_id = :worker_id AND status = 'running'
+""")
+
+
+@dataclass
+class ClaimedJob:
+    id: int
+    procurement_id: int
+    attempts: int  # including the current one
+
+
+def retry_delay(attempts: int) -> float:
+    """Backoff before the next attempt: exponential with ±20% jitter, capped."""
+    base = settings.enrich_job_retry_base_seconds * 2 ** max(0, attempts - 1)
+    return min(settings.enrich_job_retry_max_seconds, base) * random.uniform(0.8, 1.2)
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+async def enqueue_pending(session: AsyncSession) -> int:
+    """Create jobs for active procurements that still need enriching."""
+    result = await session.execute(_ENQUEUE)
+    return result.rowcount
+
+
+async def claim_jobs(
+    session: AsyncSession, worker_id: str, limit: int, lease_seconds: float
+) -> list[ClaimedJob]:
+    """Lease up to `limit` ready jobs (including expired leases) for `worker_id`.
+
+    Expired leases with no attempts left are dead-lettered instead.
+    """
+    max_attempts = settings.enrich_job_max_attempts
+    await session.execute(_BURY_EXPIRED, {"max_attempts": max_attempts})
+    result = await session.execute(_CLAIM, {
+        "worker_id": worker_id,
+        "limit": limit,
+        "lease_seconds": lease_seconds,
+        "max_attempts": max_attempts,
+    })
+    return [ClaimedJob(*row) for row in result.all()]
+
+
+async def complete_jobs(session: AsyncSession, worker_id: str, jobs: list[ClaimedJob]) -> None:
+    if jobs:
+        await session.execute(_COMPLETE, {
+            "ids": [job.id for job in jobs],
+            "attempts": [job.attempts for job in jobs],
+            "worker_id": worker_id,
+        })
+
+
+async def fail_job(
+    session: AsyncSession,
+    worker_id: str,
+    job: ClaimedJob,
+    error: str,
+    retry_after: float | None = None,
+) -> str:
+    """Schedule a retry with backoff, or dead-letter the job. Returns the new status.
+
+    The retry waits at least `retry_after` seconds (RHR's Retry-After).
+    """
+    dead = job.attempts >= settings.enrich_job_max_attempts
+    status = "dead" if dead else "pending"
+    await session.execute(_RETRY, {
+        "id": job.id,
+        "attempts": job.attempts,
+        "worker_id": worker_id,
+        "status": status,
+        "delay": 0 if dead else max(retry_after or 0.0, retry_delay(job.attempts)),
+        "error": error[:500],
+    })
+    return status
+
+
+async def _process_batch(
+    api: RhrApi, worker_id: str, jobs: list[ClaimedJob], verbose: bool
+) -> dict[str, int]:
+    """Enrich one claimed batch and record the outcome of every job."""
+    counts = {"enriched": 0, "skipped": 0, "retried": 0, "dead": 0}
+    by_procurement = {job.procurement_id: job for job in jobs}
+
+    async with async_session() as session:
+        result = await session.execute(
+            select(Procurement).where(Procurement.id.in_(by_procurement))
+        )
+        procurements = result.scalars().all()
+
+    # Procurements deleted since they were queued have nothing left to do
+    found = {p.id for p in procurements}
+    done = [job for job in jobs if job.procurement_id not in found]
+    writes = []
+    failures: list[tuple[ClaimedJob, BaseException]] = []
+    async for proc, enrichment in iter_enriched(
+        api, procurements, settings.enrich_concurrency, verbose
+    ):
+        job = by_procurement[proc.id]
+        if isinstance(enrichment, BaseException):
+            failures.append((job, enrichment))
+            continue
+        enrichment = enrichment or {}
+        fields = {k: enrichment[k] for k in ENRICHMENT_FIELDS if k in enrichment}
+        writes.append({"id": proc.id, "rhr_version_id": enrichment.get("rhr_version_id"),
+                       **fields})
+        done.append(job)
+        counts["enriched" if fields else "skipped"] += 1
+
+    async with async_session() as session:
+        await write_enrichments(session, writes)
+        await complete_jobs(session, worker_id, done)
+        for job, exc in failures:
+            error = f"{type(exc).__name__}: {exc}"
+            status = await fail_job(
+                session, worker_id, job, error, getattr(exc, "retry_after", None)
+            )
+            counts["dead" if status == "dead" else "retried"] += 1
+            if verbose:
+                print(f"  Job {job.id} (attempt {job.attempts}) failed, {status}: {error}")
+        if writes:
+            # Moves the API's data generation only if a batch enriched something;
+            # skipped (empty) results just stamp enriched_at
+            session.add(ScrapeRun(
+                run_type="notice_html",
+                notices_found=len(jobs),
+                notices_stored=counts["enriched"],
+                notices_skipped=counts["skipped"],
+                errors=len(failures),
+                data_changed=counts["enriched"] > 0,
+                status="completed",
+            ))
+        await session.commit()
+    return counts
+
+
+async def run_enrichment_worker(
+    worker_id: str | None = None,
+    batch_size: int | None = None,
+    max_jobs: int | None = None,
+    once: bool = False,
+    verbose: bool = True,
+) -> dict[str, int]:
+    """Claim and process enrichment jobs until stopped.
+
+    Runs forever unless `once` (stop when the queue is empty) or `max_jobs`
+    is reached. When no job is ready the worker enqueues any newly scraped
+    procurements and otherwise sleeps `settings.enrich_worker_idle_seconds`.
+    All workers share the `rate_budgets` row for the RHR API.
+    """
+    if async_session is None:
+        raise RuntimeError("DATABASE_URL not configured")
+
+    worker_id = worker_id or default_worker_id()
+    batch_size = batch_size or settings.enrich_worker_batch_size
+    totals = {"claimed": 0, "enriched": 0, "skipped": 0, "retried": 0, "dead": 0}
+
+    async with async_session() as session:
+        await ensure_schema(session)
+
+    limiter = shared_rate_limiter()
+    cache = open_response_cache()
+    try:
+        async with httpx.AsyncClient() as client:
+            api = RhrApi(client, limiter, cache=cache, concurrency=adaptive_concurrency())
+            while max_jobs is None or totals["claimed"] < max_jobs:
+                limit = batch_size if max_jobs is None else min(
+                    batch_size, max_jobs - totals["claimed"]
+                )
+                queued = 0
+                async with async_session() as session:
+                    jobs = await claim_jobs(
+                        session, worker_id, limit, settings.enrich_job_lease_seconds
+                    )
+                    if not jobs:
+                        queued = await enqueue_pending(session)
+                        if queued and verbose:
+                            print(f"Queued {queued} procurements for enrichment")
+                    await session.commit()
+
+                if not jobs:
+                    if once and not queued:
+                        break
+                    if not queued:
+                        await asyncio.sleep(settings.enrich_worker_idle_seconds)
+                    continue
+
+                totals["claimed"] += len(jobs)
+                counts = await _process_batch(api, worker_id, jobs, verbose)
+                for key, value in counts.items():
+                    totals[key] += value
+                if verbose:
+                    print(f"[{worker_id}] {totals['claimed']} claimed: "
+                          f"{totals['enriched']} enriched, {totals['skipped']} empty, "
+                          f"{totals['retried']} retrying, {totals['dead']} dead")
+    finally:
+        if cache is not None:
+            cache.close()
+    return totals
@@ -7,31 +7,30 @@ JSON API endpoints, not static HTML. We use:
 - /proc-vers/{versionId}/additional-data — address, contact details from free text
 
 The rhr_id is an internal integer ID extracted from CallForTendersDocumentReference
-URIs in the eForms XML bulk dump.
+URIs in the eForms XML bulk dump. HTTP access goes through rhr_api.RhrApi.
 """
 
 import asyncio
 import re
 import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
 from datetime import UTC, datetime
 
 import httpx
-from sqlalchemy import select, update
+from sqlalchemy import Integer, Text, column, func, select, update, values
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from hanke_radar.config import settings
 from hanke_radar.db.engine import async_session
 from hanke_radar.db.models import Procurement, ScrapeRun
-
-
-async def _fetch_json(client: httpx.AsyncClient, url: str) -> dict | None:
-    """Fetch a JSON endpoint, return None on any error."""
-    try:
-        resp = await client.get(url, timeout=30)
-        if resp.status_code == 200:
-            return resp.json()
-    except Exception:
-        pass
-    return None
+from hanke_radar.db.runs import fail_run
+from hanke_radar.db.schema import ensure_schema
+from hanke_radar.scraper.rhr_api import (
+    RhrApi,
+    adaptive_concurrency,
+    open_response_cache,
+    shared_rate_limiter,
+)
 
 
 def _extract_contact_from_text(text: str) -> dict:
@@ -51,75 +50,230 @@ def _extract_contact_from_text(text: str) -> dict:
     return result
 
 
+def _general_info_fields(general: dict) -> dict:
+    """Contact person from a general-info payload."""
+    liable_person = general.get("liablePersonName", "")
+    return {"contact_person": liable_person} if liable_person else {}
+
+
+def _additional_data_fields(additional: dict) -> dict:
+    """Performance address and contact details from an additional-data payload."""
+    fields = {}
+
+    # Performance address from procPart.place (skip generic country-only values)
+    proc_part = additional.get("procPart", {})
+    place = proc_part.get("place", "")
+    if isinstance(place, str) and place.strip():
+        place_clean = place.strip()
+        # Only store if more specific than just a country name
+        if len(place_clean) > 10 and place_clean.lower() not in ("eesti", "estonia"):
+            fields["performance_address"] = place_clean
+
+    # Contact details from free text (procObject.additionalInfo)
+    proc_obj = additional.get("procObject", {})
+    additional_info = proc_obj.get("additionalInfo", "")
+    if additional_info:
+        fields.update(_extract_contact_from_text(additional_info))
+
+    return fields
+
+
+# Procurement columns filled in from the RHR API
+ENRICHMENT_FIELDS = ("contact_person", "contact_email", "contact_phone", "performance_address")
+
+
+def _version_id(version_data: dict | None) -> str | None:
+    """Version id from a latest-version payload, as stored in rhr_version_id."""
+    if not isinstance(version_data, dict):
+        return None
+    version_id = version_data.get("value") or version_data.get("procurementVersionId")
+    return str(version_id) if version_id else None
+
+
+async def fetch_version_details(api: RhrApi, version_id: str) -> dict:
+    """Enrichment fields for one procurement version.
+
+    Contact person (general-info) and address/contacts (additional-data) only
+    depend on the version, so both are fetched at once. If either fails
+    transiently its RhrTransientError is raised once both have finished, so
+    the other payload still lands in the response cache for the retry.
+    """
+    general, additional = await asyncio.gather(
+        api.general_info(version_id), api.additional_data(version_id),
+        return_exceptions=True,
+    )
+    for outcome in (general, additional):
+        if isinstance(outcome, BaseException):
+            raise outcome
+    fields = {}
+    if general:
+        fields.update(_general_info_fields(general))
+    if additional:
+        fields.update(_additional_data_fields(additional))
+    return fields
+
+
 async def enrich_procurement(
-    client: httpx.AsyncClient,
+    api: RhrApi,
     procurement: Procurement,
     verbose: bool = True,
 ) -> dict | None:
     """Fetch additional data for a single procurement from the RHR API.
 
-    Uses the rhr_id (internal integer ID) to access the API.
-    Returns a dict of enrichment fields, or None if enrichment failed.
+    Uses the rhr_id (internal integer ID) to resolve the latest version, then
+    fetches that version's details. Returns the enrichment fields found plus
+    `rhr_version_id`, or None if the version could not be resolved. Raises
+    RhrTransientError when RHR throttled or failed, so the row is retried.
     """
     rhr_id = procurement.rhr_id
     if not rhr_id:
         return None
 
-    base = settings.riigihanked_base_url
-
     # Step 1: Get latest version ID
-    version_data = await _fetch_json(client, f"{base}/procurement/{rhr_id}/latest-version")
+    version_data = await api.latest_version(rhr_id)
     if not version_data:
         if verbose:
             print(f"  No version data for rhr_id={rhr_id}")
         return None
 
-    version_id = None
-    if isinstance(version_data, dict):
-        version_id = version_data.get("value") or version_data.get("procurementVersionId")
-
+    version_id = _version_id(version_data)
     if not version_id:
         if verbose:
             print(f"  Could not extract version ID for rhr_id={rhr_id}")
         return None
 
-    enrichment = {}
+    # Step 2: contact and address details for that version
+    enrichment = await fetch_version_details(api, version_id)
+    enrichment["rhr_version_id"] = version_id
+    return enrichment
 
-    # Step 2: Get contact person from general-info
-    general = await _fetch_json(client, f"{base}/proc-vers/{version_id}/general-info")
-    if general:
-        liable_person = general.get("liablePersonName", "")
-        if liable_person:
-            enrichment["contact_person"] = liable_person
 
-    # Step 3: Get address and contact details from additional-data
-    additional = await _fetch_json(client, f"{base}/proc-vers/{version_id}/additional-data")
-    if additional:
-        # Performance address from procPart.place (skip generic country-only values)
-        proc_part = additional.get("procPart", {})
-        place = proc_part.get("place", "")
-        if isinstance(place, str) and place.strip():
-            place_clean = place.strip()
-            # Only store if more specific than just a country name
-            if len(place_clean) > 10 and place_clean.lower() not in ("eesti", "estonia"):
-                enrichment["performance_address"] = place_clean
+async def _gather_bounded[T, R](
+    concurrency: int,
+    func: Callable[[T], Awaitable[R]],
+    items: Iterable[T],
+) -> list[R | BaseException]:
+    """Run `func` over `items` with at most `concurrency` calls in flight.
+
+    Results (or the exception raised) are returned in the order of `items`.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def _one(item: T) -> R:
+        async with semaphore:
+            return await func(item)
+
+    return await asyncio.gather(*(_one(i) for i in items), return_exceptions=True)
+
+
+async def _enrich_concurrently(
+    api: RhrApi,
+    procurements: list[Procurement],
+    concurrency: int,
+    verbose: bool = True,
+) -> list[dict | BaseException | None]:
+    """Enrich procurements with up to `concurrency` in flight.
+
+    All workers share the API's limiter, so the request rate stays under one
+    global cap. Results (enrichment, None, or the exception raised) are
+    returned in the order of `procurements`.
+    """
+    return await _gather_bounded(
+        concurrency, lambda proc: enrich_procurement(api, proc, verbose), procurements
+    )
+
+
+async def iter_enriched(
+    api: RhrApi,
+    procurements: list[Procurement],
+    concurrency: int,
+    verbose: bool = True,
+) -> AsyncIterator[tuple[Procurement, dict | BaseException | None]]:
+    """Like _enrich_concurrently, but yields (procurement, result) as each finishes."""
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def _one(proc: Procurement) -> tuple[Procurement, dict | BaseException | None]:
+        async with semaphore:
+            try:
+                return proc, await enrich_procurement(api, proc, verbose)
+            except Exception as e:
+                return proc, e
+
+    tasks = [asyncio.create_task(_one(p)) for p in procurements]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
 
-        # Contact details from free text (procObject.additionalInfo)
-        proc_obj = additional.get("procObject", {})
-        additional_info = proc_obj.get("additionalInfo", "")
-        if additional_info:
-            contact_from_text = _extract_contact_from_text(additional_info)
-            enrichment.update(contact_from_text)
 
-    return enrichment if enrichment else None
+# Columns written from enrichment results; NULL in a row keeps the stored value
+_WRITE_COLUMNS = ("rhr_version_id", *ENRICHMENT_FIELDS)
+
+
+async def write_enrichments(
+    session: AsyncSession, rows: list[dict], overwrite: bool = False
+) -> None:
+    """Apply enrichment results with a single UPDATE ... FROM (VALUES ...).
+
+    Each row has `id` plus any of `_WRITE_COLUMNS`; missing fields keep the
+    stored value, unless `overwrite` is set (a refresh of a new version),
+    where they are cleared. enriched_at is set on every row.
+    """
+    if not rows:
+        return
+    data = values(
+        column("id", Integer),
+        *(column(name, Text) for name in _WRITE_COLUMNS),
+        name="enrichment",
+    ).data([(row["id"], *(row.get(name) for name in _WRITE_COLUMNS)) for row in rows])
+    await session.execute(
+        update(Procurement)
+        .where(Procurement.id == data.c.id)
+        .values(
+            enriched_at=datetime.now(UTC),
+            **{
+                name: data.c[name] if overwrite
+                else func.coalesce(data.c[name], getattr(Procurement, name))
+                for name in _WRITE_COLUMNS
+            },
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _refresh_writes(
+    changed: list[tuple], details: list[dict | BaseException]
+) -> tuple[list[dict], int]:
+    """Rows to overwrite for procurements whose version moved, and the error count.
+
+    Only a transient failure keeps the old version (so the next pass retries);
+    an empty answer still records the new version and clears what it dropped.
+    """
+    writes = []
+    errors = 0
+    for (row, version), fields in zip(changed, details, strict=True):
+        if isinstance(fields, BaseException):
+            errors += 1
+            continue
+        writes.append({"id": row.id, "rhr_version_id": version, **fields})
+    return writes, errors
 
 
 async def enrich_active_procurements(
     limit: int = 50,
     verbose: bool = True,
+    concurrency: int | None = None,
 ) -> dict:
     """Enrich active procurements that haven't been enriched yet.
 
+    Fetches run `concurrency` at a time (default `settings.enrich_concurrency`)
+    under a shared `settings.enrich_requests_per_second` cap. Results are
+    written `settings.enrich_write_chunk_size` at a time, each chunk committed
+    together with the run's progress, so an interrupted run keeps what it
+    finished.
+
     Returns a summary dict.
     """
     if async_session is None:
@@ -131,6 +285,8 @@ async def enrich_active_procurements(
     errors = 0
 
     async with async_session() as session:
+        await ensure_schema(session)
+
         # Record the scrape run
         run = ScrapeRun(run_type="notice_html")
         session.add(run)
@@ -146,55 +302,74 @@ async def enrich_active_procurements(
             .limit(limit)
         )
         procurements = result.scalars().all()
+        run.notices_found = len(procurements)
 
         if verbose:
             print(f"Found {len(procurements)} procurements to enrich")
 
-        async with httpx.AsyncClient() as client:
-            for proc in procurements:
-                try:
-                    enrichment = await enrich_procurement(client, proc, verbose)
-                    if enrichment:
-                        update_dict = {"enriched_at": datetime.now(UTC)}
-                        for key in ("contact_person", "contact_email", "contact_phone",
-                                    "performance_address"):
-                            if key in enrichment:
-                                update_dict[key] = enrichment[key]
-
-                        await session.execute(
-                            update(Procurement)
-                            .where(Procurement.id == proc.id)
-                            .values(**update_dict)
-                        )
+        pending: list[dict] = []
+        committed = 0  # enriched_count as of the last commit
+
+        async def _flush() -> None:
+            nonlocal committed
+            await write_enrichments(session, pending)
+            pending.clear()
+            run.notices_stored = enriched_count
+            run.notices_skipped = skipped
+            run.errors = errors
+            run.duration_ms = int((time.monotonic() - start_time) * 1000)
+            await session.commit()
+            committed = enriched_count
+
+        cache = open_response_cache()
+        try:
+            async with httpx.AsyncClient() as client:
+                api = RhrApi(
+                    client,
+                    shared_rate_limiter(),
+                    cache=cache,
+                    concurrency=adaptive_concurrency(),
+                )
+                async for proc, enrichment in iter_enriched(
+                    api, procurements, concurrency or settings.enrich_concurrency, verbose
+                ):
+                    # Left unenriched (enriched_at NULL), so the next run retries it
+                    if isinstance(enrichment, BaseException):
+                        errors += 1
+                        if verbose:
+                            print(f"  Error enriching {proc.notice_id}: {enrichment}")
+                        continue
+
+                    enrichment = enrichment or {}
+                    fields = {k: enrichment[k] for k in ENRICHMENT_FIELDS if k in enrichment}
+                    # enriched_at is set even when nothing was found, so we don't
+                    # retry indefinitely; `hanke refresh` picks up new versions
+                    pending.append(
+                        {"id": proc.id, "rhr_version_id": enrichment.get("rhr_version_id"),
+                         **fields}
+                    )
+                    if fields:
                         enriched_count += 1
                         if verbose:
                             print(f"  Enriched: {proc.title[:60]}")
                     else:
-                        # Mark as attempted so we don't retry indefinitely
-                        await session.execute(
-                            update(Procurement)
-                            .where(Procurement.id == proc.id)
-                            .values(enriched_at=datetime.now(UTC))
-                        )
                         skipped += 1
-                except Exception as e:
-                    errors += 1
-                    if verbose:
-                        print(f"  Error enriching {proc.notice_id}: {e}")
-
-                # Polite rate limiting
-                await asyncio.sleep(settings.scrape_delay_seconds)
-
-            await session.commit()
+                    if len(pending) >= settings.enrich_write_chunk_size:
+                        await _flush()
+            await _flush()
+        except Exception as e:
+            # Chunks already committed stay; the run still moves the generation
+            await fail_run(session, run, e, start_time, data_changed=committed > 0)
+            raise
+        finally:
+            if cache is not None:
+                cache.close()
 
         duration_ms = int((time.monotonic() - start_time) * 1000)
 
         # Update run record
-        run.notices_found = len(procurements)
-        run.notices_stored = enriched_count
-        run.notices_skipped = skipped
-        run.errors = errors
         run.duration_ms = duration_ms
+        run.data_changed = enriched_count > 0
         run.status = "completed"
         await session.commit()
 
@@ -204,6 +379,9 @@ async def enrich_active_procurements(
             "skipped": skipped,
             "errors": errors,
             "duration_ms": duration_ms,
+            "latency": api.latency_summary(),
+            "cache": api.cache_summary(),
+            "concurrency": api.concurrency_summary(),
         }
 
         if verbose:
@@ -211,3 +389,139 @@ async def enrich_active_procurements(
             print(f"Duration: {duration_ms}ms")
 
         return summary
+
+
+async def _latest_version_id(api: RhrApi, rhr_id: str) -> str | None:
+    return _version_id(await api.latest_version(rhr_id, fresh=True))
+
+
+async def refresh_enriched_procurements(
+    limit: int | None = None,
+    verbose: bool = True,
+    concurrency: int | None = None,
+) -> dict:
+    """Re-enrich active procurements whose RHR version has moved.
+
+    Walks enriched active procurements in id order, `settings.refresh_batch_size`
+    at a time. For each batch only latest-version is checked (bypassing the
+    response cache, up to `concurrency` in flight); the full general-info /
+    additional-data fetch runs only for rows whose version differs from the
+    stored `rhr_version_id`. Each batch is committed before the next is read.
+
+    Returns a summary dict.
+    """
+    if async_session is None:
+        raise RuntimeError("DATABASE_URL not configured")
+
+    concurrency = concurrency or settings.refresh_concurrency
+    start_time = time.monotonic()
+    checked = 0
+    moved = 0
+    updated = 0
+    errors = 0
+
+    committed = 0  # `updated` as of the last commit
+
+    async with async_session() as session:
+        await ensure_schema(session)
+
+        run = ScrapeRun(run_type="rhr_refresh")
+        session.add(run)
+        await session.commit()
+
+        cache = open_response_cache()
+        try:
+            async with httpx.AsyncClient() as client:
+                api = RhrApi(
+                    client,
+                    shared_rate_limiter(),
+                    cache=cache,
+                    concurrency=adaptive_concurrency(),
+                )
+                last_id = 0
+                while limit is None or checked < limit:
+                    batch_size = settings.refresh_batch_size
+                    if limit is not None:
+                        batch_size = min(batch_size, limit - checked)
+                    rows = (await session.execute(
+                        select(Procurement.id, Procurement.rhr_id, Procurement.rhr_version_id)
+                        .where(Procurement.status == "active")
+                        .where(Procurement.enriched_at.isnot(None))
+                        .where(Procurement.rhr_id.isnot(None))
+                        .where(Procurement.id > last_id)
+                        .order_by(Procurement.id)
+                        .limit(batch_size)
+                    )).all()
+                    if not rows:
+                        break
+                    last_id = rows[-1].id
+                    checked += len(rows)
+
+                    versions = await _gather_bounded(
+                        concurrency,
+                        lambda rhr_id: _latest_version_id(api, rhr_id),
+                        [row.rhr_id for row in rows],
+                    )
+                    changed = []
+                    for row, version in zip(rows, versions, strict=True):
+                        if isinstance(version, BaseException) or version is None:
+                            errors += 1
+                        elif version != row.rhr_version_id:
+                            changed.append((row, version))
+                    moved += len(changed)
+
+                    details = await _gather_bounded(
+                        concurrency,
+                        lambda pair: fetch_version_details(api, pair[1]),
+                        changed,
+                    )
+                    writes, failed = _refresh_writes(changed, details)
+                    errors += failed
+                    # A corrigendum that drops a contact must clear it, not keep it
+                    await write_enrichments(session, writes, overwrite=True)
+                    updated += len(writes)
+                    run.notices_found = checked
+                    run.notices_stored = updated
+                    run.notices_skipped = checked - moved
+                    run.errors = errors
+                    run.duration_ms = int((time.monotonic() - start_time) * 1000)
+                    await session.commit()
+                    committed = updated
+
+                    if verbose:
+                        print(f"  Checked {checked}: {moved} new versions, {updated} updated")
+        except Exception as e:
+            await fail_run(session, run, e, start_time, data_changed=committed > 0)
+            raise
+        finally:
+            if cache is not None:
+                cache.close()
+
+        duration_ms = int((time.monotonic() - start_time) * 1000)
+        run.notices_found = checked
+        run.notices_stored = updated
+        run.notices_skipped = checked - moved
+        run.errors = errors
+        run.duration_ms = duration_ms
+        run.data_changed = updated > 0
+        run.status = "completed"
+        await session.commit()
+
+        summary = {
+            "checked": checked,
+            "moved": moved,
+            "updated": updated,
+            "unchanged": checked - moved,
+            "errors": errors,
+            "duration_ms": duration_ms,
+            "latency": api.latency_summary(),
+            "cache": api.cache_summary(),
+            "concurrency": api.concurrency_summary(),
+        }
+
+        if verbose:
+            print(f"\nDone: {checked} checked, {moved} new versions, {updated} updated, "
+                  f"{errors} errors")
+            print(f"Duration: {duration_ms}ms")
+
+        return summary
@@ -0,0 +1,223 @@
+"""Rate limiting shared by concurrent RHR API requests.
+
+TokenBucket caps the rate within one process; DbTokenBucket keeps the bucket
+in Postgres so enrichment workers on several machines share one budget.
+AdaptiveConcurrency sits in front of either and adjusts how many requests are
+in flight from the portal's own signals (latency, 429/503, timeouts).
+"""
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import Callable
+from typing import Protocol
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class RateLimiter(Protocol):
+    async def acquire(self) -> None: ...
+
+
+class TokenBucket:
+    """Async token bucket: at most `rate` acquisitions per second on average.
+
+    Up to `burst` tokens accumulate while idle. Waiters are served in arrival
+    order, so one bucket shared by all workers enforces a single global cap
+    however many requests are in flight.
+    """
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        """Wait until a token is available, then take it."""
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+
+# Refill and take one token in a single statement; the row lock serialises
+# concurrent callers and the WHERE clause is re-checked after waiting on it.
+_TAKE_TOKEN = text("""
+    UPDATE rate_budgets
+    SET tokens = LEAST(:burst, tokens
+                   + EXTRACT(EPOCH FROM clock_timestamp() - updated_at) * :rate) - 1,
+        updated_at = clock_timestamp()
+    WHERE name = :name
+      AND LEAST(:burst, tokens
+                + EXTRACT(EPOCH FROM clock_timestamp() - updated_at) * :rate) >= 1
+    RETURNING tokens
+""")
+
+_CREATE_BUDGET = text("""
+    INSERT INTO rate_budgets (name, tokens, updated_at)
+    VALUES (:name, :burst, clock_timestamp())
+    ON CONFLICT (name) DO NOTHING
+""")
+
+
+class DbTokenBucket:
+    """Token bucket kept in the `rate_budgets` table, shared across processes.
+
+    Every worker on every node takes tokens from the same row, so the global
+    request rate stays under `rate` however many workers run. Each token costs
+    one short DB transaction; callers in the same process queue on a local
+    lock first so only one of them polls the row at a time.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        name: str,
+        rate: float,
+        burst: int = 1,
+    ) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.session_factory = session_factory
+        self.name = name
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._lock = asyncio.Lock()
+        self._created = False
+
+    async def acquire(self) -> None:
+        """Wait until the shared budget has a token, then take it."""
+        params = {"name": self.name, "rate": self.rate, "burst": self.burst}
+        async with self._lock:
+            while True:
+                async with self.session_factory() as session:
+                    if not self._created:
+                        await session.execute(_CREATE_BUDGET, params)
+                        self._created = True
+                    taken = (await session.execute(_TAKE_TOKEN, params)).first()
+                    await session.commit()
+                if taken is not None:
+                    return
+                await asyncio.sleep(1 / self.rate)
+
+
+class AdaptiveConcurrency:
+    """AIMD limit on requests in flight, driven by latency and throttling.
+
+    Every answered request grows the limit by 1/limit (about +1 per round
+    trip) while the recent p95 latency stays under `latency_target_ms` and
+    the recent error rate under `max_error_rate`. A throttle (429/503 or a
+    timeout) multiplies it by `backoff` and, given a Retry-After, holds all
+    new requests until it has passed; a p95 over target shrinks it gently.
+    Only requests started after the last decrease can cause another one, so
+    a burst of failures from one congested round counts once.
+
+    Callers pair `acquire()` with exactly one of `succeeded()`, `failed()` or
+    `throttled()`, passing back the ticket `acquire()` returned.
+    """
+
+    def __init__(
+        self,
+        initial: int = 4,
+        minimum: int = 1,
+        maximum: int = 32,
+        latency_target_ms: float = 2000.0,
+        max_error_rate: float = 0.05,
+        backoff: float = 0.5,
+        window: int = 50,
+    ) -> None:
+        if not 1 <= minimum <= initial <= maximum:
+            raise ValueError("need 1 <= minimum <= initial <= maximum")
+        self.minimum = minimum
+        self.maximum = maximum
+        self.latency_target_ms = latency_target_ms
+        self.max_error_rate = max_error_rate
+        self.backoff = backoff
+        self.limit = float(initial)
+        self.peak_limit = self.limit
+        self.throttles = 0
+        self.decreases = 0
+        self.in_flight = 0
+        self._latencies: deque[float] = deque(maxlen=window)
+        self._errors: deque[bool] = deque(maxlen=window)
+        self._epoch = 0  # bumped on every decrease
+        self._paused_until = 0.0
+        self._changed = asyncio.Event()
+
+    async def acquire(self) -> int:
+        """Wait for a free slot (and any Retry-After pause); returns a ticket."""
+        while True:
+            pause = self._paused_until - time.monotonic()
+            if pause > 0:
+                await asyncio.sleep(pause)
+                continue
+            if self.in_flight < int(self.limit):
+                self.in_flight += 1
+                return self._epoch
+            self._changed.clear()
+            await self._changed.wait()
+
+    def _p95_ms(self) -> float:
+        ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] if ordered else 0.0
+
+    def _error_rate(self) -> float:
+        return sum(self._errors) / len(self._errors) if self._errors else 0.0
+
+    def _release(self) -> None:
+        self.in_flight -= 1
+        self._changed.set()
+
+    def _decrease(self, ticket: int, factor: float) -> None:
+        if ticket != self._epoch:
+            return  # started before the last decrease; already accounted for
+        self._epoch += 1
+        self.decreases += 1
+        self.limit = max(self.minimum, self.limit * factor)
+
+    def succeeded(self, ticket: int, latency_ms: float) -> None:
+        """The request was answered (any non-throttle status)."""
+        self._release()
+        self._latencies.append(latency_ms)
+        self._errors.append(False)
+        if self._p95_ms() > self.latency_target_ms:
+            self._decrease(ticket, 0.9)
+        elif self._error_rate() <= self.max_error_rate:
+            self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self.peak_limit = max(self.peak_limit, self.limit)
+
+    def failed(self, ticket: int) -> None:
+        """A server or transport error that is not a throttle; blocks growth."""
+        self._release()
+        self._errors.append(True)
+
+    def throttled(self, ticket: int, retry_after: float | None = None) -> None:
+        """429/503 or a timeout: back off, and pause for `retry_after` seconds."""
+        self._release()
+        self._errors.append(True)
+        self.throttles += 1
+        self._decrease(ticket, self.backoff)
+        if retry_after:
+            self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+
+    def summary(self) -> dict:
+        return {
+            "limit": round(self.limit, 1),
+            "peak_limit": round(self.peak_limit, 1),
+            "throttles": self.throttles,
+            "decreases": self.decreases,
+            "p95_ms": round(self._p95_ms(), 1),
+            "error_rate": round(self._error_rate(), 3),
+        }
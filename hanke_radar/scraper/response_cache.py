@@ -0,0 +1,150 @@
+"""Persistent cache of RHR JSON API responses (SQLite).
+
+Entries are keyed by URL and expire per endpoint: `latest-version` answers
+change whenever an authority publishes a new version, so they get a short
+TTL, while `proc-vers/{versionId}/...` payloads describe one immutable
+version and never expire. Hits and misses are counted per endpoint for the
+run summary.
+
+The cache runs on the event loop, so writes are cheap: WAL with
+synchronous=NORMAL, and `put` commits in batches (every `commit_every`
+writes or `commit_interval` seconds, and on close) rather than per response.
+Concurrent runs share the file: WAL lets reads proceed while another run
+writes, and a lock held past `busy_timeout_ms` (or any other SQLite error)
+turns a read into a miss and drops a write instead of failing the enrichment.
+"""
+
+import json
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+# Writes per commit, and the longest an uncommitted write may wait
+COMMIT_EVERY = 100
+COMMIT_INTERVAL = 1.0
+# How long a statement waits for another process's lock before giving up
+BUSY_TIMEOUT_MS = 5000
+
+
+@dataclass
+class CacheCounter:
+    hits: int = 0
+    misses: int = 0
+    errors: int = 0  # SQLite lock timeouts / I/O errors, served as misses or dropped
+
+    def summary(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hit_ratio": round(self.hits / total, 3) if total else 0.0,
+        }
+
+
+class ResponseCache:
+    """URL -> JSON body store with per-endpoint TTLs (None = never expires)."""
+
+    def __init__(
+        self,
+        path: str | Path,
+        ttls: dict[str, float | None],
+        commit_every: int = COMMIT_EVERY,
+        commit_interval: float = COMMIT_INTERVAL,
+        busy_timeout_ms: int = BUSY_TIMEOUT_MS,
+    ) -> None:
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.ttls = ttls
+        self.commit_every = max(1, commit_every)
+        self.commit_interval = commit_interval
+        self.counters: dict[str, CacheCounter] = {}
+        self._pending: dict[str, int] = {}  # uncommitted writes per endpoint
+        self._first_pending = 0.0
+        self._db = sqlite3.connect(str(path), timeout=busy_timeout_ms / 1000)
+        self._db.execute(f"PRAGMA busy_timeout = {int(busy_timeout_ms)}")
+        self._db.execute("PRAGMA journal_mode = WAL")
+        self._db.execute("PRAGMA synchronous = NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " url TEXT PRIMARY KEY, endpoint TEXT NOT NULL,"
+            " body TEXT NOT NULL, fetched_at REAL NOT NULL)"
+        )
+        self.prune()
+
+    def _expired(self, endpoint: str, fetched_at: float, now: float) -> bool:
+        ttl = self.ttls.get(endpoint)
+        return ttl is not None and now - fetched_at >= ttl
+
+    def get(self, endpoint: str, url: str) -> dict | None:
+        """Return the cached body for `url`, or None if absent or expired."""
+        counter = self.counters.setdefault(endpoint, CacheCounter())
+        try:
+            row = self._db.execute(
+                "SELECT body, fetched_at FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+        except sqlite3.OperationalError:
+            counter.errors += 1
+            row = None
+        if row is None or self._expired(endpoint, row[1], time.time()):
+            counter.misses += 1
+            return None
+        counter.hits += 1
+        return json.loads(row[0])
+
+    def put(self, endpoint: str, url: str, body: dict) -> None:
+        """Store `body`; committed with the next batch (see `flush`)."""
+        try:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (url, endpoint, body, fetched_at)"
+                " VALUES (?, ?, ?, ?)",
+                (url, endpoint, json.dumps(body), time.time()),
+            )
+        except sqlite3.OperationalError:
+            self.counters.setdefault(endpoint, CacheCounter()).errors += 1
+            return
+        if not self._pending:
+            self._first_pending = time.monotonic()
+        self._pending[endpoint] = self._pending.get(endpoint, 0) + 1
+        if (sum(self._pending.values()) >= self.commit_every
+                or time.monotonic() - self._first_pending >= self.commit_interval):
+            self.flush()
+
+    def flush(self) -> None:
+        """Commit pending writes; on a lock timeout they are dropped (it's a cache)."""
+        if not self._pending:
+            return
+        try:
+            self._db.commit()
+        except sqlite3.OperationalError:
+            self._db.rollback()
+            for endpoint, dropped in self._pending.items():
+                self.counters.setdefault(endpoint, CacheCounter()).errors += dropped
+        self._pending.clear()
+
+    def prune(self) -> int:
+        """Delete expired entries; returns the number removed."""
+        now = time.time()
+        removed = 0
+        try:
+            for endpoint, ttl in self.ttls.items():
+                if ttl is not None:
+                    removed += self._db.execute(
+                        "DELETE FROM responses WHERE endpoint = ? AND fetched_at <= ?",
+                        (endpoint, now - ttl),
+                    ).rowcount
+            self._db.commit()
+        except sqlite3.OperationalError:
+            # Another run holds the lock; expired rows are misses anyway
+            self._db.rollback()
+            return 0
+        return removed
+
+    def summary(self) -> dict[str, dict]:
+        """Per-endpoint hits, misses and hit ratio since the cache was opened."""
+        return {name: counter.summary() for name, counter in self.counters.items()}
+
+    def close(self) -> None:
+        self.flush()
+        self._db.close()
@@ -0,0 +1,255 @@
+"""Client for the riigihanked.riik.ee (RHR) public JSON API.
+
+Wraps an httpx client with the shared rate limiter, an optional adaptive
+concurrency limit, a per-endpoint request deadline, retries for transient
+failures, an optional persistent response cache, and per-endpoint latency
+statistics for the run summary.
+"""
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+
+import httpx
+
+from hanke_radar.config import settings
+from hanke_radar.db.engine import async_session
+from hanke_radar.scraper.rate_limit import AdaptiveConcurrency, DbTokenBucket, RateLimiter
+from hanke_radar.scraper.response_cache import ResponseCache
+
+# Whole-request deadline per endpoint, in seconds. latest-version is tiny and
+# gates everything else; the proc-vers payloads are larger.
+ENDPOINT_TIMEOUTS = {
+    "latest-version": 10.0,
+    "general-info": 20.0,
+    "additional-data": 20.0,
+}
+DEFAULT_TIMEOUT = 30.0
+
+# Name of the shared row in rate_budgets that every RHR caller draws from
+RHR_RATE_BUDGET = "rhr_api"
+
+# Statuses meaning "slow down" rather than "broken"
+THROTTLE_STATUSES = frozenset({429, 503})
+# Longest Retry-After we honour before retrying
+MAX_RETRY_AFTER = 300.0
+
+
+class RhrTransientError(Exception):
+    """RHR throttled, failed with a 5xx or timed out, even after retries.
+
+    The procurement is not "empty", it just could not be fetched now: callers
+    must leave it to be retried rather than mark it enriched.
+    """
+
+    def __init__(self, message: str, retry_after: float | None = None) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)."""
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = (parsedate_to_datetime(value) - datetime.now(UTC)).total_seconds()
+        except (TypeError, ValueError):
+            return None
+    return min(MAX_RETRY_AFTER, max(0.0, seconds))
+
+
+def shared_rate_limiter() -> DbTokenBucket:
+    """The RHR request budget shared by enrich, refresh and every enrich-worker."""
+    if async_session is None:
+        raise RuntimeError("DATABASE_URL not configured")
+    return DbTokenBucket(async_session, RHR_RATE_BUDGET, settings.enrich_requests_per_second)
+
+
+def adaptive_concurrency() -> AdaptiveConcurrency:
+    """A fresh adaptive concurrency limit from settings."""
+    return AdaptiveConcurrency(
+        initial=settings.rhr_adaptive_initial,
+        maximum=max(settings.rhr_adaptive_initial, settings.rhr_adaptive_max),
+        latency_target_ms=settings.rhr_latency_target_ms,
+    )
+
+
+def open_response_cache() -> ResponseCache | None:
+    """The configured on-disk response cache, or None if disabled.
+
+    proc-vers payloads are keyed by version id and never go stale; only the
+    latest-version lookup expires.
+    """
+    if not settings.rhr_cache_path:
+        return None
+    return ResponseCache(
+        settings.rhr_cache_path,
+        ttls={
+            "latest-version": settings.rhr_latest_version_ttl_seconds,
+            "general-info": None,
+            "additional-data": None,
+        },
+    )
+
+
+@dataclass
+class EndpointStats:
+    """Latency samples (ms), failed attempts and retries for one endpoint."""
+
+    samples: list[float] = field(default_factory=list)
+    failures: int = 0
+    retries: int = 0
+
+    def summary(self) -> dict:
+        ordered = sorted(self.samples)
+        if not ordered:
+            return {"calls": 0, "failures": self.failures, "retries": self.retries}
+        return {
+            "calls": len(ordered),
+            "failures": self.failures,
+            "retries": self.retries,
+            "mean_ms": round(sum(ordered) / len(ordered), 1),
+            "p50_ms": round(ordered[len(ordered) // 2], 1),
+            "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 1),
+            "max_ms": round(ordered[-1], 1),
+        }
+
+
+class RhrApi:
+    """The three RHR endpoints the enricher uses.
+
+    Responses found in `cache` are returned without a request. Otherwise
+    each attempt takes a slot from `concurrency` (if given) and then a token
+    from `limiter` (if given); waiting for either is not counted as endpoint
+    latency. 429/503, other 5xx, timeouts and connection errors are retried
+    up to `retries` times with exponential backoff, or after Retry-After when
+    the portal sends one; if every attempt fails, RhrTransientError is
+    raised. Other answers without usable JSON (404, bad body) return None.
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        limiter: RateLimiter | None = None,
+        base_url: str | None = None,
+        cache: ResponseCache | None = None,
+        concurrency: AdaptiveConcurrency | None = None,
+        retries: int | None = None,
+    ) -> None:
+        self.client = client
+        self.limiter = limiter
+        self.base_url = base_url or settings.riigihanked_base_url
+        self.cache = cache
+        self.concurrency = concurrency
+        self.retries = settings.rhr_max_retries if retries is None else retries
+        self.stats: dict[str, EndpointStats] = {}
+
+    async def get(self, endpoint: str, path: str, fresh: bool = False) -> dict | None:
+        """GET `path` under the API base, recorded under `endpoint`.
+
+        `fresh` skips the cache lookup (the response is still cached).
+        """
+        url = f"{self.base_url}{path}"
+        if self.cache is not None and not fresh:
+            cached = self.cache.get(endpoint, url)
+            if cached is not None:
+                return cached
+
+        stats = self.stats.setdefault(endpoint, EndpointStats())
+        for attempt in range(self.retries + 1):
+            try:
+                data = await self._attempt(endpoint, url, stats)
+            except RhrTransientError as e:
+                if attempt == self.retries:
+                    raise
+                stats.retries += 1
+                backoff = settings.rhr_retry_base_seconds * 2**attempt
+                await asyncio.sleep(max(e.retry_after or 0.0, backoff * random.uniform(0.5, 1)))
+                continue
+            if data is not None and self.cache is not None:
+                self.cache.put(endpoint, url, data)
+            return data
+        return None
+
+    async def _attempt(self, endpoint: str, url: str, stats: EndpointStats) -> dict | None:
+        """One request, reported to the adaptive limit; raises RhrTransientError."""
+        ticket = await self.concurrency.acquire() if self.concurrency is not None else 0
+        outcome, retry_after = "failed", None
+        started = time.perf_counter()
+        try:
+            if self.limiter is not None:
+                await self.limiter.acquire()
+            started = time.perf_counter()
+            deadline = ENDPOINT_TIMEOUTS.get(endpoint, DEFAULT_TIMEOUT)
+            try:
+                # httpx's own timeouts (5 s unless the client sets them) would
+                # otherwise fire before the endpoint's deadline
+                async with asyncio.timeout(deadline):
+                    resp = await self.client.get(url, timeout=deadline)
+            except TimeoutError:
+                outcome = "throttled"
+                raise RhrTransientError(f"{endpoint} timed out") from None
+            except httpx.TimeoutException as e:
+                # httpx's own connect/read/pool timeouts mean the same: RHR is slow
+                outcome = "throttled"
+                raise RhrTransientError(f"{endpoint} timed out ({type(e).__name__})") from e
+            except httpx.TransportError as e:
+                raise RhrTransientError(f"{endpoint}: {type(e).__name__}") from e
+
+            if resp.status_code in THROTTLE_STATUSES:
+                outcome = "throttled"
+                retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+                raise RhrTransientError(f"{endpoint}: HTTP {resp.status_code}", retry_after)
+            if resp.status_code >= 500:
+                raise RhrTransientError(f"{endpoint}: HTTP {resp.status_code}")
+            # Answered: a 404 or an unreadable body is final, not a reason to slow down
+            outcome = "empty"
+            if resp.status_code == 200:
+                try:
+                    data = resp.json()
+                except ValueError:
+                    return None
+                outcome = "succeeded"
+                return data
+            return None
+        finally:
+            latency_ms = (time.perf_counter() - started) * 1000
+            stats.samples.append(latency_ms)
+            if outcome != "succeeded":
+                stats.failures += 1
+            if self.concurrency is not None:
+                if outcome in ("succeeded", "empty"):
+                    self.concurrency.succeeded(ticket, latency_ms)
+                elif outcome == "throttled":
+                    self.concurrency.throttled(ticket, retry_after)
+                else:
+                    self.concurrency.failed(ticket)
+
+    async def latest_version(self, rhr_id: str, fresh: bool = False) -> dict | None:
+        return await self.get(
+            "latest-version", f"/procurement/{rhr_id}/latest-version", fresh=fresh
+        )
+
+    async def general_info(self, version_id: str | int) -> dict | None:
+        return await self.get("general-info", f"/proc-vers/{version_id}/general-info")
+
+    async def additional_data(self, version_id: str | int) -> dict | None:
+        return await self.get("additional-data", f"/proc-vers/{version_id}/additional-data")
+
+    def latency_summary(self) -> dict[str, dict]:
+        """Per-endpoint call counts, failures and latency percentiles."""
+        return {name: stats.summary() for name, stats in self.stats.items()}
+
+    def concurrency_summary(self) -> dict:
+        """Final and peak adaptive limit, throttles seen (empty when fixed)."""
+        return self.concurrency.summary() if self.concurrency is not None else {}
+
+    def cache_summary(self) -> dict[str, dict]:
+        """Per-endpoint response cache hit ratios (empty when uncached)."""
+        return self.cache.summary() if self.cache is not None else {}
@@ -0,0 +1,151 @@
+"""CPV -> trade mappings stored in `trade_cpv_mappings`.
+
+The table is the source of truth: it is seeded from `seed.TRADE_CPV_SEEDS`
+only while empty, and edited in place afterwards. Each process keeps one
+compiled CpvTagger together with the table's version stamp (an md5 over the
+sorted mappings) and rebuilds it only when the stamp moves. `retag_procurements`
+applies a mapping change to every stored row inside Postgres.
+"""
+
+import time
+
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from hanke_radar.db.engine import async_session
+from hanke_radar.db.models import ScrapeRun, TradeCpvMapping
+from hanke_radar.db.schema import ensure_schema
+from hanke_radar.db.seed import TRADE_CPV_SEEDS
+from hanke_radar.db.summary import refresh_summary
+from hanke_radar.scraper.cpv_filter import CPV_WHITESPACE, TRADE_RELEVANT_DIVISIONS, CpvTagger
+
+# COLLATE "C" keeps the order independent of the database locale
+_VERSION = text("""
+    SELECT md5(coalesce(string_agg(cpv_prefix || '=' || trade_key, ','
+                                   ORDER BY cpv_prefix COLLATE "C", trade_key COLLATE "C"), ''))
+    FROM trade_cpv_mappings
+""")
+
+# Same rules as CpvTagger, set-wise: codes are trimmed of CPV_WHITESPACE (bound as
+# :whitespace; a bare btrim would only strip spaces), split into their prefixes
+# (one row per length) and hash-joined against the mappings; relevant codes
+# without a match get 'general'; tags are the sorted union over the codes.
+_RETAG = text("""
+    WITH codes AS (
+        SELECT p.id, btrim(split_part(btrim(c.code, :whitespace), '-', 1), :whitespace) AS code
+        FROM procurements AS p
+        CROSS JOIN LATERAL unnest(
+            array_prepend(p.cpv_primary, coalesce(p.cpv_additional, '{}'))
+        ) AS c(code)
+        WHERE c.code <> ''
+    ),
+    matches AS (
+        SELECT c.id, c.code, m.trade_key
+        FROM codes AS c
+        CROSS JOIN LATERAL generate_series(0, length(c.code)) AS l(len)
+        JOIN trade_cpv_mappings AS m ON m.cpv_prefix = left(c.code, l.len)
+    ),
+    code_tags AS (
+        SELECT id, trade_key FROM matches
+        UNION
+        SELECT c.id, 'general'
+        FROM codes AS c
+        WHERE left(c.code, 2) = ANY(:divisions)
+          AND NOT EXISTS (SELECT 1 FROM matches AS x WHERE x.id = c.id AND x.code = c.code)
+    ),
+    new_tags AS (
+        SELECT p.id,
+               coalesce(
+                   array_agg(DISTINCT t.trade_key COLLATE "C" ORDER BY t.trade_key COLLATE "C")
+                   FILTER (WHERE t.trade_key IS NOT NULL),
+                   '{}'
+               ) AS tags
+        FROM procurements AS p
+        LEFT JOIN code_tags AS t ON t.id = p.id
+        GROUP BY p.id
+    )
+    UPDATE procurements AS p
+    SET trade_tags = n.tags, updated_at = now()
+    FROM new_tags AS n
+    WHERE p.id = n.id AND p.trade_tags IS DISTINCT FROM n.tags
+""")
+
+# (version stamp, tagger) for this process
+_cached: tuple[str, CpvTagger] | None = None
+
+
+def retag_params() -> dict:
+    """Bind parameters for `_RETAG`, taken from the Python tagger's rules."""
+    return {"divisions": sorted(TRADE_RELEVANT_DIVISIONS), "whitespace": CPV_WHITESPACE}
+
+
+async def seed_trade_mappings(session: AsyncSession) -> int:
+    """Insert the seed mappings if the table is empty; returns rows added.
+
+    Processes that find the table empty at the same time both insert; the
+    unique (cpv_prefix, trade_key) index makes the later ones no-ops.
+    """
+    if await session.scalar(select(func.count()).select_from(TradeCpvMapping)):
+        return 0
+    result = await session.execute(
+        pg_insert(TradeCpvMapping)
+        .values(TRADE_CPV_SEEDS)
+        .on_conflict_do_nothing(index_elements=["cpv_prefix", "trade_key"])
+    )
+    await session.commit()
+    return result.rowcount
+
+
+async def mappings_version(session: AsyncSession) -> str:
+    """Version stamp of the current mappings; changes whenever any row does."""
+    return await session.scalar(_VERSION)
+
+
+async def load_tagger(session: AsyncSession) -> CpvTagger:
+    """The tagger for the mappings in the DB, rebuilt only if they changed."""
+    global _cached
+    version = await mappings_version(session)
+    if _cached is None or _cached[0] != version:
+        rows = (await session.execute(
+            select(TradeCpvMapping.cpv_prefix, TradeCpvMapping.trade_key)
+        )).all()
+        tagger = CpvTagger({"cpv_prefix": prefix, "trade_key": key} for prefix, key in rows)
+        _cached = (version, tagger)
+    return _cached[1]
+
+
+async def retag_procurements(verbose: bool = True) -> dict:
+    """Recompute trade_tags for every procurement from the current mappings.
+
+    One UPDATE inside Postgres; only rows whose tags change are written.
+    Returns a summary dict.
+    """
+    if async_session is None:
+        raise RuntimeError("DATABASE_URL not configured")
+
+    start_time = time.monotonic()
+    async with async_session() as session:
+        await ensure_schema(session)
+        await seed_trade_mappings(session)
+
+        run = ScrapeRun(run_type="retag")
+        session.add(run)
+        await session.commit()
+
+        version = await mappings_version(session)
+        result = await session.execute(_RETAG, retag_params())
+        updated = result.rowcount
+        if updated:
+            await refresh_summary(session)
+        duration_ms = int((time.monotonic() - start_time) * 1000)
+
+        run.notices_stored = updated
+        run.duration_ms = duration_ms
+        run.data_changed = updated > 0
+        run.status = "completed"
+        await session.commit()
+
+    if verbose:
+        print(f"Retagged {updated} procurements (mappings {version[:8]}) in {duration_ms}ms")
+    return {"updated": updated, "version": version, "duration_ms": duration_ms}
@@ -4,12 +4,16 @@ XML format: eForms UBL (EU standard)
 Root: <OPEN-DATA> containing <ContractNotice> elements
 """
 
+import os
 import re
-from dataclasses import dataclass, field
+from collections.abc import Container, Iterable, Iterator
+from dataclasses import dataclass, field, fields
 from datetime import datetime
 
 from lxml import etree
 
+from hanke_radar.scraper.cpv_filter import is_trade_relevant
+
 # XML namespaces used in the eForms UBL format
 NS = {
     "cac": "urn:oasis:names:specification:ubl:schema:xsd:CommonAggregateComponents-2",
@@ -35,6 +39,22 @@ ACTIVE_TENDER_SUBTYPES = {
     "16", "17", "18", "19", "20",           # Above threshold, utilities, defence
 }
 
+# Top-level notice elements we extract procurements from.
+# PriorInformationNotice subtypes 2,4 are "call for competition" — biddable.
+PARSEABLE_TAGS = {"ContractNotice", "PriorInformationNotice"}
+
+# Every eForms document type that can appear directly under <OPEN-DATA>.
+# The streaming parser only reports these, so award notices are cleared too.
+_NOTICE_TAG_FILTER = (
+    "{*}ContractNotice",
+    "{*}PriorInformationNotice",
+    "{*}ContractAwardNotice",
+    "{*}BusinessRegistrationInformationNotice",
+)
+
+# Read size when streaming a dump from disk
+STREAM_CHUNK_SIZE = 1024 * 1024
+
 
 @dataclass
 class ParsedProcurement:
@@ -61,6 +81,29 @@ class ParsedProcurement:
     source_url: str = ""
 
 
+@dataclass
+class ParseStats:
+    """Counters collected while streaming a bulk dump."""
+
+    found: int = 0  # notices with a notice id
+    skipped_inactive: int = 0  # prefilter: subtype not in ACTIVE_TENDER_SUBTYPES
+    skipped_irrelevant: int = 0  # prefilter: no CPV code in a trade-relevant division
+    skipped_known: int = 0  # notice_id already ingested (incremental runs)
+
+    @property
+    def skipped(self) -> int:
+        return self.skipped_inactive + self.skipped_irrelevant + self.skipped_known
+
+
+@dataclass
+class NoticePeek:
+    """The few fields needed to decide whether a notice is worth parsing."""
+
+    notice_id: str = ""
+    notice_subtype: str = ""
+    cpv_codes: list[str] = field(default_factory=list)
+
+
 def _text(element: etree._Element | None) -> str:
     """Safely extract text from an XML element."""
     if element is None:
@@ -86,64 +129,119 @@ def _parse_date(date_str: str, time_str: str = "") -> datetime | None:
         return None
 
 
+def _q(prefix: str, local: str) -> str:
+    """Clark-notation tag for a namespaced eForms element."""
+    return f"{{{NS[prefix]}}}{local}"
+
+
+# Tags read by parse_notice(). The notice subtree is walked once, filtered to
+# these tags in C, and each field keeps the first element that qualifies.
+_ID = _q("cbc", "ID")
+_CONTRACT_FOLDER_ID = _q("cbc", "ContractFolderID")
+_SUBTYPE_CODE = _q("cbc", "SubTypeCode")
+_NAME = _q("cbc", "Name")
+_DESCRIPTION = _q("cbc", "Description")
+_ITEM_CLASSIFICATION_CODE = _q("cbc", "ItemClassificationCode")
+_PROCEDURE_CODE = _q("cbc", "ProcedureCode")
+_COMPANY = _q("efac", "Company")
+_COUNTRY_SUBENTITY_CODE = _q("cbc", "CountrySubentityCode")
+_ESTIMATED_AMOUNT = _q("cbc", "EstimatedOverallContractAmount")
+_DEADLINE_PERIOD = _q("cac", "TenderSubmissionDeadlinePeriod")
+_ISSUE_DATE = _q("cbc", "IssueDate")
+_DURATION_MEASURE = _q("cbc", "DurationMeasure")
+_URI = _q("cbc", "URI")
+
+_NOTICE_SUBTYPE = _q("efac", "NoticeSubType")
+_PROCUREMENT_PROJECT = _q("cac", "ProcurementProject")
+_ORGANIZATION = _q("efac", "Organization")
+_PLANNED_PERIOD = _q("cac", "PlannedPeriod")
+_CALL_FOR_TENDERS_DOC_REF = _q("cac", "CallForTendersDocumentReference")
+
+_FIELD_TAGS = (
+    _ID, _CONTRACT_FOLDER_ID, _SUBTYPE_CODE, _NAME, _DESCRIPTION, _ITEM_CLASSIFICATION_CODE,
+    _PROCEDURE_CODE, _COMPANY, _COUNTRY_SUBENTITY_CODE, _ESTIMATED_AMOUNT, _DEADLINE_PERIOD,
+    _ISSUE_DATE, _DURATION_MEASURE, _URI,
+)
+
+# How parse_notice() treats each tag: (field key, required parent tag or None).
+# A field keeps the first element in document order that qualifies.
+_FIRST_MATCH = {
+    _CONTRACT_FOLDER_ID: ("folder_id", None),
+    _PROCEDURE_CODE: ("procedure", None),
+    _ESTIMATED_AMOUNT: ("amount", None),
+    _DEADLINE_PERIOD: ("deadline", None),
+    _ISSUE_DATE: ("issue_date", None),
+    _SUBTYPE_CODE: ("subtype", _NOTICE_SUBTYPE),
+    _NAME: ("title", _PROCUREMENT_PROJECT),
+    _DESCRIPTION: ("description", _PROCUREMENT_PROJECT),
+    _COMPANY: ("company", _ORGANIZATION),
+    _DURATION_MEASURE: ("duration", _PLANNED_PERIOD),
+}
+
+_RHR_ID_RE = re.compile(r"/procurement/(\d+)/")
+
+
 def parse_notice(notice_el: etree._Element) -> ParsedProcurement:
-    """Parse a single <ContractNotice> element into a ParsedProcurement."""
-    p = ParsedProcurement()
-
-    # Notice ID (UUID)
-    notice_id_el = notice_el.find('.//cbc:ID[@schemeName="notice-id"]', NS)
-    p.notice_id = _text(notice_id_el)
-
-    # Procurement folder ID
-    folder_id_el = notice_el.find(".//cbc:ContractFolderID", NS)
-    p.procurement_id = _text(folder_id_el)
-
-    # Notice subtype
-    subtype_el = notice_el.find(".//efac:NoticeSubType/cbc:SubTypeCode", NS)
-    p.notice_subtype = _text(subtype_el)
-
-    # Title — from first ProcurementProject
-    title_el = notice_el.find(".//cac:ProcurementProject/cbc:Name", NS)
-    p.title = _text(title_el)
-
-    # Description
-    desc_el = notice_el.find(".//cac:ProcurementProject/cbc:Description", NS)
-    p.description = _text(desc_el)
-
-    # CPV codes — collect all unique ItemClassificationCode values
-    cpv_elements = notice_el.findall(".//cbc:ItemClassificationCode", NS)
-    seen_cpvs: list[str] = []
-    for cpv_el in cpv_elements:
-        code = _text(cpv_el)
-        if code and code not in seen_cpvs:
-            seen_cpvs.append(code)
-    if seen_cpvs:
-        p.cpv_primary = seen_cpvs[0]
-        p.cpv_additional = seen_cpvs[1:]
-
-    # Procedure type
-    proc_code_el = notice_el.find(".//cbc:ProcedureCode", NS)
-    p.procedure_type = _text(proc_code_el)
-
-    # Contracting authority — first organization (buyer)
-    first_org = notice_el.find(".//efac:Organization/efac:Company", NS)
-    if first_org is not None:
-        org_name_el = first_org.find(".//cac:PartyName/cbc:Name", NS)
-        p.contracting_auth = _text(org_name_el)
-        reg_el = first_org.find(".//cac:PartyLegalEntity/cbc:CompanyID", NS)
-        p.contracting_auth_reg = _text(reg_el)
-
-    # NUTS code — from ProcurementProject address
-    nuts_el = notice_el.find(
-        ".//cac:ProcurementProject//cbc:CountrySubentityCode[@listName='nuts']", NS
+    """Parse a single <ContractNotice> element into a ParsedProcurement.
+
+    Walks the notice subtree once and dispatches on tag, taking the first match
+    for each field in document order (what a `.find(".//...")` per field would
+    return).
+    """
+    found: dict[str, etree._Element] = {}
+    cpv_codes: list[str] = []
+
+    for el in notice_el.iter(*_FIELD_TAGS):
+        tag = el.tag
+        match = _FIRST_MATCH.get(tag)
+        if match is not None:
+            key, parent_tag = match
+            if key not in found and (parent_tag is None or el.getparent().tag == parent_tag):
+                found[key] = el
+        elif tag == _ITEM_CLASSIFICATION_CODE:
+            code = (el.text or "").strip()
+            if code and code not in cpv_codes:
+                cpv_codes.append(code)
+        elif tag == _ID:
+            if "notice_id" not in found and el.get("schemeName") == "notice-id":
+                found["notice_id"] = el
+        elif tag == _COUNTRY_SUBENTITY_CODE:
+            if "any_nuts" not in found:
+                found["any_nuts"] = el
+            if (
+                "nuts" not in found
+                and el.get("listName") == "nuts"
+                and next(el.iterancestors(_PROCUREMENT_PROJECT), None) is not None
+            ):
+                found["nuts"] = el
+        elif tag == _URI:
+            if (
+                "uri" not in found
+                and next(el.iterancestors(_CALL_FOR_TENDERS_DOC_REF), None) is not None
+            ):
+                found["uri"] = el
+
+    p = ParsedProcurement(
+        notice_id=_text(found.get("notice_id")),
+        procurement_id=_text(found.get("folder_id")),
+        notice_subtype=_text(found.get("subtype")),
+        title=_text(found.get("title")),
+        description=_text(found.get("description")),
+        procedure_type=_text(found.get("procedure")),
+        nuts_code=_text(found.get("nuts", found.get("any_nuts"))),
+        publication_date=_parse_date(_text(found.get("issue_date"))),
     )
-    if nuts_el is None:
-        # Fallback: any NUTS code in the document
-        nuts_el = notice_el.find(".//cbc:CountrySubentityCode", NS)
-    p.nuts_code = _text(nuts_el)
 
-    # Estimated value
-    amount_el = notice_el.find(".//cbc:EstimatedOverallContractAmount", NS)
+    if cpv_codes:
+        p.cpv_primary = cpv_codes[0]
+        p.cpv_additional = cpv_codes[1:]
+
+    first_org = found.get("company")
+    if first_org is not None:
+        p.contracting_auth = _text(first_org.find(".//cac:PartyName/cbc:Name", NS))
+        p.contracting_auth_reg = _text(first_org.find(".//cac:PartyLegalEntity/cbc:CompanyID", NS))
+
+    amount_el = found.get("amount")
     if amount_el is not None and amount_el.text:
         try:
             p.estimated_value = float(amount_el.text)
@@ -151,37 +249,25 @@ def parse_notice(notice_el: etree._Element) -> ParsedProcurement:
         except ValueError:
             pass
 
-    # Submission deadline
-    deadline_period = notice_el.find(".//cac:TenderSubmissionDeadlinePeriod", NS)
+    deadline_period = found.get("deadline")
     if deadline_period is not None:
         end_date = _text(deadline_period.find("cbc:EndDate", NS))
         end_time = _text(deadline_period.find("cbc:EndTime", NS))
         p.submission_deadline = _parse_date(end_date, end_time)
 
-    # Publication date
-    issue_date_el = notice_el.find(".//cbc:IssueDate", NS)
-    p.publication_date = _parse_date(_text(issue_date_el))
-
-    # Duration — from PlannedPeriod
-    duration_el = notice_el.find(".//cac:PlannedPeriod/cbc:DurationMeasure", NS)
+    duration_el = found.get("duration")
     if duration_el is not None and duration_el.text:
         try:
             p.duration_months = int(float(duration_el.text))
         except ValueError:
             pass
 
-    # RHR internal ID — extracted from CallForTendersDocumentReference URI
-    # URI format: https://riigihanked.riik.ee/rhr-web/#/procurement/{rhr_id}/documents?group=B
-    doc_uri_el = notice_el.find(
-        ".//cac:CallForTendersDocumentReference//cbc:URI", NS
-    )
-    if doc_uri_el is not None:
-        uri_text = _text(doc_uri_el)
-        rhr_match = re.search(r"/procurement/(\d+)/", uri_text)
+    uri_el = found.get("uri")
+    if uri_el is not None:
+        rhr_match = _RHR_ID_RE.search(_text(uri_el))
         if rhr_match:
             p.rhr_id = rhr_match.group(1)
 
-    # Source URL — prefer RHR integer ID for a working link
     if p.rhr_id:
         p.source_url = (
             f"https://riigihanked.riik.ee/rhr-web/#/procurement/{p.rhr_id}/general-info"
@@ -194,22 +280,59 @@ def parse_notice(notice_el: etree._Element) -> ParsedProcurement:
     return p
 
 
+_PEEK_TAGS = (_ID, _SUBTYPE_CODE, _ITEM_CLASSIFICATION_CODE)
+
+
+def peek_notice(notice_el: etree._Element) -> NoticePeek:
+    """Read only the notice id, subtype and CPV codes of a notice.
+
+    Uses the same first-match rules as parse_notice(), so a notice passes
+    passes_prefilter() exactly when its full parse would pass
+    is_active_tender() and the CPV relevance check.
+    """
+    id_el = subtype_el = None
+    cpv_codes: list[str] = []
+    for el in notice_el.iter(*_PEEK_TAGS):
+        tag = el.tag
+        if tag == _ITEM_CLASSIFICATION_CODE:
+            code = (el.text or "").strip()
+            if code and code not in cpv_codes:
+                cpv_codes.append(code)
+        elif tag == _SUBTYPE_CODE:
+            if subtype_el is None and el.getparent().tag == _NOTICE_SUBTYPE:
+                subtype_el = el
+        elif id_el is None and el.get("schemeName") == "notice-id":
+            id_el = el
+    return NoticePeek(
+        notice_id=_text(id_el), notice_subtype=_text(subtype_el), cpv_codes=cpv_codes
+    )
+
+
+def passes_prefilter(peek: NoticePeek) -> bool:
+    """Active tender with at least one trade-relevant CPV code."""
+    return peek.notice_subtype in ACTIVE_TENDER_SUBTYPES and any(
+        is_trade_relevant(cpv) for cpv in peek.cpv_codes
+    )
+
+
+def _local_tag(tag: str) -> str:
+    """Strip the namespace from a Clark-notation tag."""
+    return tag.split("}")[-1] if "}" in tag else tag
+
+
 def parse_bulk_xml(xml_content: bytes) -> list[ParsedProcurement]:
     """Parse a full month's bulk XML dump and return all notices.
 
-    Uses full in-memory parsing (lxml). A typical month is ~36MB / ~950 notices,
-    which is fine for memory. Returns ALL notices, not just trade-relevant ones
-    — filtering is done by the caller.
+    Uses full in-memory parsing (lxml). Fine for a typical month (~36MB / ~950
+    notices), but the whole tree stays in memory — prefer iter_bulk_xml() for
+    large dumps. Returns ALL notices, not just trade-relevant ones — filtering
+    is done by the caller.
     """
     root = etree.fromstring(xml_content)
     results = []
 
-    # Parse ContractNotice and PriorInformationNotice elements.
-    # PriorInformationNotice subtypes 2,4 are "call for competition" — biddable.
-    PARSEABLE_TAGS = {"ContractNotice", "PriorInformationNotice"}
     for child in root:
-        tag = child.tag.split("}")[-1] if "}" in child.tag else child.tag
-        if tag in PARSEABLE_TAGS:
+        if _local_tag(child.tag) in PARSEABLE_TAGS:
             parsed = parse_notice(child)
             if parsed.notice_id:
                 results.append(parsed)
@@ -217,6 +340,139 @@ def parse_bulk_xml(xml_content: bytes) -> list[ParsedProcurement]:
     return results
 
 
+class NoticeFeedParser:
+    """Incremental bulk XML parser: feed bytes in, get finished notices out.
+
+    Each top-level notice is parsed as soon as its closing tag arrives and is
+    then cleared from the tree together with any preceding siblings, so memory
+    stays bounded by the largest single notice rather than the whole dump.
+
+    With `prefilter=True`, notices are peeked first and only active tenders
+    with a trade-relevant CPV code are fully parsed; the rest are counted in
+    `stats` and dropped. Notices whose id is in `known_ids` are dropped the
+    same way, so incremental runs only parse what is new.
+    """
+
+    def __init__(
+        self,
+        prefilter: bool = False,
+        stats: ParseStats | None = None,
+        known_ids: Container[str] = frozenset(),
+    ) -> None:
+        self._parser = etree.XMLPullParser(events=("end",), tag=_NOTICE_TAG_FILTER)
+        self.prefilter = prefilter
+        self.known_ids = known_ids
+        self._peek = prefilter or bool(known_ids)
+        self.stats = stats if stats is not None else ParseStats()
+
+    def feed(self, data: bytes) -> list[ParsedProcurement]:
+        """Feed a chunk of XML and return the notices it completed."""
+        self._parser.feed(data)
+        return self._drain()
+
+    def close(self) -> list[ParsedProcurement]:
+        """Signal end of input and return any remaining notices."""
+        self._parser.close()
+        return self._drain()
+
+    def _drain(self) -> list[ParsedProcurement]:
+        results = []
+        for _event, el in self._parser.read_events():
+            parent = el.getparent()
+            # Only direct children of <OPEN-DATA> are notices
+            if parent is None or parent.getparent() is not None:
+                continue
+            if _local_tag(el.tag) in PARSEABLE_TAGS:
+                parsed = self._parse(el)
+                if parsed is not None:
+                    results.append(parsed)
+            el.clear()
+            while el.getprevious() is not None:
+                del parent[0]
+        return results
+
+    def _parse(self, notice_el: etree._Element) -> ParsedProcurement | None:
+        if self._peek:
+            peek = peek_notice(notice_el)
+            if not peek.notice_id:
+                return None
+            self.stats.found += 1
+            if self.prefilter:
+                if peek.notice_subtype not in ACTIVE_TENDER_SUBTYPES:
+                    self.stats.skipped_inactive += 1
+                    return None
+                if not passes_prefilter(peek):
+                    self.stats.skipped_irrelevant += 1
+                    return None
+            if peek.notice_id in self.known_ids:
+                self.stats.skipped_known += 1
+                return None
+
+        parsed = parse_notice(notice_el)
+        if not parsed.notice_id:
+            return None
+        if not self._peek:
+            self.stats.found += 1
+        return parsed
+
+
+def _iter_file_chunks(path: str | os.PathLike) -> Iterator[bytes]:
+    with open(path, "rb") as f:
+        while chunk := f.read(STREAM_CHUNK_SIZE):
+            yield chunk
+
+
+def iter_bulk_xml(
+    source: str | os.PathLike | Iterable[bytes],
+    prefilter: bool = False,
+    stats: ParseStats | None = None,
+    known_ids: Container[str] = frozenset(),
+) -> Iterator[ParsedProcurement]:
+    """Stream notices from a bulk XML dump one at a time.
+
+    `source` is either a file path or an iterable of byte chunks (e.g. an HTTP
+    response body). Yields the same notices as parse_bulk_xml(), in document
+    order, with peak memory independent of the dump size. See NoticeFeedParser
+    for `prefilter` and `known_ids`; counts are accumulated into `stats` if given.
+    """
+    chunks = _iter_file_chunks(source) if isinstance(source, (str, os.PathLike)) else source
+    parser = NoticeFeedParser(prefilter=prefilter, stats=stats, known_ids=known_ids)
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.close()
+
+
+# Field order of the compact tuple form used to ship notices between processes
+_RECORD_FIELDS = tuple(f.name for f in fields(ParsedProcurement))
+
+
+def to_record(p: ParsedProcurement) -> tuple:
+    """Flatten a ParsedProcurement into a plain tuple (cheap to pickle)."""
+    return tuple(getattr(p, name) for name in _RECORD_FIELDS)
+
+
+def from_record(record: tuple) -> ParsedProcurement:
+    """Inverse of to_record()."""
+    return ParsedProcurement(*record)
+
+
+def parse_dump_file(
+    path: str | os.PathLike,
+    prefilter: bool = True,
+    known_ids: Container[str] = frozenset(),
+) -> tuple[ParseStats, list[tuple]]:
+    """Parse a whole dump file into compact records.
+
+    Entry point for process-pool workers: takes a path instead of bytes so
+    the dump never crosses the process boundary, and returns tuples rather
+    than dataclasses to keep the result pickle small.
+    """
+    stats = ParseStats()
+    notices = iter_bulk_xml(path, prefilter=prefilter, stats=stats, known_ids=known_ids)
+    records = [to_record(p) for p in notices]
+    return stats, records
+
+
 def is_active_tender(procurement: ParsedProcurement) -> bool:
     """Check if a procurement is an active/biddable tender.
 
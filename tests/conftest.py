@@ -0,0 +1,139 @@
+"""Shared test doubles and fixtures.
+
+Unit tests run against `FakeSession`, which records statements and answers
+them from canned rows; they check what the code sends (including the compiled
+SQL) and what it does with the answers. Behaviour that depends on the
+database (upserts, locking, SQL that mirrors Python rules) is also tested
+against a real one through `pg_engine`, which is skipped unless
+HANKE_TEST_DATABASE_URL points at a throwaway database:
+
+    HANKE_TEST_DATABASE_URL=postgresql://localhost/hanke_test uv run pytest tests/
+
+The Tests workflow provides one. It also sets HANKE_REQUIRE_TEST_DB, which
+turns those skips into failures so the DB tests can't silently stop running.
+"""
+
+import os
+from collections.abc import Callable
+from contextlib import asynccontextmanager
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from hanke_radar.db.engine import _convert_neon_url
+from hanke_radar.db.schema import apply_schema
+
+TEST_DATABASE_URL = os.environ.get("HANKE_TEST_DATABASE_URL", "")
+TEST_SCHEMA = "hanke_test"
+REQUIRE_TEST_DB = bool(os.environ.get("HANKE_REQUIRE_TEST_DB"))
+
+
+def skip_without_db() -> None:
+    """Skip the calling test when no test DB is configured (fail if one is required)."""
+    if TEST_DATABASE_URL:
+        return
+    if REQUIRE_TEST_DB:
+        pytest.fail("HANKE_REQUIRE_TEST_DB is set but HANKE_TEST_DATABASE_URL is not")
+    pytest.skip("HANKE_TEST_DATABASE_URL not set")
+
+
+def literal_sql(stmt) -> str:
+    """`stmt` compiled for Postgres with its parameters inlined."""
+    return str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+class FakeResult:
+    """The parts of a SQLAlchemy Result the code under test reads."""
+
+    def __init__(self, rows):
+        self._rows = list(rows)
+        self.rowcount = len(self._rows)
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return self._rows
+
+    def first(self):
+        return self._rows[0] if self._rows else None
+
+    def scalar(self):
+        return self.first()
+
+
+class FakeSession:
+    """Stand-in for AsyncSession.
+
+    Every executed statement is recorded in `statements` and answered with
+    `respond(stmt)` if given, else with `rows`. Statements run inside a
+    `begin_nested()` block that raises are dropped, like a savepoint
+    rollback. Added objects and commits are recorded too.
+    """
+
+    def __init__(self, rows=(), respond: Callable[[object], list] | None = None):
+        self.rows = list(rows)
+        self.respond = respond
+        self.statements: list = []
+        self.params: list = []
+        self.added: list = []
+        self.savepoints = 0
+        self.commits = 0
+
+    @property
+    def sql(self) -> list[str]:
+        return [literal_sql(stmt) for stmt in self.statements]
+
+    def _answer(self, stmt, params) -> FakeResult:
+        self.statements.append(stmt)
+        self.params.append(params)
+        return FakeResult(self.respond(stmt) if self.respond else self.rows)
+
+    async def execute(self, stmt, params=None):
+        return self._answer(stmt, params)
+
+    async def scalar(self, stmt, params=None):
+        return self._answer(stmt, params).scalar()
+
+    def add(self, obj):
+        self.added.append(obj)
+
+    def add_all(self, objs):
+        self.added.extend(objs)
+
+    async def commit(self):
+        self.commits += 1
+
+    @asynccontextmanager
+    async def begin_nested(self):
+        self.savepoints += 1
+        mark = len(self.statements)
+        try:
+            yield
+        except Exception:
+            del self.statements[mark:]
+            del self.params[mark:]
+            raise
+
+
+@pytest.fixture
+async def pg_engine():
+    """Engine on a fresh scratch schema with every table created; dropped afterwards."""
+    skip_without_db()
+    engine = create_async_engine(
+        _convert_neon_url(TEST_DATABASE_URL),
+        poolclass=NullPool,
+        connect_args={"server_settings": {"search_path": TEST_SCHEMA}},
+    )
+    async with engine.begin() as conn:
+        await conn.execute(text(f"DROP SCHEMA IF EXISTS {TEST_SCHEMA} CASCADE"))
+        await conn.execute(text(f"CREATE SCHEMA {TEST_SCHEMA}"))
+    async with AsyncSession(engine) as session:
+        await apply_schema(session)
+    yield engine
+    async with engine.begin() as conn:
+        await conn.execute(text(f"DROP SCHEMA IF EXISTS {TEST_SCHEMA} CASCADE"))
+    await engine.dispose()
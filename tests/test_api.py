@@ -1,11 +1,39 @@
-"""Tests for the FastAPI API endpoints (using TestClient, no DB)."""
+"""Tests for the FastAPI API endpoints.
 
+Most use TestClient with the shared FakeSession; paging order is checked
+against Postgres (see conftest.pg_engine).
+"""
+
+from collections import namedtuple
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+
+import httpx
 from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import asyncpg
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from hanke_radar.api import routes
 from hanke_radar.api.app import app
+from hanke_radar.api.cache import ApiResponseCache
+from hanke_radar.api.routes import (
+    COMPACT_FIELDS,
+    ITEM_COLUMNS,
+    ITEM_FIELDS,
+    decode_cursor,
+    encode_cursor,
+    filter_procurements,
+)
+from hanke_radar.db.engine import get_session
+from hanke_radar.db.models import Procurement
+from tests.conftest import FakeSession, literal_sql
 
 client = TestClient(app)
 
+# Stands in for the Core rows the routes select
+_Item = namedtuple("_Item", list(ITEM_FIELDS), defaults=[None] * len(ITEM_FIELDS))
+
 
 def test_health_endpoint():
     response = client.get("/health")
@@ -13,3 +41,248 @@ def test_health_endpoint():
     data = response.json()
     assert data["status"] == "ok"
     assert data["service"] == "hanke-radar"
+
+
+def _list_session(rows) -> FakeSession:
+    """Serves `rows` (already in list order), honouring LIMIT, and counts them."""
+
+    def respond(stmt):
+        sql = literal_sql(stmt)
+        if "count(*)" in sql:
+            return [len(rows)]
+        if "LIMIT" not in sql:
+            return rows
+        return rows[:int(sql.rsplit("LIMIT ", 1)[1].split()[0])]
+
+    return FakeSession(respond=respond)
+
+
+def _rows(n: int) -> list[_Item]:
+    start = datetime(2026, 3, 1, tzinfo=UTC)
+    return [
+        _Item(id=1000 - i, notice_id=f"n{i}", title="t", contracting_auth="a",
+              publication_date=start - timedelta(hours=i))
+        for i in range(n)
+    ]
+
+
+def _selected(sql: str) -> set[str]:
+    """Column names in a compiled SELECT list."""
+    columns = sql.split("FROM", 1)[0].removeprefix("SELECT").split(",")
+    return {c.strip().removeprefix("procurements.") for c in columns}
+
+
+def _list(session: FakeSession, **params):
+    app.dependency_overrides[get_session] = lambda: session
+    try:
+        return client.get("/procurements", params=params)
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_first_page_counts_and_returns_cursor():
+    session = _list_session(_rows(3))
+    data = _list(session, per_page=2).json()
+
+    assert data["total"] == 3
+    assert [item["id"] for item in data["items"]] == [1000, 999]
+    assert decode_cursor(data["next_cursor"]) == (datetime(2026, 2, 28, 23, tzinfo=UTC), 999)
+    assert "NULLS LAST" in session.sql[-1]
+
+
+def test_list_reads_only_serialized_columns():
+    session = _list_session([_Item(id=1, notice_id="n1", title="t", contracting_auth="a",
+                                  estimated_value=Decimal("1500.50"),
+                                  publication_date=datetime(2026, 3, 1, 12, tzinfo=UTC))])
+    item = _list(session).json()["items"][0]
+
+    assert item["estimated_value"] == 1500.5
+    assert item["publication_date"] == "2026-03-01T12:00:00+00:00"
+    assert list(item) == [c.key for c in ITEM_COLUMNS]
+    assert not any("raw_html" in sql for sql in session.sql)
+
+
+def test_compact_view_reads_and_returns_only_list_fields():
+    rows = [r._replace(description_snippet="Torustiku remont…") for r in _rows(3)]
+    session = _list_session(rows)
+    data = _list(session, view="compact", per_page=2).json()
+
+    assert list(data["items"][0]) == list(COMPACT_FIELDS)
+    assert data["items"][0]["description_snippet"] == "Torustiku remont…"
+    assert data["next_cursor"] == encode_cursor(rows[1])
+    # publication_date is read for the cursor but not returned
+    assert _selected(session.sql[-1]) == set(COMPACT_FIELDS) | {"publication_date"}
+
+
+def test_fields_parameter_drives_projection():
+    session = _list_session(_rows(1))
+    data = _list(session, fields="title, id,title").json()
+
+    assert data["items"] == [{"title": "t", "id": 1000}]
+    assert _selected(session.sql[-1]) == {"title", "id", "publication_date"}
+
+
+def test_trade_filter_binds_a_text_array():
+    # Postgres has no text[] @> varchar[] operator; the bound array must be text[]
+    query = filter_procurements(select(Procurement.id), trade="plumbing")
+    compiled = query.compile(dialect=asyncpg.dialect())
+
+    assert "procurements.trade_tags @> $2::TEXT[]" in str(compiled)
+    assert compiled.params["trade"] == ["plumbing"]
+
+
+def test_unknown_fields_are_rejected():
+    response = _list(_list_session([]), fields="title,raw_html")
+    assert response.status_code == 400
+    assert "raw_html" in response.json()["detail"]
+
+
+def test_get_procurement_serializes_core_row():
+    session = _list_session(_rows(1))
+    app.dependency_overrides[get_session] = lambda: session
+    try:
+        response = client.get("/procurements/1000")
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.json()["notice_id"] == "n0"
+    assert len(session.statements) == 1
+    assert "WHERE procurements.id = 1000" in session.sql[0]
+
+
+def test_cursor_page_uses_keyset_range_without_count_or_offset():
+    session = _list_session(_rows(2))
+    cursor = encode_cursor(_rows(1)[0])
+    data = _list(session, cursor=cursor, per_page=5).json()
+
+    assert data["total"] is None and data["page"] is None
+    assert data["next_cursor"] is None
+    assert not any("count(*)" in sql or "OFFSET" in sql for sql in session.sql)
+    assert "(procurements.publication_date, procurements.id) <" in session.sql[0]
+    # The dated range ran short, so the page continues into undated rows
+    assert len(session.statements) == 2
+    assert "publication_date IS NULL" in session.sql[1]
+
+
+def test_invalid_cursor_is_rejected():
+    assert _list(_list_session([]), cursor="not-a-cursor").status_code == 400
+
+
+def test_list_served_from_cache_until_generation_moves(monkeypatch):
+    cache = ApiResponseCache()
+    monkeypatch.setattr(routes, "response_cache", cache)
+    cache.set_generation(7)
+    session = _list_session(_rows(3))
+
+    first = _list(session, per_page=2).json()
+    queries = len(session.sql)
+    assert _list(session, per_page=2).json() == first
+    assert len(session.sql) == queries  # no DB work on a hit
+
+    cache.set_generation(8)
+    _list(session, per_page=2)
+    assert len(session.sql) > queries
+    assert client.get("/cache/stats").json()["generation"] == 8
+
+
+def test_matching_if_none_match_skips_the_query(monkeypatch):
+    cache = ApiResponseCache(max_entries=0)  # nothing cached: only validators can help
+    monkeypatch.setattr(routes, "response_cache", cache)
+    cache.set_generation(7)
+    session = _list_session(_rows(3))
+    app.dependency_overrides[get_session] = lambda: session
+    try:
+        first = client.get("/procurements", params={"per_page": 2})
+        queries = len(session.sql)
+        revalidated = client.get("/procurements", params={"per_page": 2},
+                                 headers={"If-None-Match": first.headers["ETag"]})
+        other_page = client.get("/procurements", params={"per_page": 3},
+                                headers={"If-None-Match": first.headers["ETag"]})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert revalidated.status_code == 304 and revalidated.content == b""
+    assert revalidated.headers["ETag"] == first.headers["ETag"]
+    assert other_page.status_code == 200
+    assert len(session.sql) == queries + 2  # only the other page's count + list
+
+
+def test_missing_procurement_is_404_without_validators(monkeypatch):
+    cache = ApiResponseCache(max_entries=0)
+    monkeypatch.setattr(routes, "response_cache", cache)
+    cache.set_generation(7)
+    session = _list_session([])
+    guessed = cache.etag(("procurement", 999))
+    app.dependency_overrides[get_session] = lambda: session
+    try:
+        response = client.get("/procurements/999", headers={"If-None-Match": guessed})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 404
+    assert response.json() == {"detail": "Procurement not found"}
+    assert "ETag" not in response.headers
+    assert len(session.sql) == 1  # looked up, not answered from the validator
+
+
+def test_existing_procurement_revalidates_after_lookup(monkeypatch):
+    cache = ApiResponseCache(max_entries=0)
+    monkeypatch.setattr(routes, "response_cache", cache)
+    cache.set_generation(7)
+    session = _list_session(_rows(1))
+    app.dependency_overrides[get_session] = lambda: session
+    try:
+        first = client.get("/procurements/1000")
+        revalidated = client.get("/procurements/1000",
+                                 headers={"If-None-Match": first.headers["ETag"]})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert first.status_code == 200 and first.json()["id"] == 1000
+    assert revalidated.status_code == 304 and revalidated.content == b""
+
+
+async def test_cursor_pages_walk_every_row_once_in_order(pg_engine, monkeypatch):
+    monkeypatch.setattr(routes, "response_cache", ApiResponseCache(max_entries=0))
+    start = datetime(2026, 3, 1, tzinfo=UTC)
+    # Ties on publication_date and undated rows are where keyset paging goes wrong
+    dates = [start, start, None, start - timedelta(days=1), None, start + timedelta(days=1),
+             start - timedelta(days=1)]
+    async with AsyncSession(pg_engine) as session:
+        session.add_all(
+            Procurement(notice_id=f"page-{i}", title="t", contracting_auth="a",
+                        status="active", publication_date=date)
+            for i, date in enumerate(dates)
+        )
+        session.add(Procurement(notice_id="page-expired", title="t", contracting_auth="a",
+                                status="expired", publication_date=start))
+        await session.commit()
+        expected = [(date, pid) for pid, date in (await session.execute(
+            select(Procurement.id, Procurement.publication_date)
+            .where(Procurement.status == "active")
+        )).all()]
+
+    async def _session():
+        async with AsyncSession(pg_engine) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = _session
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app),
+                                     base_url="http://test") as api:
+            seen, params = [], {"per_page": 2}
+            while True:
+                data = (await api.get("/procurements", params=params)).json()
+                seen += [item["id"] for item in data["items"]]
+                if data["next_cursor"] is None:
+                    break
+                params = {"per_page": 2, "cursor": data["next_cursor"]}
+            missing = await api.get("/procurements/999999")
+    finally:
+        app.dependency_overrides.clear()
+
+    # publication_date DESC NULLS LAST, id DESC
+    dated = sorted((e for e in expected if e[0] is not None), reverse=True)
+    undated = sorted((e for e in expected if e[0] is None), reverse=True)
+    assert seen == [pid for _, pid in dated + undated]
+    assert missing.status_code == 404
@@ -0,0 +1,129 @@
+"""Tests for the generation-keyed API response cache.
+
+The generation query itself is checked against Postgres (see conftest.pg_engine).
+"""
+
+from datetime import UTC, datetime
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from hanke_radar.api.cache import ApiResponseCache, fetch_generation
+from hanke_radar.db.models import ScrapeRun
+
+
+def test_nothing_cached_before_generation_known():
+    cache = ApiResponseCache()
+    cache.store(("trades",), [], generation=None)
+    assert cache.get(("trades",)) is None
+
+
+def test_hit_returns_encoded_body():
+    cache = ApiResponseCache()
+    cache.set_generation(3)
+    cache.store(("stats",), {"by_status": [{"status": "active", "count": 2}]}, 3)
+
+    response = cache.get(("stats",))
+    assert response.body == b'{"by_status":[{"status":"active","count":2}]}'
+    assert response.media_type == "application/json"
+    assert cache.stats()["hits"] == 1
+
+
+def test_new_generation_drops_entries():
+    cache = ApiResponseCache()
+    cache.set_generation(3)
+    cache.store(("trades",), [], 3)
+    cache.set_generation(4)
+    assert cache.get(("trades",)) is None
+    # computed before the bump: not stored under the new generation
+    cache.store(("trades",), [], 3)
+    assert cache.stats()["entries"] == 0
+
+
+def test_lru_eviction():
+    cache = ApiResponseCache(max_entries=2)
+    cache.set_generation(1)
+    cache.store("a", 1, 1)
+    cache.store("b", 2, 1)
+    cache.get("a")  # b is now least recently used
+    cache.store("c", 3, 1)
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_validators_follow_generation_and_key():
+    cache = ApiResponseCache(max_age=60)
+    assert "ETag" not in cache.store(("stats",), {}, None).headers
+
+    cache.set_generation(5, datetime(2026, 3, 1, 6, 30, 15, 250_000, tzinfo=UTC))
+    response = cache.store(("stats",), {}, 5)
+    assert response.headers["ETag"].startswith('W/"5-')
+    assert response.headers["ETag"] != cache.etag(("trades",))
+    assert response.headers["Last-Modified"] == "Sun, 01 Mar 2026 06:30:15 GMT"
+    assert response.headers["Cache-Control"] == "public, max-age=60"
+
+    cache.set_generation(6)
+    assert cache.etag(("stats",)) != response.headers["ETag"]
+
+
+def test_conditional_get_returns_304_without_entry():
+    cache = ApiResponseCache()
+    cache.set_generation(5, datetime(2026, 3, 1, 6, 30, 15, tzinfo=UTC))
+    etag = cache.etag(("stats",))
+
+    # Validators alone decide; the entry doesn't need to be cached
+    for if_none_match in (etag, f'"x", {etag.removeprefix("W/")}', "*"):
+        response = cache.get(("stats",), {"if-none-match": if_none_match})
+        assert response.status_code == 304 and response.headers["ETag"] == etag
+    assert cache.get(("stats",), {"if-none-match": 'W/"4-abc"'}) is None
+    assert cache.stats()["not_modified"] == 3
+
+
+def test_if_modified_since_used_only_without_if_none_match():
+    cache = ApiResponseCache()
+    cache.set_generation(5, datetime(2026, 3, 1, 6, 30, 15, 900_000, tzinfo=UTC))
+
+    fresh = {"if-modified-since": "Sun, 01 Mar 2026 06:30:15 GMT"}
+    stale = {"if-modified-since": "Sun, 01 Mar 2026 06:30:14 GMT"}
+    assert cache.get("k", fresh).status_code == 304
+    assert cache.get("k", stale) is None
+    assert cache.get("k", {**fresh, "if-none-match": 'W/"4-abc"'}) is None
+    assert cache.get("k", {"if-modified-since": "not a date"}) is None
+
+
+async def test_generation_moves_only_for_runs_that_changed_data(pg_engine):
+    async with AsyncSession(pg_engine) as session:
+        start, _ = await fetch_generation(session)
+        running = ScrapeRun(run_type="bulk_xml")
+        session.add_all([
+            ScrapeRun(run_type="bulk_xml", status="completed", data_changed=True),
+            ScrapeRun(run_type="bulk_xml", status="completed", data_changed=None),
+            running,
+        ])
+        await session.commit()
+        generation, changed_at = await fetch_generation(session)
+        assert generation == start + 2
+        assert changed_at is not None
+
+        # A no-op scrape, an enrich batch that only stamped enriched_at and a
+        # failed scrape that rolled its rows back
+        session.add_all([
+            ScrapeRun(run_type="bulk_xml", status="completed", data_changed=False),
+            ScrapeRun(run_type="notice_html", status="completed", data_changed=False),
+            ScrapeRun(run_type="bulk_xml", status="failed", data_changed=False),
+        ])
+        await session.commit()
+        assert (await fetch_generation(session))[0] == generation
+
+        # Finishing a run that was started earlier still moves it, once
+        running.status = "completed"
+        await session.commit()
+        assert (await fetch_generation(session))[0] == generation + 1
+        running.errors = 1
+        await session.commit()
+        assert (await fetch_generation(session))[0] == generation + 1
+
+        # So does a run that failed after committing some of its rows
+        session.add(ScrapeRun(run_type="notice_html", status="failed", data_changed=True))
+        await session.commit()
+        assert (await fetch_generation(session))[0] == generation + 2
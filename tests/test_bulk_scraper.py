@@ -0,0 +1,350 @@
+"""Tests for the bulk scraper ingest pipeline.
+
+Most run against a local HTTP stand-in and the shared FakeSession; the upsert
+semantics are checked against Postgres (see conftest.pg_engine).
+"""
+
+import asyncio
+from datetime import UTC, datetime
+
+import httpx
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from hanke_radar.db.models import SNIPPET_LENGTH, Procurement, ScrapeRun
+from hanke_radar.scraper import bulk_scraper
+from hanke_radar.scraper.bulk_scraper import (
+    StageTimings,
+    WriteStats,
+    _fetch_dump,
+    _load_known_notice_ids,
+    _produce_streamed,
+    _to_db_dict,
+    _upsert_batch,
+    _write_notices,
+    promote_dump,
+)
+from hanke_radar.scraper.dump_cache import DumpCache
+from hanke_radar.scraper.xml_parser import ParsedProcurement, ParseStats
+from tests.conftest import FakeSession
+from tests.test_xml_parser import _multi_notice_xml
+
+
+def _dump_client(body: bytes, chunk_size: int = 64) -> httpx.AsyncClient:
+    async def _chunks():
+        for i in range(0, len(body), chunk_size):
+            yield body[i:i + chunk_size]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=_chunks())
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+class _DumpServer:
+    """Serves a mutable body, honouring If-None-Match when `etag` is set."""
+
+    def __init__(self, body: bytes, etag: str = ""):
+        self.body = body
+        self.etag = etag
+        self.requests: list[httpx.Request] = []
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        headers = {"ETag": self.etag} if self.etag else {}
+        if self.etag and request.headers.get("If-None-Match") == self.etag:
+            return httpx.Response(304, headers=headers)
+        return httpx.Response(200, content=self.body, headers=headers)
+
+    def client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=httpx.MockTransport(self.handler))
+
+
+async def test_streamed_producer_feeds_queue_incrementally():
+    queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+    stats = ParseStats()
+    timings = StageTimings()
+    received = []
+
+    async def _consume():
+        while len(received) < 3:
+            received.append(await queue.get())
+
+    async with _dump_client(_multi_notice_xml()) as client:
+        consumer = asyncio.create_task(_consume())
+        fetch = await _produce_streamed(client, "http://test/xml", queue, stats, timings)
+        await consumer
+
+    assert fetch.size == len(_multi_notice_xml())
+    assert fetch.cache_status is None
+    assert [n.notice_id for n in received] == ["test-notice-001", "test-notice-002",
+                                               "test-notice-003"]
+    assert stats.found == 3
+    assert timings.parse > 0
+
+
+async def test_writer_batches_and_isolates_bad_rows(monkeypatch):
+    async def _flaky_batch(session, notices, tagger=None):
+        ids = [n.notice_id for n in notices]
+        if "bad" in ids:
+            raise ValueError("boom")
+        await session.execute(ids)
+        return WriteStats(new=len(ids) - 1, changed=1)
+
+    monkeypatch.setattr(bulk_scraper, "_upsert_batch", _flaky_batch)
+    queue: asyncio.Queue = asyncio.Queue()
+    for notice_id in ("a", "bad", "b", "c", "d"):
+        queue.put_nowait(ParsedProcurement(notice_id=notice_id))
+    queue.put_nowait(None)
+
+    session = FakeSession()
+    result = await _write_notices(session, queue, StageTimings(), verbose=False, batch_size=3)
+    assert result == WriteStats(relevant=5, new=1, changed=3, errors=1)
+    assert result.stored == 4
+    # first batch failed and was retried row by row; the second went through whole
+    assert session.statements == [["a"], ["b"], ["c", "d"]]
+    assert session.savepoints == 5
+
+
+async def test_upsert_batch_dedupes_and_updates_from_excluded():
+    # One row inserted, one updated; a third (omitted by RETURNING) was unchanged
+    session = FakeSession([True, False])
+    notices = [
+        ParsedProcurement(notice_id="x", title="old"),
+        ParsedProcurement(notice_id="y", title="other"),
+        ParsedProcurement(notice_id="x", title="new"),
+        ParsedProcurement(notice_id="z", title="same"),
+    ]
+    assert await _upsert_batch(session, notices) == WriteStats(new=1, changed=1, unchanged=1)
+
+    (stmt,) = session.statements
+    compiled = stmt.compile(dialect=postgresql.dialect())
+    sql = str(compiled)
+    assert "ON CONFLICT (notice_id) DO UPDATE" in sql
+    assert "title = excluded.title" in sql
+    assert "WHERE procurements.content_hash IS DISTINCT FROM excluded.content_hash" in sql
+    assert "RETURNING xmax = 0" in sql
+    # Only the last copy of a notice repeated within a batch is sent
+    assert "new" in compiled.params.values()
+    assert "old" not in compiled.params.values()
+
+
+async def test_upsert_batch_rewrites_only_changed_rows(pg_engine):
+    async with AsyncSession(pg_engine) as session:
+        first = [
+            ParsedProcurement(notice_id="x", title="Remont", contracting_auth="Vald"),
+            ParsedProcurement(notice_id="y", title="Torustik", contracting_auth="Linn"),
+        ]
+        assert await _upsert_batch(session, first) == WriteStats(new=2)
+        await session.commit()
+        stamps = dict((await session.execute(
+            select(Procurement.notice_id, Procurement.updated_at)
+        )).all())
+
+        second = [
+            ParsedProcurement(notice_id="x", title="Remont", contracting_auth="Vallavalitsus",
+                              cpv_primary="45330000-9"),
+            first[1],
+        ]
+        assert await _upsert_batch(session, second) == WriteStats(changed=1, unchanged=1)
+        await session.commit()
+        rows = {r.notice_id: r for r in (await session.execute(
+            select(Procurement.notice_id, Procurement.contracting_auth, Procurement.cpv_primary,
+                   Procurement.trade_tags, Procurement.updated_at)
+        )).all()}
+
+    # Every hashed column follows a changed notice; an unchanged one is not touched
+    assert rows["x"].contracting_auth == "Vallavalitsus"
+    assert rows["x"].cpv_primary == "45330000-9"
+    assert rows["x"].trade_tags == _to_db_dict(second[0])["trade_tags"]
+    assert rows["x"].updated_at > stamps["x"]
+    assert rows["y"].updated_at == stamps["y"]
+
+
+async def test_failed_scrape_rolls_back_partial_upserts(pg_engine, monkeypatch):
+    stored = asyncio.Event()
+    upsert = bulk_scraper._upsert_batch
+
+    async def _upsert_and_signal(session, notices, tagger=None):
+        result = await upsert(session, notices, tagger)
+        stored.set()
+        return result
+
+    async def _dies_mid_dump(client, url, queue, *args):
+        await queue.put(ParsedProcurement(notice_id="partial", title="Remont"))
+        await stored.wait()
+        raise httpx.ReadError("connection reset")
+
+    monkeypatch.setattr(bulk_scraper, "async_session",
+                        async_sessionmaker(pg_engine, expire_on_commit=False))
+    monkeypatch.setattr(bulk_scraper, "_upsert_batch", _upsert_and_signal)
+    monkeypatch.setattr(bulk_scraper, "_produce_streamed", _dies_mid_dump)
+    monkeypatch.setattr(bulk_scraper.settings, "upsert_batch_size", 1)
+    monkeypatch.setattr(bulk_scraper.settings, "dump_cache_dir", "")
+
+    with pytest.raises(httpx.ReadError):
+        await bulk_scraper.scrape_month(2025, 1, verbose=False)
+
+    async with AsyncSession(pg_engine) as session:
+        assert (await session.scalars(select(Procurement.notice_id))).all() == []
+        (run,) = (await session.scalars(select(ScrapeRun))).all()
+    assert run.status == "failed"
+    assert run.error_message == "connection reset"
+    assert run.data_changed is False
+
+
+def test_upsert_updates_every_hashed_column():
+    db_dict = _to_db_dict(ParsedProcurement(notice_id="x", title="t", cpv_primary="45330000"))
+    hashed = set(db_dict) - {"content_hash", "description_snippet"}
+
+    derived = {"content_hash", "description_snippet"}
+    assert hashed - {"notice_id"} == set(bulk_scraper._UPSERT_UPDATE_COLUMNS) - derived
+
+
+async def test_known_notice_ids_window_rolls_over_december():
+    session = FakeSession(["a", "b"])
+    assert await _load_known_notice_ids(session, 2025, 12) == {"a", "b"}
+
+    params = session.statements[0].compile().params
+    assert sorted(params.values()) == [datetime(2025, 11, 30, tzinfo=UTC),
+                                       datetime(2026, 1, 2, tzinfo=UTC)]
+
+
+def test_content_hash_tracks_scraped_fields():
+    base = ParsedProcurement(notice_id="x", title="Remont", cpv_primary="45330000",
+                             estimated_value=1000.0)
+    same = ParsedProcurement(notice_id="x", title="Remont", cpv_primary="45330000",
+                             estimated_value=1000.0)
+    changed = ParsedProcurement(notice_id="x", title="Remont", cpv_primary="45330000",
+                                estimated_value=1500.0)
+
+    assert _to_db_dict(base)["content_hash"] == _to_db_dict(same)["content_hash"]
+    assert _to_db_dict(base)["content_hash"] != _to_db_dict(changed)["content_hash"]
+
+
+def test_description_snippet_is_collapsed_and_truncated():
+    long = ParsedProcurement(notice_id="x", title="t", description="Torustik  \n" + "a " * 300)
+    short = ParsedProcurement(notice_id="y", title="t", description=" Väike\tremont ")
+
+    snippet = _to_db_dict(long)["description_snippet"]
+    assert snippet.startswith("Torustik a a")
+    assert len(snippet) == SNIPPET_LENGTH + 1 and snippet.endswith("a…")
+    assert _to_db_dict(short)["description_snippet"] == "Väike remont"
+
+
+async def _drain_produce(
+    server: _DumpServer, cache: DumpCache, stored: bool = True, full: bool = False
+) -> tuple:
+    """Run the producer; `stored` promotes the dump as a committed ingest would."""
+    queue: asyncio.Queue = asyncio.Queue()
+    async with server.client() as client:
+        fetch = await _produce_streamed(
+            client, "http://test/xml", queue, ParseStats(), StageTimings(), cache, "2026-01",
+            full=full,
+        )
+    notices = [queue.get_nowait() for _ in range(queue.qsize())]
+    if stored:
+        promote_dump(cache, "2026-01", fetch)
+    else:
+        cache.discard("2026-01")
+    return fetch, notices
+
+
+async def test_dump_cache_revalidates_with_etag(tmp_path):
+    cache = DumpCache(tmp_path)
+    server = _DumpServer(_multi_notice_xml(), etag='"v1"')
+
+    fetch, notices = await _drain_produce(server, cache)
+    assert fetch.cache_status == "miss"
+    assert fetch.streamed
+    assert len(notices) == 3
+    assert cache.xml_path("2026-01").read_bytes() == _multi_notice_xml()
+
+    fetch, notices = await _drain_produce(server, cache)
+    assert server.requests[-1].headers["If-None-Match"] == '"v1"'
+    assert fetch.cache_status == "hit"
+    assert notices == []
+
+
+async def test_full_run_bypasses_dump_cache(tmp_path):
+    cache = DumpCache(tmp_path)
+    for etag in ('"v1"', ""):  # revalidating server, then one without validators
+        server = _DumpServer(_multi_notice_xml(), etag=etag)
+        await _drain_produce(server, cache)
+
+        fetch, notices = await _drain_produce(server, cache, full=True)
+        assert "If-None-Match" not in server.requests[-1].headers
+        assert fetch.cache_status == "miss"
+        assert [n.notice_id for n in notices] == ["test-notice-001", "test-notice-002",
+                                                  "test-notice-003"]
+
+
+async def test_dump_cache_not_updated_until_ingest_is_stored(tmp_path):
+    cache = DumpCache(tmp_path)
+    server = _DumpServer(_multi_notice_xml(), etag='"v1"')
+
+    fetch, _ = await _drain_produce(server, cache, stored=False)
+    assert fetch.cache_status == "miss"
+    assert cache.load("2026-01") is None
+
+    # The failed ingest isn't mistaken for a cached copy
+    fetch, notices = await _drain_produce(server, cache)
+    assert "If-None-Match" not in server.requests[-1].headers
+    assert fetch.cache_status == "miss"
+    assert len(notices) == 3
+
+
+async def test_dump_cache_hit_on_identical_body_without_validators(tmp_path):
+    cache = DumpCache(tmp_path)
+    server = _DumpServer(_multi_notice_xml())
+
+    await _drain_produce(server, cache)
+    fetch, notices = await _drain_produce(server, cache)
+
+    assert fetch.cache_status == "hit"
+    assert notices == []
+    assert not cache.partial_path("2026-01").exists()
+
+
+async def test_dump_cache_miss_reparses_changed_body(tmp_path):
+    cache = DumpCache(tmp_path)
+    server = _DumpServer(b"<Root></Root>")
+    fetch, notices = await _drain_produce(server, cache)
+    assert fetch.cache_status == "miss"
+    assert notices == []
+
+    server.body = _multi_notice_xml()
+    fetch, notices = await _drain_produce(server, cache)
+
+    assert fetch.cache_status == "miss"
+    assert not fetch.streamed  # compared against the old copy before parsing
+    assert [n.notice_id for n in notices] == ["test-notice-001", "test-notice-002",
+                                              "test-notice-003"]
+    assert cache.load("2026-01").size == len(_multi_notice_xml())
+
+
+async def test_changed_etag_streams_against_a_warm_cache(tmp_path):
+    cache = DumpCache(tmp_path)
+    server = _DumpServer(b"<Root></Root>", etag='"v1"')
+    await _drain_produce(server, cache)
+
+    server.body, server.etag = _multi_notice_xml(), '"v2"'
+    fetch, notices = await _drain_produce(server, cache)
+
+    assert fetch.cache_status == "miss"
+    assert fetch.streamed  # the new ETag says it changed; no need to hash first
+    assert len(notices) == 3
+    assert cache.load("2026-01").etag == '"v2"'
+
+
+async def test_fetch_without_cache_writes_dest(tmp_path):
+    dest = tmp_path / "dump.xml"
+    server = _DumpServer(_multi_notice_xml(), etag='"v1"')
+    async with server.client() as client:
+        fetch = await _fetch_dump(client, "http://test/xml", StageTimings(), dest=str(dest))
+
+    assert fetch.cache_status is None
+    assert "If-None-Match" not in server.requests[0].headers
+    assert dest.read_bytes() == _multi_notice_xml()
@@ -1,6 +1,14 @@
 """Tests for CPV code filtering and trade tagging."""
 
-from hanke_radar.scraper.cpv_filter import get_trade_tags, is_trade_relevant
+import random
+
+from hanke_radar.db.seed import TRADE_CPV_SEEDS
+from hanke_radar.scraper.cpv_filter import (
+    TRADE_RELEVANT_DIVISIONS,
+    CpvTagger,
+    get_trade_tags,
+    is_trade_relevant,
+)
 
 
 def test_plumbing_cpv_is_relevant():
@@ -119,3 +127,52 @@ def test_get_trade_tags_new_seeds():
     # Misc repair → maintenance
     tags = get_trade_tags(["50800000"])
     assert "maintenance" in tags
+
+
+def _linear_scan(mappings: list[dict]):
+    """The original get_trade_tags: test every prefix against every code."""
+    by_prefix: dict[str, list[str]] = {}
+    for mapping in mappings:
+        by_prefix.setdefault(mapping["cpv_prefix"], []).append(mapping["trade_key"])
+    sorted_prefixes = sorted(by_prefix, key=len, reverse=True)
+
+    def get_trade_tags(cpv_codes: list[str]) -> list[str]:
+        tags: set[str] = set()
+        for cpv in cpv_codes:
+            if not cpv:
+                continue
+            cpv_clean = cpv.strip().split("-")[0].strip()
+            matched = False
+            for prefix in sorted_prefixes:
+                if cpv_clean.startswith(prefix):
+                    tags.update(by_prefix[prefix])
+                    matched = True
+            if not matched and cpv_clean[:2] in TRADE_RELEVANT_DIVISIONS:
+                tags.add("general")
+        return sorted(tags)
+
+    return get_trade_tags
+
+
+def test_tagger_matches_linear_scan():
+    rng = random.Random(17)
+    mappings = TRADE_CPV_SEEDS + [
+        {"cpv_prefix": "".join(rng.choices("4570", k=rng.randint(2, 8))),
+         "trade_key": f"trade{i % 40}"}
+        for i in range(2000)
+    ]
+    tagger, reference = CpvTagger(mappings), _linear_scan(mappings)
+    for _ in range(1000):
+        code = "".join(rng.choices("0145703", k=8))
+        variants = [code, f" {code}-{rng.randint(0, 9)} ", code[:3], "", "-"]
+        for cpv in variants:
+            assert tagger.tags([cpv]) == reference([cpv]), cpv
+    sample = ["45330000-9", "71300000", "72000000", "50720000", "45312000"]
+    assert get_trade_tags(sample) == _linear_scan(TRADE_CPV_SEEDS)(sample)
+
+
+def test_tagger_memoizes_per_code():
+    tagger = CpvTagger(TRADE_CPV_SEEDS, cache_size=2)
+    tagger.tags(["45330000", "45330000-9", " 45330000 "])
+    info = tagger.code_tags.cache_info()
+    assert (info.misses, info.hits, info.maxsize) == (1, 2, 2)
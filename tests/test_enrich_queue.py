@@ -0,0 +1,139 @@
+"""Tests for the enrichment job queue.
+
+Most capture statements without a DB; the concurrent-claim test needs
+Postgres (see conftest.pg_engine).
+"""
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from hanke_radar.config import settings
+from hanke_radar.db.models import EnrichmentJob, Procurement
+from hanke_radar.scraper import enrich_queue
+from hanke_radar.scraper.enrich_queue import (
+    ClaimedJob,
+    claim_jobs,
+    complete_jobs,
+    fail_job,
+    retry_delay,
+)
+from tests.conftest import FakeSession
+
+
+def test_retry_delay_grows_and_is_capped(monkeypatch):
+    monkeypatch.setattr(enrich_queue.random, "uniform", lambda a, b: 1.0)
+    monkeypatch.setattr(settings, "enrich_job_retry_base_seconds", 60.0)
+    monkeypatch.setattr(settings, "enrich_job_retry_max_seconds", 600.0)
+    assert [retry_delay(n) for n in (1, 2, 3, 4, 5, 6)] == [60, 120, 240, 480, 600, 600]
+
+
+@pytest.mark.parametrize(("attempts", "status"), [(1, "pending"), (4, "pending"), (5, "dead")])
+async def test_fail_job_backs_off_then_dead_letters(monkeypatch, attempts, status):
+    monkeypatch.setattr(settings, "enrich_job_max_attempts", 5)
+    session = FakeSession()
+    job = ClaimedJob(id=7, procurement_id=70, attempts=attempts)
+
+    assert await fail_job(session, "w1", job, "HTTP 503" * 100) == status
+
+    (params,) = session.params
+    assert "worker_id = :worker_id" in str(session.statements[0])
+    assert params["worker_id"] == "w1"  # only while this worker holds the lease
+    assert params["attempts"] == attempts  # ... for the attempt it claimed
+    assert params["status"] == status
+    assert len(params["error"]) == 500
+    assert (params["delay"] > 0) == (status == "pending")
+
+
+def test_claim_skips_locked_rows_and_reclaims_expired_leases():
+    sql = str(enrich_queue._CLAIM)
+    assert "FOR UPDATE SKIP LOCKED" in sql
+    assert "leased_until < now() AND attempts < :max_attempts" in sql
+
+
+async def test_fail_job_waits_at_least_retry_after():
+    session = FakeSession()
+    await fail_job(session, "w1", ClaimedJob(id=7, procurement_id=70, attempts=1),
+                   "HTTP 429", retry_after=86400)
+    assert session.params[0]["delay"] == 86400
+
+
+async def test_concurrent_claims_hand_out_disjoint_jobs(pg_engine):
+    async with AsyncSession(pg_engine) as session:
+        procurements = [Procurement(notice_id=f"claim-{i}", title="t", contracting_auth="a")
+                        for i in range(20)]
+        session.add_all(procurements)
+        await session.flush()
+        session.add_all(EnrichmentJob(procurement_id=p.id) for p in procurements)
+        await session.commit()
+
+    async with AsyncSession(pg_engine) as first, AsyncSession(pg_engine) as second:
+        # Both transactions stay open, so the second claim meets the first's row locks
+        a = await claim_jobs(first, "w1", limit=8, lease_seconds=60)
+        b = await claim_jobs(second, "w2", limit=8, lease_seconds=60)
+        c = await claim_jobs(second, "w2", limit=8, lease_seconds=60)
+        await first.commit()
+        await second.commit()
+
+    ids = [job.id for job in a + b + c]
+    assert len(a) == len(b) == 8 and len(c) == 4
+    assert len(set(ids)) == len(ids) == 20
+
+
+async def _one_job(session: AsyncSession) -> None:
+    procurement = Procurement(notice_id="lease-1", title="t", contracting_auth="a")
+    session.add(procurement)
+    await session.flush()
+    session.add(EnrichmentJob(procurement_id=procurement.id))
+    await session.commit()
+
+
+async def test_expired_lease_is_reclaimed_by_another_worker(pg_engine):
+    async with AsyncSession(pg_engine) as session:
+        await _one_job(session)
+        (job,) = await claim_jobs(session, "w1", limit=5, lease_seconds=0)
+        await session.commit()
+        # w1 went quiet: its zero-second lease has lapsed, so w2 takes the job over
+        (reclaimed,) = await claim_jobs(session, "w2", limit=5, lease_seconds=60)
+        assert await claim_jobs(session, "w3", limit=5, lease_seconds=60) == []
+        await session.commit()
+
+    assert reclaimed.id == job.id and reclaimed.attempts == 2
+
+
+async def test_stale_lease_holder_cannot_record_an_outcome(pg_engine):
+    async with AsyncSession(pg_engine) as session:
+        await _one_job(session)
+        (stale,) = await claim_jobs(session, "w1", limit=5, lease_seconds=0)
+        await session.commit()
+        # The lease lapsed and the same worker id (a restarted pid 1, say) reclaimed it
+        (current,) = await claim_jobs(session, "w1", limit=5, lease_seconds=60)
+        await session.commit()
+
+        await complete_jobs(session, "w1", [stale])
+        await fail_job(session, "w1", stale, "late failure")
+        await session.commit()
+        job = await session.get(EnrichmentJob, stale.id)
+        assert (job.status, job.attempts, job.last_error) == ("running", 2, None)
+
+        await complete_jobs(session, "w1", [current])
+        await session.commit()
+        await session.refresh(job)
+        assert job.status == "done"
+
+
+async def test_expired_lease_on_the_last_attempt_is_dead_lettered(pg_engine, monkeypatch):
+    monkeypatch.setattr(settings, "enrich_job_max_attempts", 2)
+    async with AsyncSession(pg_engine) as session:
+        await _one_job(session)
+        # The job crashes its worker on both attempts
+        assert len(await claim_jobs(session, "w1", limit=5, lease_seconds=0)) == 1
+        await session.commit()
+        assert len(await claim_jobs(session, "w2", limit=5, lease_seconds=0)) == 1
+        await session.commit()
+
+        assert await claim_jobs(session, "w3", limit=5, lease_seconds=60) == []
+        await session.commit()
+        job = (await session.scalars(select(EnrichmentJob))).one()
+    assert job.status == "dead"
+    assert job.last_error == "Lease expired on attempt 2 (worker w2)"
@@ -1,6 +1,33 @@
-"""Tests for the HTML enricher contact extraction."""
+"""Tests for the HTML enricher contact extraction.
 
-from hanke_radar.scraper.html_enricher import _extract_contact_from_text
+The write path's SQL semantics are checked against Postgres (see conftest.pg_engine).
+"""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import asyncpg
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from hanke_radar.config import settings
+from hanke_radar.db.models import Procurement
+from hanke_radar.scraper import rhr_api
+from hanke_radar.scraper.html_enricher import (
+    _enrich_concurrently,
+    _extract_contact_from_text,
+    _latest_version_id,
+    _refresh_writes,
+    enrich_procurement,
+    iter_enriched,
+    write_enrichments,
+)
+from hanke_radar.scraper.rate_limit import AdaptiveConcurrency, TokenBucket
+from hanke_radar.scraper.response_cache import ResponseCache
+from hanke_radar.scraper.rhr_api import RhrApi, RhrTransientError
+from tests.conftest import FakeSession
 
 
 def test_extract_email():
@@ -32,3 +59,277 @@ def test_extract_international_phone():
     text = "Kontakt: +372 5564 0996"
     result = _extract_contact_from_text(text)
     assert "contact_phone" in result
+
+
+def _fake_rhr_api(latency: float = 0.01, slow: dict | None = None):
+    """MockTransport handler for the three RHR endpoints; tracks peak concurrency.
+
+    `slow` maps an endpoint suffix to a latency overriding the default.
+    """
+    state = {"in_flight": 0, "peak": 0, "requests": 0}
+    slow = slow or {}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        state["requests"] += 1
+        state["in_flight"] += 1
+        state["peak"] = max(state["peak"], state["in_flight"])
+        path = request.url.path
+        await asyncio.sleep(slow.get(path.rsplit("/", 1)[-1], latency))
+        state["in_flight"] -= 1
+        if path.endswith("/latest-version"):
+            rhr_id = path.split("/")[-2]
+            return httpx.Response(200, json={"value": int(rhr_id) + 1000})
+        if path.endswith("/general-info"):
+            return httpx.Response(200, json={"liablePersonName": "Mari Maasikas"})
+        if path.endswith("/additional-data"):
+            return httpx.Response(200, json={
+                "procPart": {"place": "Tartu linn, Riia 15"},
+                "procObject": {"additionalInfo": "e-mail: mari@example.ee"},
+            })
+        return httpx.Response(404)
+
+    return handler, state
+
+
+async def test_enrich_concurrently_bounds_in_flight_requests():
+    handler, state = _fake_rhr_api()
+    procurements = [Procurement(rhr_id=str(i)) for i in range(12)] + [Procurement(rhr_id=None)]
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        api = RhrApi(client, TokenBucket(rate=1000, burst=50), base_url="http://rhr")
+        results = await _enrich_concurrently(api, procurements, concurrency=3, verbose=False)
+
+    assert state["requests"] == 36
+    assert api.latency_summary()["general-info"]["calls"] == 12
+    # 3 procurements at a time, each with at most 2 requests in flight
+    assert 3 < state["peak"] <= 6
+    assert results[-1] is None
+    assert results[0] == {
+        "rhr_version_id": "1000",
+        "contact_person": "Mari Maasikas",
+        "performance_address": "Tartu linn, Riia 15",
+        "contact_email": "mari@example.ee",
+    }
+
+
+async def test_enrich_fetches_version_details_concurrently():
+    handler, state = _fake_rhr_api(latency=0.05)
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        api = RhrApi(client, base_url="http://rhr")
+        await enrich_procurement(api, Procurement(rhr_id="7"), verbose=False)
+
+    # latest-version first, then general-info and additional-data together
+    assert state["peak"] == 2
+
+
+async def test_enrich_raises_transient_error_when_endpoint_times_out(monkeypatch):
+    monkeypatch.setitem(rhr_api.ENDPOINT_TIMEOUTS, "general-info", 0.05)
+    monkeypatch.setattr(settings, "rhr_retry_base_seconds", 0.0)
+    handler, _ = _fake_rhr_api(slow={"general-info": 1.0})
+    cache = ResponseCache(":memory:", {"latest-version": 0, "general-info": None,
+                                       "additional-data": None})
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        api = RhrApi(client, base_url="http://rhr", cache=cache, retries=1)
+        with pytest.raises(RhrTransientError, match="general-info timed out"):
+            await enrich_procurement(api, Procurement(rhr_id="7"), verbose=False)
+
+    latency = api.latency_summary()
+    assert latency["general-info"]["failures"] == 2
+    assert latency["general-info"]["retries"] == 1
+    assert latency["general-info"]["max_ms"] < 500
+    # The endpoint that answered is cached, so the later retry skips it
+    assert cache.get("additional-data", "http://rhr/proc-vers/1007/additional-data")
+
+
+async def test_cached_version_payloads_skip_requests():
+    handler, state = _fake_rhr_api()
+    cache = ResponseCache(":memory:", {"latest-version": 0, "general-info": None,
+                                       "additional-data": None})
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        api = RhrApi(client, base_url="http://rhr", cache=cache)
+        first = await enrich_procurement(api, Procurement(rhr_id="7"), verbose=False)
+        second = await enrich_procurement(api, Procurement(rhr_id="7"), verbose=False)
+
+    assert first == second
+    # latest-version (TTL 0) is re-checked; the version's payloads come from cache
+    assert state["requests"] == 4
+    assert api.cache_summary()["general-info"] == {
+        "hits": 1, "misses": 1, "errors": 0, "hit_ratio": 0.5,
+    }
+
+
+async def test_refresh_version_check_bypasses_cached_lookup():
+    handler, state = _fake_rhr_api()
+    cache = ResponseCache(":memory:", {"latest-version": 3600})
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        api = RhrApi(client, base_url="http://rhr", cache=cache)
+        await api.latest_version("7")
+        assert await api.latest_version("7") == {"value": 1007}
+        assert state["requests"] == 1
+        assert await _latest_version_id(api, "7") == "1007"
+
+    assert state["requests"] == 2
+
+
+async def test_iter_enriched_yields_each_procurement_once():
+    handler, _ = _fake_rhr_api()
+    procurements = [Procurement(id=i, rhr_id=str(i)) for i in range(1, 6)]
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        api = RhrApi(client, base_url="http://rhr")
+        seen = [(proc.id, result["rhr_version_id"])
+                async for proc, result in iter_enriched(api, procurements, 2, verbose=False)]
+
+    assert sorted(seen) == [(i, str(i + 1000)) for i in range(1, 6)]
+
+
+async def test_write_enrichments_sends_one_update_per_batch():
+    session = FakeSession()
+    await write_enrichments(session, [
+        {"id": 1, "rhr_version_id": "11", "contact_email": "a@example.ee"},
+        {"id": 2, "rhr_version_id": None},
+    ])
+    await write_enrichments(session, [])
+
+    (stmt,) = session.statements
+    sql = str(stmt.compile(dialect=asyncpg.dialect()))
+    assert "FROM (VALUES ($" in sql
+    assert "::INTEGER" in sql
+    assert "contact_email=coalesce(enrichment.contact_email, procurements.contact_email)" in sql
+    assert "WHERE procurements.id = enrichment.id" in sql
+
+
+async def test_refresh_write_overwrites_without_coalesce():
+    session = FakeSession()
+    await write_enrichments(session, [{"id": 1, "rhr_version_id": "12"}], overwrite=True)
+
+    sql = str(session.statements[0].compile(dialect=asyncpg.dialect()))
+    assert "contact_email=enrichment.contact_email" in sql
+    assert "coalesce" not in sql
+
+
+async def test_enrich_keeps_stored_contacts_and_refresh_overwrites_them(pg_engine):
+    async with AsyncSession(pg_engine) as session:
+        procurement = Procurement(notice_id="enrich-1", title="t", contracting_auth="a",
+                                  contact_person="Mari", contact_email="old@example.ee")
+        session.add(procurement)
+        await session.flush()
+        pid = procurement.id
+        await session.commit()
+
+        async def _contacts():
+            return (await session.execute(
+                select(Procurement.rhr_version_id, Procurement.contact_person,
+                       Procurement.contact_email, Procurement.contact_phone,
+                       Procurement.enriched_at).where(Procurement.id == pid)
+            )).one()
+
+        # Enrich: fields missing from the answer keep their stored value
+        await write_enrichments(session, [
+            {"id": pid, "rhr_version_id": "11", "contact_phone": "+372 5555 5555"},
+        ])
+        await session.commit()
+        enriched = await _contacts()
+        assert enriched[:4] == ("11", "Mari", "old@example.ee", "+372 5555 5555")
+        assert enriched.enriched_at is not None
+
+        # Refresh of a new version: what the new version dropped is cleared
+        await write_enrichments(session, [{"id": pid, "rhr_version_id": "12"}], overwrite=True)
+        await session.commit()
+        assert (await _contacts())[:4] == ("12", None, None, None)
+
+
+def test_refresh_records_new_version_on_empty_answer():
+    class Row:
+        def __init__(self, id):
+            self.id = id
+
+    changed = [(Row(1), "11"), (Row(2), "12"), (Row(3), "13")]
+    details = [{"contact_email": "a@example.ee"}, {}, RhrTransientError("general-info: HTTP 503")]
+    writes, errors = _refresh_writes(changed, details)
+
+    assert writes == [
+        {"id": 1, "rhr_version_id": "11", "contact_email": "a@example.ee"},
+        {"id": 2, "rhr_version_id": "12"},
+    ]
+    assert errors == 1  # only the transient failure keeps its old version
+
+
+def _flaky_rhr_api(responses: list[httpx.Response]):
+    """MockTransport handler answering with `responses` in turn, then 200s."""
+    calls = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        return responses.pop(0) if responses else httpx.Response(200, json={"value": 1})
+
+    return handler, calls
+
+
+async def test_throttled_request_is_retried_after_retry_after(monkeypatch):
+    monkeypatch.setattr(settings, "rhr_retry_base_seconds", 0.0)
+    handler, calls = _flaky_rhr_api([httpx.Response(429, headers={"Retry-After": "0.05"})])
+    limit = AdaptiveConcurrency(initial=4)
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        api = RhrApi(client, base_url="http://rhr", concurrency=limit)
+        start = time.monotonic()
+        assert await api.latest_version("7") == {"value": 1}
+
+    assert time.monotonic() - start >= 0.05
+    assert len(calls) == 2
+    assert limit.throttles == 1 and limit.limit < 4
+    assert api.latency_summary()["latest-version"]["retries"] == 1
+
+
+async def test_requests_use_the_endpoint_deadline_not_httpx_default():
+    timeouts = {}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        timeouts[request.url.path.rsplit("/", 1)[-1]] = request.extensions["timeout"]["read"]
+        return httpx.Response(200, json={"value": 1})
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        api = RhrApi(client, base_url="http://rhr")
+        await api.latest_version("7")
+        await api.general_info("1007")
+
+    assert timeouts == {"latest-version": 10.0, "general-info": 20.0}
+
+
+async def test_httpx_timeout_counts_as_throttle(monkeypatch):
+    monkeypatch.setattr(settings, "rhr_retry_base_seconds", 0.0)
+
+    async def slow_handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.02)
+        raise httpx.ReadTimeout("read timed out", request=request)
+
+    limit = AdaptiveConcurrency(initial=8)
+    async with httpx.AsyncClient(transport=httpx.MockTransport(slow_handler)) as client:
+        api = RhrApi(client, base_url="http://rhr", concurrency=limit, retries=0)
+        with pytest.raises(RhrTransientError, match="timed out"):
+            await api.latest_version("7")
+
+    assert limit.throttles == 1 and limit.limit < 8
+
+
+async def test_persistent_server_errors_raise_instead_of_returning_none(monkeypatch):
+    monkeypatch.setattr(settings, "rhr_retry_base_seconds", 0.0)
+    handler, calls = _flaky_rhr_api([httpx.Response(503)] * 3)
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        api = RhrApi(client, base_url="http://rhr", retries=2)
+        with pytest.raises(RhrTransientError, match="HTTP 503"):
+            await api.latest_version("7")
+    assert len(calls) == 3
+
+
+async def test_not_found_is_final_and_not_retried():
+    handler, calls = _flaky_rhr_api([httpx.Response(404)])
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        api = RhrApi(client, base_url="http://rhr")
+        assert await api.latest_version("7") is None
+    assert len(calls) == 1
+
+
+def test_parse_retry_after():
+    assert rhr_api.parse_retry_after("2") == 2.0
+    assert rhr_api.parse_retry_after("86400") == rhr_api.MAX_RETRY_AFTER
+    assert rhr_api.parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert rhr_api.parse_retry_after("soon") is None
@@ -0,0 +1,151 @@
+"""EXPLAIN regression suite: no API query may fall back to a sequential scan.
+
+Needs a throwaway Postgres; skipped unless HANKE_TEST_DATABASE_URL is set:
+
+    HANKE_TEST_DATABASE_URL=postgresql://localhost/hanke_test uv run pytest tests/
+
+Tables are created in a scratch schema and seeded with synthetic rows. Each
+request goes through the real routes; every statement they run is EXPLAINed
+first with enable_seqscan off, so the planner only picks a seq scan when no
+index can serve the query at all.
+"""
+
+
+import httpx
+import pytest
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import asyncpg
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from hanke_radar.api.app import app
+from hanke_radar.db.engine import _convert_neon_url, get_session
+from hanke_radar.db.schema import apply_schema
+from hanke_radar.db.summary import _REFRESH
+from tests.conftest import TEST_DATABASE_URL, skip_without_db
+
+SCHEMA = "hanke_plan_test"
+
+# Stats read the whole (small) summary table; a full scan of it is the plan
+FULL_SCAN_ALLOWED = {"procurement_summary"}
+
+_SEED = [
+    """
+    INSERT INTO procurements (notice_id, title, contracting_auth, status, cpv_primary,
+                              nuts_code, estimated_value, trade_tags, publication_date,
+                              submission_deadline)
+    SELECT 'plan-' || g, 'Hange ' || g, 'Asutus ' || g % 50,
+           CASE WHEN g % 5 = 0 THEN 'active' ELSE 'expired' END,
+           (ARRAY['45330000', '45310000', '50700000', '71300000', '45440000'])[1 + g % 5],
+           (ARRAY['EE001', 'EE004', 'EE008', 'EE009'])[1 + g % 4],
+           1000 + g,
+           ARRAY[(ARRAY['plumbing', 'electrical', 'maintenance', 'general'])[1 + g % 4]],
+           CASE WHEN g % 97 = 0 THEN NULL ELSE now() - make_interval(hours => g) END,
+           now() + make_interval(days => g % 60 - 20)
+    FROM generate_series(1, 20000) AS g
+    """,
+    """
+    INSERT INTO scrape_runs (run_type, status)
+    SELECT 'bulk_xml', 'completed' FROM generate_series(1, 200)
+    """,
+    *_REFRESH,
+    "ANALYZE",
+]
+
+
+def _scans(plan: dict) -> list[tuple[str, str | None]]:
+    found = [(plan["Node Type"], plan.get("Relation Name"))]
+    for child in plan.get("Plans", []):
+        found += _scans(child)
+    return found
+
+
+class _ExplainingSession:
+    """Wraps a real session; EXPLAINs every statement before running it."""
+
+    def __init__(self, session: AsyncSession, plans: list):
+        self._session = session
+        self._plans = plans
+
+    async def execute(self, stmt, params=None):
+        sql = str(stmt.compile(dialect=asyncpg.dialect(), compile_kwargs={"literal_binds": True}))
+        if not sql.lstrip().upper().startswith("EXPLAIN"):
+            conn = await self._session.connection()
+            plan = (await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+            self._plans.append((sql, plan[0]["Plan"]))
+        return await self._session.execute(stmt, params)
+
+    def __getattr__(self, name):
+        return getattr(self._session, name)
+
+
+@pytest.fixture
+async def explain_client():
+    skip_without_db()
+    engine = create_async_engine(
+        _convert_neon_url(TEST_DATABASE_URL),
+        poolclass=NullPool,
+        connect_args={"server_settings": {"search_path": SCHEMA, "enable_seqscan": "off"}},
+    )
+    async with engine.begin() as conn:
+        await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        await conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+    async with AsyncSession(engine) as session:
+        await apply_schema(session)
+    async with engine.begin() as conn:
+        for statement in _SEED:
+            await conn.execute(text(statement))
+
+    plans: list[tuple[str, dict]] = []
+
+    async def _session():
+        async with AsyncSession(engine) as session:
+            yield _ExplainingSession(session, plans)
+
+    app.dependency_overrides[get_session] = _session
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client, plans
+    app.dependency_overrides.clear()
+    async with engine.begin() as conn:
+        await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+    await engine.dispose()
+
+
+async def _first_cursor(client: httpx.AsyncClient) -> str:
+    return (await client.get("/procurements", params={"per_page": 50})).json()["next_cursor"]
+
+
+@pytest.mark.parametrize(
+    ("path", "params"),
+    [
+        ("/procurements", {}),
+        ("/procurements", {"trade": "plumbing"}),
+        ("/procurements", {"cpv": "4533"}),
+        ("/procurements", {"region": "EE001"}),
+        ("/procurements", {"min_value": 5000, "max_value": 9000}),
+        ("/procurements", {"status": "expired", "page": 40}),
+        ("/procurements", {"include_total": "true", "estimate_total": "true"}),
+        ("/procurements", {"cursor": "first-page"}),
+        ("/procurements", {"view": "compact", "trade": "plumbing"}),
+        ("/procurements/stats", {}),
+        ("/procurements/5", {}),
+        ("/trades", {}),
+        ("/scrape/status", {}),
+    ],
+)
+async def test_api_queries_use_indexes(explain_client, path, params):
+    client, plans = explain_client
+    if params.get("cursor") == "first-page":
+        params = {"cursor": await _first_cursor(client)}
+        plans.clear()
+
+    response = await client.get(path, params=params)
+    assert response.status_code == 200
+    assert plans, "route ran no queries"
+    for sql, plan in plans:
+        seq_scans = [
+            rel for node, rel in _scans(plan)
+            if node == "Seq Scan" and rel not in FULL_SCAN_ALLOWED
+        ]
+        assert not seq_scans, f"seq scan on {seq_scans} for {path} {params}:\n{sql}"
@@ -0,0 +1,70 @@
+"""Tests for the token-bucket rate limiter and the adaptive concurrency limit."""
+
+import asyncio
+import time
+
+import pytest
+
+from hanke_radar.scraper.rate_limit import AdaptiveConcurrency, TokenBucket
+
+
+async def test_bucket_caps_rate_across_concurrent_callers():
+    bucket = TokenBucket(rate=50, burst=1)
+    start = time.monotonic()
+    await asyncio.gather(*(bucket.acquire() for _ in range(11)))
+    # First token is free, the other ten are spaced 1/50 s apart
+    assert time.monotonic() - start >= 0.19
+
+
+async def test_bucket_allows_burst_when_idle():
+    bucket = TokenBucket(rate=1, burst=5)
+    start = time.monotonic()
+    for _ in range(5):
+        await bucket.acquire()
+    assert time.monotonic() - start < 0.1
+
+
+def test_bucket_rejects_non_positive_rate():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+
+async def test_adaptive_limit_grows_while_healthy():
+    limit = AdaptiveConcurrency(initial=2, maximum=4, latency_target_ms=100)
+    for _ in range(20):
+        limit.succeeded(await limit.acquire(), latency_ms=10)
+    assert limit.limit == 4
+    assert limit.in_flight == 0
+
+
+async def test_adaptive_limit_backs_off_once_per_congested_round():
+    limit = AdaptiveConcurrency(initial=8, maximum=8)
+    tickets = [await limit.acquire() for _ in range(8)]
+    assert limit.in_flight == 8
+    for ticket in tickets:  # all started before the first decrease
+        limit.throttled(ticket)
+    assert limit.limit == 4
+    assert limit.throttles == 8
+    assert limit.decreases == 1
+
+    limit.throttled(await limit.acquire())
+    assert limit.limit == 2
+
+
+async def test_adaptive_limit_bounds_in_flight_and_honours_retry_after():
+    limit = AdaptiveConcurrency(initial=1, maximum=1)
+    first = await limit.acquire()
+    waiter = asyncio.create_task(limit.acquire())
+    await asyncio.sleep(0.01)
+    assert not waiter.done()
+
+    start = time.monotonic()
+    limit.throttled(first, retry_after=0.1)
+    limit.succeeded(await waiter, latency_ms=10)
+    assert time.monotonic() - start >= 0.09
+
+
+async def test_adaptive_limit_stops_growing_when_slow():
+    limit = AdaptiveConcurrency(initial=4, maximum=8, latency_target_ms=100)
+    limit.succeeded(await limit.acquire(), latency_ms=500)
+    assert limit.limit == pytest.approx(3.6)
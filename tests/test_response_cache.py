@@ -0,0 +1,81 @@
+"""Tests for the SQLite RHR response cache."""
+
+import sqlite3
+
+from hanke_radar.scraper import response_cache
+from hanke_radar.scraper.response_cache import ResponseCache
+
+TTLS = {"latest-version": 60, "general-info": None}
+
+
+def test_roundtrip_and_hit_ratio(tmp_path):
+    cache = ResponseCache(tmp_path / "rhr.sqlite", TTLS)
+    assert cache.get("general-info", "u1") is None
+    cache.put("general-info", "u1", {"liablePersonName": "Mari"})
+    assert cache.get("general-info", "u1") == {"liablePersonName": "Mari"}
+    assert cache.summary() == {
+        "general-info": {"hits": 1, "misses": 1, "errors": 0, "hit_ratio": 0.5}
+    }
+
+
+def test_ttl_expires_only_versioned_lookups(tmp_path, monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(response_cache.time, "time", lambda: now[0])
+    cache = ResponseCache(tmp_path / "rhr.sqlite", TTLS)
+    cache.put("latest-version", "v", {"value": 1})
+    cache.put("general-info", "g", {"liablePersonName": "Mari"})
+
+    now[0] += 3600
+    assert cache.get("latest-version", "v") is None
+    assert cache.get("general-info", "g") is not None
+    assert cache.prune() == 1
+
+
+def test_persists_across_instances(tmp_path):
+    path = tmp_path / "nested" / "rhr.sqlite"
+    first = ResponseCache(path, TTLS)
+    first.put("general-info", "g", {"a": 1})
+    first.close()
+    assert ResponseCache(path, TTLS).get("general-info", "g") == {"a": 1}
+
+
+def test_writes_are_committed_in_batches(tmp_path):
+    path = tmp_path / "rhr.sqlite"
+    cache = ResponseCache(path, TTLS, commit_every=3, commit_interval=3600)
+    other = ResponseCache(path, TTLS)
+    cache.put("general-info", "a", {"n": 1})
+    cache.put("general-info", "b", {"n": 2})
+    assert cache.get("general-info", "a") == {"n": 1}  # visible to its own connection
+    assert other.get("general-info", "a") is None  # not committed yet
+
+    cache.put("general-info", "c", {"n": 3})
+    assert other.get("general-info", "a") == {"n": 1}
+    cache.put("general-info", "d", {"n": 4})
+    cache.close()
+    assert other.get("general-info", "d") == {"n": 4}  # close flushes the rest
+
+
+def test_locked_database_drops_writes_instead_of_failing(tmp_path):
+    path = tmp_path / "rhr.sqlite"
+    cache = ResponseCache(path, TTLS, busy_timeout_ms=50)
+    cache.put("general-info", "g", {"a": 1})
+    cache.flush()
+
+    other_run = sqlite3.connect(path)
+    other_run.execute("BEGIN IMMEDIATE")  # another run mid-write
+    assert cache.get("general-info", "g") == {"a": 1}  # WAL: reads don't wait
+    cache.put("general-info", "h", {"b": 2})
+    cache.flush()
+    other_run.rollback()
+
+    assert cache.get("general-info", "h") is None
+    assert cache.summary()["general-info"]["errors"] == 1
+
+
+def test_sqlite_error_on_read_is_a_miss(tmp_path):
+    cache = ResponseCache(tmp_path / "rhr.sqlite", TTLS)
+    cache._db.execute("DROP TABLE responses")
+    assert cache.get("general-info", "g") is None
+    assert cache.summary()["general-info"] == {
+        "hits": 0, "misses": 1, "errors": 1, "hit_ratio": 0.0,
+    }
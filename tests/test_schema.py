@@ -0,0 +1,38 @@
+"""Tests for the schema upgrade statements (no DB)."""
+
+from hanke_radar.db.schema import (
+    INDEX_UPGRADES,
+    SCHEMA_UPGRADES,
+    SNIPPET_MISSING,
+    index_statements,
+)
+
+
+def test_indexes_are_built_and_dropped_concurrently():
+    statements = index_statements()
+    assert len(statements) == len(INDEX_UPGRADES)
+    assert all(" CONCURRENTLY IF " in s for s in statements)
+    assert not any("INDEX" in s for s in SCHEMA_UPGRADES)  # those run in a transaction
+
+
+def test_invalid_index_is_dropped_before_rebuilding():
+    statements = index_statements({"idx_procurements_cpv_pattern"})
+    drop = statements.index("DROP INDEX CONCURRENTLY IF EXISTS idx_procurements_cpv_pattern")
+    assert statements[drop + 1].startswith(
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_procurements_cpv_pattern "
+    )
+
+
+def test_unique_indexes_are_built_unique():
+    assert (
+        "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS uq_trade_cpv_mappings_prefix_key "
+        "ON trade_cpv_mappings (cpv_prefix, trade_key)"
+    ) in index_statements()
+
+
+def test_snippet_backfill_is_gated_on_its_partial_index():
+    (backfill,) = [s for s in SCHEMA_UPGRADES if s.startswith("UPDATE procurements")]
+    assert f"AND EXISTS (SELECT 1 FROM procurements WHERE {SNIPPET_MISSING})" in backfill
+    assert dict(INDEX_UPGRADES)["idx_procurements_snippet_backfill"].endswith(
+        f"WHERE {SNIPPET_MISSING}"
+    )
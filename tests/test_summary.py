@@ -0,0 +1,105 @@
+"""Tests for the procurement summary.
+
+The readers run against the shared FakeSession; the refresh is checked
+against Postgres (see conftest.pg_engine).
+"""
+
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from hanke_radar.api import routes
+from hanke_radar.api.app import app
+from hanke_radar.api.cache import ApiResponseCache
+from hanke_radar.db import summary
+from hanke_radar.db.engine import get_session
+from hanke_radar.db.models import Procurement
+from hanke_radar.db.summary import load_stats, refresh_summary
+from tests.conftest import FakeSession
+
+# (status, trade, nuts_code, nuts_name, contract_type, is_total, count)
+ROWS = [
+    ("active", None, "EE001", "Põhja-Eesti", "works", True, 5),
+    ("active", None, "EE008", "Lõuna-Eesti", "services", True, 2),
+    ("expired", None, "EE001", "Põhja-Eesti", "works", True, 10),
+    ("active", "plumbing", "EE001", "Põhja-Eesti", "works", False, 4),
+    ("active", "electrical", "EE001", "Põhja-Eesti", "works", False, 3),
+    ("active", "plumbing", "EE008", "Lõuna-Eesti", "services", False, 2),
+    ("expired", "electrical", "EE001", "Põhja-Eesti", "works", False, 9),
+]
+
+
+def _summary_session(table, live=()) -> FakeSession:
+    """Serves `table` for the summary SELECT and `live` for the GROUPING SETS query."""
+    return FakeSession(respond=lambda stmt: live if "GROUPING SETS" in str(stmt) else table)
+
+
+async def test_stats_aggregate_summary_rows():
+    stats = await load_stats(_summary_session(ROWS))
+
+    assert stats.total() == 17
+    assert stats.by_status() == [("expired", 10), ("active", 7)]
+    assert stats.by_trade("active") == [("plumbing", 6), ("electrical", 3)]
+    assert stats.by_trade() == [("electrical", 12), ("plumbing", 6)]
+    assert stats.by_region("active") == [("EE001", "Põhja-Eesti", 5), ("EE008", "Lõuna-Eesti", 2)]
+
+
+async def test_empty_summary_falls_back_to_one_live_query():
+    session = _summary_session([], live=ROWS)
+    stats = await load_stats(session)
+
+    assert stats.total() == 17
+    assert len(session.sql) == 2
+    assert "FROM procurement_summary" in session.sql[0]
+    assert session.sql[1] == summary._SUMMARY_SELECT
+
+
+def test_stats_and_trades_endpoints_read_the_summary(monkeypatch):
+    monkeypatch.setattr(routes, "response_cache", ApiResponseCache())
+    session = _summary_session(ROWS)
+    app.dependency_overrides[get_session] = lambda: session
+    try:
+        client = TestClient(app)
+        stats = client.get("/procurements/stats").json()
+        trades = client.get("/trades").json()
+    finally:
+        app.dependency_overrides.clear()
+
+    assert stats["by_trade"] == [
+        {"trade": "plumbing", "count": 6}, {"trade": "electrical", "count": 3},
+    ]
+    assert stats["by_region"][0] == {"nuts_code": "EE001", "nuts_name": "Põhja-Eesti", "count": 5}
+    assert stats["by_status"] == [{"status": "expired", "count": 10},
+                                  {"status": "active", "count": 7}]
+    assert trades == [{"trade_key": "electrical", "count": 12},
+                      {"trade_key": "plumbing", "count": 6}]
+    assert not any("FROM procurements" in sql for sql in session.sql)
+
+
+async def test_refreshed_summary_matches_the_live_counts(pg_engine):
+    # (status, cpv, nuts_code, trade_tags)
+    rows = [
+        ("active", "45330000", "EE001", ["plumbing"]),
+        ("active", "45310000", "EE001", ["electrical", "plumbing"]),
+        ("active", "71300000", "EE008", []),
+        ("expired", "45330000", "EE001", ["plumbing"]),
+        ("expired", "45310000", None, ["electrical"]),
+    ]
+    async with AsyncSession(pg_engine) as session:
+        session.add_all(
+            Procurement(notice_id=f"sum-{i}", title="t", contracting_auth="a", status=status,
+                        cpv_primary=cpv, nuts_code=nuts, trade_tags=tags)
+            for i, (status, cpv, nuts, tags) in enumerate(rows)
+        )
+        await session.commit()
+        live = await load_stats(session)  # empty summary: the live fallback
+        await refresh_summary(session)
+        await session.commit()
+        stored = await load_stats(session)
+
+    assert stored.total() == live.total() == 5
+    assert stored.by_status() == live.by_status() == [("active", 3), ("expired", 2)]
+    assert stored.by_trade("active") == live.by_trade("active") == [
+        ("plumbing", 2), ("electrical", 1),
+    ]
+    assert stored.by_trade() == live.by_trade()
+    assert stored.by_region("active") == live.by_region("active")
@@ -0,0 +1,134 @@
+"""Tests for DB-driven trade mappings.
+
+Most use a fake session that answers queries; the retag parity test needs
+Postgres (see conftest.pg_engine).
+"""
+
+import asyncio
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from hanke_radar.db.models import Procurement, TradeCpvMapping
+from hanke_radar.db.seed import TRADE_CPV_SEEDS
+from hanke_radar.scraper import trade_mappings
+from hanke_radar.scraper.cpv_filter import CPV_WHITESPACE, CpvTagger
+from hanke_radar.scraper.trade_mappings import load_tagger, retag_params, seed_trade_mappings
+from tests.conftest import FakeSession
+
+# Edge cases for the SQL/Python parity check: check digits, whitespace other
+# than spaces, empty and NULL codes, unmapped relevant and irrelevant divisions
+PARITY_CODES = [
+    ("45330000-9", ["45310000-3"]),
+    ("\t45331000-6\n", [" 50700000-2 ", "\xa071300000"]),
+    (" 45400000 - 1", ["", "33100000-1"]),
+    (None, ["45330000"]),
+    ("45999999", None),
+    ("71999999-9", ["50999999"]),
+    ("03000000-1", []),
+    ("\r\n", ["4", "45"]),
+]
+
+
+def _mapping_session(mappings: list[tuple[str, str]], count: int | None = None) -> FakeSession:
+    """Answers the version query, the row count and the mappings SELECT from `mappings`."""
+
+    def respond(stmt):
+        if stmt is trade_mappings._VERSION:
+            return [f"v{hash(tuple(sorted(mappings)))}"]
+        if "count(*)" in str(stmt):
+            return [len(mappings) if count is None else count]
+        return mappings
+
+    return FakeSession(respond=respond)
+
+
+def _loads(session: FakeSession) -> int:
+    return sum(
+        stmt is not trade_mappings._VERSION and "count(*)" not in str(stmt)
+        for stmt in session.statements
+    )
+
+
+async def test_tagger_rebuilt_only_when_mappings_change(monkeypatch):
+    monkeypatch.setattr(trade_mappings, "_cached", None)
+    mappings = [("4533", "plumbing")]
+    session = _mapping_session(mappings)
+
+    tagger = await load_tagger(session)
+    assert tagger.tags(["45330000"]) == ["plumbing"]
+    assert await load_tagger(session) is tagger
+    assert _loads(session) == 1
+
+    mappings.append(("4533", "heating"))
+    retagged = await load_tagger(session)
+    assert retagged is not tagger
+    assert retagged.tags(["45330000-9"]) == ["heating", "plumbing"]
+    assert _loads(session) == 2
+
+
+async def test_seed_only_fills_an_empty_table():
+    empty = FakeSession(respond=lambda stmt: [0] if "count(*)" in str(stmt) else TRADE_CPV_SEEDS)
+    assert await seed_trade_mappings(empty) == len(TRADE_CPV_SEEDS)
+    assert "ON CONFLICT (cpv_prefix, trade_key) DO NOTHING" in str(empty.statements[1])
+    assert empty.commits == 1
+
+    edited = _mapping_session([("4533", "plumbing")])
+    assert await seed_trade_mappings(edited) == 0
+    assert len(edited.statements) == 1 and edited.commits == 0
+
+
+async def test_concurrent_seeding_inserts_the_seeds_once(pg_engine):
+    async def _seed() -> int:
+        async with AsyncSession(pg_engine) as session:
+            return await seed_trade_mappings(session)
+
+    added = await asyncio.gather(_seed(), _seed(), _seed())
+    assert sum(added) == len(TRADE_CPV_SEEDS)
+    async with AsyncSession(pg_engine) as session:
+        stored = await session.scalar(select(func.count()).select_from(TradeCpvMapping))
+    assert stored == len(TRADE_CPV_SEEDS)
+
+
+def test_retag_sql_is_set_wise_and_locale_independent():
+    sql = str(trade_mappings._RETAG)
+    assert "generate_series(0, length(c.code))" in sql  # equality join on prefixes
+    assert 'COLLATE "C"' in sql  # same order as Python's sorted()
+    assert "IS DISTINCT FROM" in sql  # unchanged rows are not rewritten
+    assert "btrim(c.code, :whitespace)" in sql  # same trimming as normalize_cpv
+    assert retag_params()["whitespace"] == CPV_WHITESPACE
+
+
+async def test_sql_retag_matches_python_tagger(pg_engine):
+    async with AsyncSession(pg_engine) as session:
+        session.add_all(TradeCpvMapping(**seed) for seed in TRADE_CPV_SEEDS)
+        session.add(TradeCpvMapping(cpv_prefix="4533", trade_key="heating",
+                                    trade_name_et="Küte", trade_name_en="Heating"))
+        # Capitalised: sorts first by code point, but not under a linguistic collation
+        session.add(TradeCpvMapping(cpv_prefix="45", trade_key="Construction",
+                                    trade_name_et="Ehitus", trade_name_en="Construction"))
+        session.add_all(
+            Procurement(notice_id=f"parity-{i}", title="t", contracting_auth="a",
+                        cpv_primary=primary, cpv_additional=additional, trade_tags=["stale"])
+            for i, (primary, additional) in enumerate(PARITY_CODES)
+        )
+        await session.commit()
+
+        retagged = await session.execute(trade_mappings._RETAG, retag_params())
+        await session.commit()
+        assert retagged.rowcount == len(PARITY_CODES)  # every row started out "stale"
+        again = await session.execute(trade_mappings._RETAG, retag_params())
+        assert again.rowcount == 0  # rows whose tags already match are not rewritten
+        await session.commit()
+
+        mappings = (await session.execute(
+            select(TradeCpvMapping.cpv_prefix, TradeCpvMapping.trade_key)
+        )).all()
+        tagger = CpvTagger({"cpv_prefix": prefix, "trade_key": key} for prefix, key in mappings)
+        rows = (await session.execute(
+            select(Procurement.cpv_primary, Procurement.cpv_additional, Procurement.trade_tags)
+        )).all()
+
+    assert len(rows) == len(PARITY_CODES)
+    for primary, additional, tags in rows:
+        assert tags == tagger.tags([primary, *(additional or [])]), (primary, additional)
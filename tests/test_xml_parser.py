@@ -1,9 +1,24 @@
 """Tests for XML procurement parser."""
 
+import pickle
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from lxml import etree
+
+from hanke_radar.scraper.cpv_filter import is_trade_relevant
 from hanke_radar.scraper.xml_parser import (
     ParsedProcurement,
+    ParseStats,
+    from_record,
     is_active_tender,
+    iter_bulk_xml,
     parse_bulk_xml,
+    parse_dump_file,
+    parse_notice,
+    passes_prefilter,
+    peek_notice,
 )
 
 # Minimal eForms XML for a single contract notice
@@ -140,3 +155,199 @@ def test_is_not_active_tender():
 
     # Empty
     assert is_active_tender(ParsedProcurement(notice_subtype="")) is False
+
+
+def _multi_notice_xml() -> bytes:
+    """SAMPLE_XML with three contract notices and an award notice between them."""
+    notice = SAMPLE_XML.split(b"<OPEN-DATA>")[1].split(b"</OPEN-DATA>")[0]
+    award = (
+        b'<ContractAwardNotice xmlns="urn:oasis:names:specification:ubl:schema:xsd:'
+        b'ContractAwardNotice-2"><x>award</x></ContractAwardNotice>'
+    )
+    notices = [notice.replace(b"test-notice-001", f"test-notice-00{i}".encode()) for i in (1, 2, 3)]
+    return b"<OPEN-DATA>" + notices[0] + award + notices[1] + notices[2] + b"</OPEN-DATA>"
+
+
+def test_iter_bulk_xml_matches_parse_bulk_xml():
+    xml = _multi_notice_xml()
+    streamed = list(iter_bulk_xml([xml]))
+    assert [p.notice_id for p in streamed] == ["test-notice-001", "test-notice-002",
+                                               "test-notice-003"]
+    assert streamed == parse_bulk_xml(xml)
+
+
+def test_iter_bulk_xml_small_chunks():
+    xml = _multi_notice_xml()
+    chunks = [xml[i:i + 7] for i in range(0, len(xml), 7)]
+    assert list(iter_bulk_xml(chunks)) == parse_bulk_xml(xml)
+
+
+def test_iter_bulk_xml_from_path(tmp_path):
+    path = tmp_path / "dump.xml"
+    path.write_bytes(SAMPLE_XML)
+    notices = list(iter_bulk_xml(path))
+    assert len(notices) == 1
+    assert notices[0].rhr_id == "9999999"
+
+
+def _variant(*replacements: tuple[bytes, bytes]) -> bytes:
+    xml = SAMPLE_XML
+    for old, new in replacements:
+        assert old in xml
+        xml = xml.replace(old, new)
+    return xml
+
+
+_PROJECT_NUTS = (
+    b"</cac:MainCommodityClassification>\n  </cac:ProcurementProject>",
+    b"</cac:MainCommodityClassification>\n"
+    b"<cac:RealizedLocation><cac:Address>"
+    b"<cbc:CountrySubentityCode listName='nuts'>EE001</cbc:CountrySubentityCode>"
+    b"</cac:Address></cac:RealizedLocation>\n  </cac:ProcurementProject>",
+)
+
+# Every field parse_notice() reads from SAMPLE_XML
+SAMPLE_NOTICE = ParsedProcurement(
+    notice_id="test-notice-001",
+    procurement_id="test-folder-001",
+    rhr_id="9999999",
+    title="Kooli renoveerimise ehitustood",
+    description="Kooli hoone renoveerimise ehitustood",
+    contracting_auth="Tallinna Linnavalitsus",
+    contracting_auth_reg="75104221",
+    procedure_type="open",
+    cpv_primary="45210000",
+    submission_deadline=datetime(2026, 3, 15, 12, tzinfo=timezone(timedelta(hours=2))),
+    publication_date=datetime(2026, 2, 1, 2),
+    notice_subtype="16",
+    source_url="https://riigihanked.riik.ee/rhr-web/#/procurement/9999999/general-info",
+)
+
+# Missing, duplicated, misplaced and malformed fields, plus ordering traps for
+# the "first match" semantics, each with the fields that differ from SAMPLE_NOTICE
+EDGE_CASES = [
+    (SAMPLE_XML, {}),
+    (_variant(_PROJECT_NUTS), {"nuts_code": "EE001"}),
+    # NUTS outside ProcurementProject only → fallback to any CountrySubentityCode
+    (_variant((b"<cac:PartyLegalEntity>",
+              b"<cac:PostalAddress><cbc:CountrySubentityCode>EE009</cbc:CountrySubentityCode>"
+              b"</cac:PostalAddress><cac:PartyLegalEntity>")),
+     {"nuts_code": "EE009"}),
+    # Non-nuts code inside the project plus a nuts one in a later lot project
+    (_variant((b"<cbc:Name>Kooli renoveerimise ehitustood</cbc:Name>",
+              b"<cbc:Name>Kooli renoveerimise ehitustood</cbc:Name>"
+              b"<cbc:CountrySubentityCode listName='x'>XX</cbc:CountrySubentityCode>"),
+             (b"<cac:TenderingTerms>",
+              b"<cac:ProcurementProject><cbc:Name>Osa 1</cbc:Name>"
+              b"<cbc:CountrySubentityCode listName='nuts'>EE008</cbc:CountrySubentityCode>"
+              b"</cac:ProcurementProject><cac:TenderingTerms>")),
+     {"nuts_code": "EE008"}),
+    # Organization names and IDs appear before the project name / notice id
+    (_variant((b"<cbc:ID schemeName=\"notice-id\">test-notice-001</cbc:ID>",
+              b"<cbc:ID schemeName=\"other\">not-this</cbc:ID>"
+              b"<cbc:ID schemeName=\"notice-id\">test-notice-001</cbc:ID>"
+              b"<cbc:ID schemeName=\"notice-id\">nor-this</cbc:ID>")),
+     {}),
+    # Duplicate and empty CPV codes
+    (_variant((b"</cac:MainCommodityClassification>",
+              b"</cac:MainCommodityClassification><cac:AdditionalCommodityClassification>"
+              b"<cbc:ItemClassificationCode>45210000</cbc:ItemClassificationCode>"
+              b"<cbc:ItemClassificationCode> </cbc:ItemClassificationCode>"
+              b"<cbc:ItemClassificationCode>45330000</cbc:ItemClassificationCode>"
+              b"</cac:AdditionalCommodityClassification>")),
+     {"cpv_additional": ["45330000"]}),
+    # Malformed amount and fractional duration
+    (_variant((b"<cbc:ProcedureCode>open</cbc:ProcedureCode>",
+              b"<cbc:ProcedureCode>open</cbc:ProcedureCode>"
+              b"<cbc:EstimatedOverallContractAmount currencyID='EUR'>n/a"
+              b"</cbc:EstimatedOverallContractAmount>"),
+             (b"</cac:MainCommodityClassification>",
+              b"</cac:MainCommodityClassification><cac:PlannedPeriod>"
+              b"<cbc:DurationMeasure unitCode='MONTH'>12.5</cbc:DurationMeasure>"
+              b"</cac:PlannedPeriod>")),
+     {"duration_months": 12}),
+    # Valid amount with currency, duration outside PlannedPeriod is ignored
+    (_variant((b"<cbc:ProcedureCode>open</cbc:ProcedureCode>",
+              b"<cbc:ProcedureCode>open</cbc:ProcedureCode>"
+              b"<cbc:DurationMeasure>99</cbc:DurationMeasure>"
+              b"<cbc:EstimatedOverallContractAmount currencyID='SEK'>125000.50"
+              b"</cbc:EstimatedOverallContractAmount>")),
+     {"estimated_value": 125000.5, "currency": "SEK"}),
+    # URI outside CallForTendersDocumentReference comes first
+    (_variant((b"<cac:ProcurementProjectLot>",
+              b"<cac:ProcurementProjectLot><cbc:URI>https://riigihanked.riik.ee/rhr-web/#/"
+              b"procurement/111/x</cbc:URI>")),
+     {}),
+    # No RHR id in the URI → source URL falls back to the folder id
+    (_variant((b"/procurement/9999999/documents", b"/documents/9999999")),
+     {"rhr_id": "",
+      "source_url": "https://riigihanked.riik.ee/rhr-web/#/procurement/test-folder-001/general-info"}),
+    # Missing deadline time, missing organization, bad issue date
+    (_variant((b"<cbc:EndTime>12:00:00.000+02:00</cbc:EndTime>", b""),
+             (b"<efac:Company>", b"<efac:Other>"),
+             (b"</efac:Company>", b"</efac:Other>"),
+             (b"2026-02-01+02:00", b"not-a-date")),
+     {"contracting_auth": "", "contracting_auth_reg": "",
+      "submission_deadline": datetime(2026, 3, 15, 2), "publication_date": None}),
+    # Prior information notice root with an empty notice id
+    (_variant((b"<ContractNotice", b"<PriorInformationNotice"),
+             (b"</ContractNotice>", b"</PriorInformationNotice>"),
+             (b">test-notice-001<", b"><")),
+     {"notice_id": ""}),
+]
+
+
+@pytest.mark.parametrize(("xml", "changes"), EDGE_CASES)
+def test_parse_notice_edge_cases(xml, changes):
+    notice_el = etree.fromstring(xml)[0]
+    assert parse_notice(notice_el) == replace(SAMPLE_NOTICE, **changes)
+
+
+@pytest.mark.parametrize("xml", [xml for xml, _ in EDGE_CASES])
+def test_peek_notice_agrees_with_full_parse(xml):
+    notice_el = etree.fromstring(xml)[0]
+    full = parse_notice(notice_el)
+    peek = peek_notice(notice_el)
+    assert peek.notice_id == full.notice_id
+    assert peek.notice_subtype == full.notice_subtype
+    assert peek.cpv_codes == [full.cpv_primary, *full.cpv_additional]
+    assert passes_prefilter(peek) == (
+        is_active_tender(full) and any(is_trade_relevant(c) for c in peek.cpv_codes)
+    )
+
+
+def test_iter_bulk_xml_prefilter_counts_skips():
+    notices = [
+        _variant((b">test-notice-001<", b">active-relevant<")),
+        _variant((b">test-notice-001<", b">award<"),
+                 (b"<cbc:SubTypeCode>16<", b"<cbc:SubTypeCode>29<")),
+        _variant((b">test-notice-001<", b">it-services<"),
+                 (b">45210000<", b">72000000<")),
+    ]
+    xml = b"<OPEN-DATA>" + b"".join(n.split(b"<OPEN-DATA>")[1].split(b"</OPEN-DATA>")[0]
+                                    for n in notices) + b"</OPEN-DATA>"
+    stats = ParseStats()
+    kept = list(iter_bulk_xml([xml], prefilter=True, stats=stats))
+    assert [p.notice_id for p in kept] == ["active-relevant"]
+    assert stats.found == 3
+    assert stats.skipped_inactive == 1
+    assert stats.skipped_irrelevant == 1
+    assert stats.skipped == 2
+
+
+def test_iter_bulk_xml_skips_known_ids():
+    stats = ParseStats()
+    kept = list(iter_bulk_xml([_multi_notice_xml()], stats=stats,
+                              known_ids={"test-notice-001", "test-notice-003"}))
+    assert [p.notice_id for p in kept] == ["test-notice-002"]
+    assert stats.found == 3
+    assert stats.skipped_known == 2
+
+
+def test_parse_dump_file_returns_picklable_records(tmp_path):
+    path = tmp_path / "dump.xml"
+    path.write_bytes(_multi_notice_xml())
+    stats, records = parse_dump_file(path)
+    assert stats.found == 3
+    restored = [from_record(r) for r in pickle.loads(pickle.dumps(records))]
+    assert restored == list(iter_bulk_xml(path, prefilter=True))